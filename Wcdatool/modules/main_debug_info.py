@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Main Part Debug Info Reader                                            -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 06/20/19 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------
+#                                     -
+#  TODO                               -
+#                                     -
+# -------------------------------------
+
+# - Only Watcom debug info version 3.x is supported atm (which is what all
+#   samples seen so far use)
+#
+# - Locals, types and line numbers are not decoded (only offsets and counts
+#   are stored, just like wdump_decode_data() does)
+
+
+# -------------------------------------
+#                                     -
+#  Exports                            -
+#                                     -
+# -------------------------------------
+
+__all__ = [ "debug_info_read", "debug_info_check", "debug_info_merge" ]
+
+
+# -------------------------------------
+#                                     -
+#  Imports                            -
+#                                     -
+# -------------------------------------
+
+import logging
+import mmap
+import re
+import struct
+from collections import OrderedDict
+from modules.module_miscellaneous import *
+from modules.module_pretty_print import *
+
+
+# -------------------------------------
+#                                     -
+#  Code                               -
+#                                     -
+# -------------------------------------
+
+# Watcom debug info layout (version 3.x):
+#
+# <start of debug info> = <end of file> - <debug size>
+#   languages           lang size bytes, null-terminated names
+#   segments            segment size bytes, 16-bit values
+#   section 0           section header + module/global/addr info (offsets
+#   section 1           relative to start of section header)
+#   ...
+#   master header       last 14 bytes of file
+#
+# Module info entry:    language (offset into languages), locals, types and
+#                       lines (offset + count each), name (length-prefixed)
+# Global info entry:    offset, segment, module index, kind, name (length-
+#                       prefixed)
+# Addr info block:      base offset, base segment, count, followed by count
+#                       entries of size + module index
+#
+# NOTE:
+# Keys are named exactly like the keys produced by wdump_decode_data() from
+# wdump's output, thus results can be used as drop-in replacement for wdump's
+# sections
+
+MASTER_DEBUG_HEADER = [
+	("signature", "H"),
+	("exe major", "B"),
+	("exe minor", "B"),
+	("obj major", "B"),
+	("obj minor", "B"),
+	("lang size", "H"),
+	("segment size", "H"),
+	("debug size", "I"),
+]
+
+SECTION_DEBUG_HEADER = [
+	("module info offset", "I"),
+	("global info offset", "I"),
+	("addr info offset", "I"),
+	("section size", "I"),
+	("section id", "H"),
+]
+
+MASTER_DEBUG_HEADER_STRUCT = struct.Struct("<" + str.join("", [ format_ for (_, format_) in MASTER_DEBUG_HEADER ]))
+SECTION_DEBUG_HEADER_STRUCT = struct.Struct("<" + str.join("", [ format_ for (_, format_) in SECTION_DEBUG_HEADER ]))
+MODULE_INFO_STRUCT = struct.Struct("<HIHIHIHB")		# language, locals, types, lines (offset + count each), name length
+GLOBAL_INFO_STRUCT = struct.Struct("<IHHBB")		# offset, segment, module index, kind, name length
+ADDR_INFO_BLOCK_STRUCT = struct.Struct("<IHH")		# base offset, base segment, count
+ADDR_INFO_ENTRY_STRUCT = struct.Struct("<IH")		# size, module index
+
+DEBUG_SIGNATURE = 0x8386
+DEBUG_MAJOR_VERSION = 3
+
+GLOBAL_KIND_STATIC = 0x01
+GLOBAL_KIND_DATA = 0x02
+GLOBAL_KIND_CODE = 0x04
+
+
+# Decode length-prefixed string at offset, returns (string, offset after string)
+def decode_lp_string(data, offset, length):
+	return (data[offset:offset+length].decode("latin-1"), offset + length)
+
+
+# Decode module info of section (between module info offset and global info
+# offset)
+def decode_module_info(data, start, end, languages):
+	decoded_data = OrderedDict()
+	offset = start
+	num = 0
+	while (offset < end):
+		(language, locals_offset, locals_count, types_offset, types_count, lines_offset, lines_count, name_length) = MODULE_INFO_STRUCT.unpack_from(data, offset)
+		(name, offset) = decode_lp_string(data, offset + MODULE_INFO_STRUCT.size, name_length)
+		decoded_data[num] = OrderedDict([("num", num), ("name", name), ("language", languages.get(language, None)), ("locals", OrderedDict([("count", locals_count), ("offset", locals_offset)])), ("types", OrderedDict([("count", types_count), ("offset", types_offset)])), ("lines", OrderedDict([("count", lines_count), ("offset", lines_offset)]))])
+		if (decoded_data[num]["language"] == None):
+			logging.warning("Module %d: invalid language offset: 0x%x" % (num, language))
+		num += 1
+	return decoded_data
+
+
+# Decode global info of section (between global info offset and addr info
+# offset)
+# NOTE: names like 'W?smp$n[]pn$_SAMPLE$$' are reduced the same way wdump_
+#       decode_data() does (i.e. 'W?smp$n[]pn$_SAMPLE$$' -> 'smp')
+def decode_global_info(data, start, end):
+	decoded_data = []
+	offset = start
+	while (offset < end):
+		(global_offset, segment, module, kind, name_length) = GLOBAL_INFO_STRUCT.unpack_from(data, offset)
+		(name, offset) = decode_lp_string(data, offset + GLOBAL_INFO_STRUCT.size, name_length)
+		match = re.match(r"^W\?([^$]+)\$", name)
+		if (match):
+			name = match.group(1)
+		if (kind & GLOBAL_KIND_CODE):
+			type_ = "code"
+		elif (kind & GLOBAL_KIND_DATA):
+			type_ = "data"
+		else:
+			logging.warning("Invalid global kind: '%s': 0x%02x" % (name, kind))
+			type_ = "unknown"
+		decoded_data.append(OrderedDict([("name", name), ("module", module), ("segment", segment), ("offset", global_offset), ("type", type_)]))
+	return decoded_data
+
+
+# Decode addr info of section (between addr info offset and end of section)
+# NOTE: file offsets are relative to start of addr info (like wdump lists them)
+def decode_addr_info(data, start, end):
+	decoded_data = []
+	offset = start
+	while (offset < end):
+		(base_offset, segment, count) = ADDR_INFO_BLOCK_STRUCT.unpack_from(data, offset)
+		block = OrderedDict([("file offset", offset - start), ("segment", segment), ("offset", base_offset), ("entries", OrderedDict())])
+		offset += ADDR_INFO_BLOCK_STRUCT.size
+		entry_offset = base_offset
+		for (num, (size, module)) in enumerate(ADDR_INFO_ENTRY_STRUCT.iter_unpack(data[offset:offset+count*ADDR_INFO_ENTRY_STRUCT.size])):
+			block["entries"][num] = OrderedDict([("num", num), ("file offset", offset - start), ("size", size), ("offset", entry_offset), ("module", module)])
+			entry_offset += size
+			offset += ADDR_INFO_ENTRY_STRUCT.size
+		decoded_data.append(block)
+	return decoded_data
+
+
+# Reads Watcom debug info directly from input file, returns sections in the
+# same format wdump_parse_output() does (i.e. 'master debug info' + numbered
+# sections 'module info', 'global info' and 'addr info' already merged) or
+# None if input file does not contain debug info or on error
+# NOTE:
+# Section offsets are reported relative to base_offset (offset of executable
+# within input file, e.g. DOS/4G(W) payload of bound executable), i.e. same
+# as wdump run on payload
+def debug_info_read(input_file, outfile_template, base_offset=0):
+	logging.info("")
+	logging.info("Reading debug info:")
+
+	sections = OrderedDict()
+	try:
+		logging.debug("Reading file '%s'..." % input_file)
+		with open(input_file, "rb") as infile, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+
+			# Master debug header (located at end of file)
+			if (len(data) < MASTER_DEBUG_HEADER_STRUCT.size):
+				logging.warning("Input file does not contain debug info")
+				return None
+			header_offset = len(data) - MASTER_DEBUG_HEADER_STRUCT.size
+			header = OrderedDict([ (key, value) for ((key, _), value) in zip(MASTER_DEBUG_HEADER, MASTER_DEBUG_HEADER_STRUCT.unpack_from(data, header_offset)) ])
+			if (header["signature"] != DEBUG_SIGNATURE):
+				logging.warning("Input file does not contain debug info")
+				return None
+			del header["signature"]
+			logging.debug("Debug info version: %d.%d, size: %d bytes" % (header["exe major"], header["exe minor"], header["debug size"]))
+			if (header["exe major"] != DEBUG_MAJOR_VERSION):
+				logging.error("Error: unsupported debug info version: %d.%d" % (header["exe major"], header["exe minor"]))
+				return None
+			if (header["debug size"] > len(data) or header["debug size"] < MASTER_DEBUG_HEADER_STRUCT.size + header["lang size"] + header["segment size"]):
+				logging.error("Error: invalid debug info size: %d bytes" % header["debug size"])
+				return None
+
+			# Languages (offset into table -> name), segments
+			start = len(data) - header["debug size"]
+			offset = start
+			languages = OrderedDict()
+			for name in data[offset:offset+header["lang size"]].split(b"\0"):
+				if (name != b""):
+					languages[offset-start] = name.decode("latin-1")
+				offset += len(name) + 1
+			offset = start + header["lang size"]
+			segments = struct.unpack_from("<%dH" % (header["segment size"] // 2), data, offset)
+			header["languages"] = list(languages.values())
+			header["segments"] = [ "%04X" % segment for segment in segments ]
+
+			# Sections
+			module_info = OrderedDict()
+			global_info = OrderedDict()
+			addr_info = OrderedDict()
+			header["sections"] = OrderedDict()
+			offset = start + header["lang size"] + header["segment size"]
+			while (offset < header_offset):
+				section = OrderedDict([ (key, value) for ((key, _), value) in zip(SECTION_DEBUG_HEADER, SECTION_DEBUG_HEADER_STRUCT.unpack_from(data, offset)) ])
+				num = section["section id"]
+				if (section["section size"] == 0 or offset + section["section size"] > header_offset):
+					logging.error("Error: section %d: invalid section size: %d bytes" % (num, section["section size"]))
+					return None
+				header["sections"][num] = OrderedDict([("num", num), ("offset", offset - base_offset)])
+				header["sections"][num].update(section)
+				logging.debug("Section %d: offset: 0x%x, size: %d bytes" % (num, offset - base_offset, section["section size"]))
+				module_info[num] = OrderedDict([("name", "Module Info (section %d)" % num), ("data", decode_module_info(data, offset + section["module info offset"], offset + section["global info offset"], languages))])
+				global_info[num] = OrderedDict([("name", "Global Info (section %d)" % num), ("data", decode_global_info(data, offset + section["global info offset"], offset + section["addr info offset"]))])
+				addr_info[num] = OrderedDict([("name", "Addr Info (section %d)" % num), ("data", decode_addr_info(data, offset + section["addr info offset"], offset + section["section size"]))])
+				logging.debug("Section %d: %d modules, %d globals, %d address blocks" % (num, len(module_info[num]["data"]), len(global_info[num]["data"]), len(addr_info[num]["data"])))
+				offset += section["section size"]
+
+			sections["master debug info"] = OrderedDict([("name", "Master Debug Info"), ("data", header)])
+			sections["module info"] = OrderedDict([("name", "Module Info"), ("data", module_info)])
+			sections["global info"] = OrderedDict([("name", "Global Info"), ("data", global_info)])
+			sections["addr info"] = OrderedDict([("name", "Addr Info"), ("data", addr_info)])
+
+	except (OSError, ValueError, struct.error, IndexError) as exception:
+		logging.error("Error: failed to read debug info: %s" % str(exception))
+		return None
+
+	# Print identified sections
+	logging.info("Identified sections:")
+	for section in sections:
+		logging.debug(sections[section]["name"])
+
+	# Write parsed debug info to file
+	output = format_pprint(sections)
+	logging.info("Writing parsed debug info to file (%d lines)..." % len(output))
+	write_file(outfile_template % "debug_info_parsed.txt", output)
+
+	# Return results
+	return sections
+
+
+# Checks debug info read by debug_info_read() against debug info parsed from
+# wdump output (sections 'module info', 'global info', 'addr info' and lists
+# of languages/segments of 'master debug info'), logs mismatches, returns
+# number of mismatches
+# NOTE: keys of master debug info are not compared, as they are not used and
+#       do not necessarily match wdump's labels
+# NOTE: only numbered sections present in debug info are compared, additional
+#       numbered sections of wdump output (e.g. 'Global Info (section 1)' of
+#       object hints) are not part of debug info
+def debug_info_check(debug_info, wdump, max_report=20):
+	logging.info("")
+	logging.info("Checking debug info against wdump output:")
+
+	mismatches = []
+
+	def compare(path, value1, value2):
+		if (isinstance(value1, dict) and isinstance(value2, dict)):
+			for key in list(value1.keys()) + [ key for key in value2.keys() if (not key in value1) ]:
+				if (not key in value1 or not key in value2):
+					mismatches.append("%s/%s: %s" % (path, key, "missing in wdump output" if (key in value1) else "missing in debug info"))
+					continue
+				compare("%s/%s" % (path, key), value1[key], value2[key])
+		elif (isinstance(value1, list) and isinstance(value2, list)):
+			if (len(value1) != len(value2)):
+				mismatches.append("%s: length mismatch: %d != %d" % (path, len(value1), len(value2)))
+			for i in range(0, min(len(value1), len(value2))):
+				compare("%s/%d" % (path, i), value1[i], value2[i])
+		elif (value1 != value2):
+			mismatches.append("%s: value mismatch: %s != %s" % (path, repr(value1), repr(value2)))
+
+	for section in ("module info", "global info", "addr info"):
+		if (not section in debug_info or not section in wdump):
+			mismatches.append("%s: section %s" % (section, "missing in wdump output" if (section in debug_info) else "missing in debug info"))
+			continue
+		for num in debug_info[section]["data"]:
+			if (not num in wdump[section]["data"]):
+				mismatches.append("%s/%d: section missing in wdump output" % (section, num))
+				continue
+			compare("%s/%d" % (section, num), debug_info[section]["data"][num], wdump[section]["data"][num])
+	if (dict_path_exists(debug_info, "master debug info", "data") and dict_path_exists(wdump, "master debug info", "data")):
+		for key in ("languages", "segments"):
+			compare("master debug info/%s" % key, debug_info["master debug info"]["data"].get(key, None), wdump["master debug info"]["data"].get(key, None))
+
+	for mismatch in mismatches[:max_report]:
+		logging.warning("Mismatch: %s" % mismatch)
+	if (len(mismatches) > max_report):
+		logging.warning("... (%d more mismatches)" % (len(mismatches) - max_report))
+	if (len(mismatches) == 0):
+		logging.debug("Debug info matches wdump output")
+	else:
+		logging.warning("Debug info does not match wdump output: %d mismatches" % len(mismatches))
+	return len(mismatches)
+
+
+# Merges debug info read by debug_info_read() into sections parsed from wdump
+# output; numbered sections are merged per section number (thus additional
+# numbered sections, e.g. 'Global Info (section 1)' of object hints, are re-
+# tained), debug info takes precedence
+def debug_info_merge(sections, debug_info):
+	for section in debug_info:
+		if (section in sections and section in ("module info", "global info", "addr info")):
+			for num in debug_info[section]["data"]:
+				sections[section]["data"][num] = debug_info[section]["data"][num]
+			sections[section]["data"] = OrderedDict(sorted(sections[section]["data"].items()))
+		else:
+			sections[section] = debug_info[section]
@@ -39,13 +39,11 @@
 # TODO when everything else is done and in order:
 # - split huge function 'disassemble_objects()' into sub-functions (might expose errors related to using local variables)
 # - rename 'object' to 'object_', 'type' to 'type_', 'global' to 'global_' to avoid reserved words and related side-effects
-# - change handling of plain disassembly (huge impact, backup before doing this!):
-#   - don't store plain assembly as text lines, instead split lines and store as dicts: OrderedDict([ ("start", 0x...), ("end", 0x...), ("length": ...), ("data": b'...'), ("command", "..."), ("arguments", "..."), ("comment", "...") ])
-#   - change generate_define_byte(), generate_data_disassembly() to generate dicts instead of text lines
-#   - store new disassembly as object["disassembly"], store structure as object["structure"], drop everything else (i.e. don't store formatted disassembly in object)
-#   -> eliminates the need to split asm lines again and again for analysis
+# + change handling of plain disassembly: plain/formatted disassembly stores assembly lines as AsmRecord objects
+#   (generated by generate_define_byte(), generate_data_disassembly(), generate_code_disassembly()), lines are
+#   split once and only rendered to text when writing results; split_asm_line() has been dropped
+# - store new disassembly as object["disassembly"], store structure as object["structure"], drop everything else (i.e. don't store formatted disassembly in object)
 #   -> enables us to generate final formatted output with only one single template
-#   -> function split_asm_line() can be dropped, as we now only need to split line once in generate_code_disassembly()
 
 
 # -------------------------------------
@@ -70,9 +68,13 @@ import re
 import ntpath
 import textwrap
 import logging
-from collections import OrderedDict
+import bisect
+import itertools
+import concurrent.futures
+from collections import OrderedDict, deque
 from modules.module_miscellaneous import *
 from modules.module_pretty_print import *
+from modules.module_worker_pool import *
 
 
 # -------------------------------------
@@ -81,33 +83,281 @@ from modules.module_pretty_print import *
 #                                     -
 # -------------------------------------
 
-# Split assembly line (objdump format)
-# TODO:
-# We often need start and end offset of assembler line; thus, it makes sense
-# to start start_ofs + end_ofs instead of just offset (to replace, search for
-# 'asm["offset"] + len(asm["data"]')
-def split_asm_line(line):
-	if (not isinstance(line, str)):
-		raise TypeError("line must be type str, not %s" % type(line).__name__)
+# Assembly line record (i.e. one line of plain disassembly, objdump format)
+#
+# Lines of disassembly are parsed/generated ONCE and stored as records; all
+# analysis passes operate on records directly, text is only rendered when
+# generating output (via str(record))
+#
+# Record fields:
+# offset:      offset of line (i.e. of instruction/data)
+# data:        raw bytes of instruction/data (bytes)
+# command:     command (mnemonic, data define command or prefix, e.g. 'ds')
+# arguments:   arguments/operands (may be empty)
+# comment:     comment (including leading ';') or None
+#
+# Formatting fields (required to render objdump output exactly as-is):
+# hex_width:   width of hex data column (objdump pads incomplete instructions
+#              at end of region differently)
+# spacing:     number of spaces between command and arguments
+# comment_pad: number of spaces between arguments and comment
+#
+# NOTE:
+# Comments are added using the equivalent of '"%-100s%s" % (line, comment)'
+# (see add_comment()), replace() affects arguments + comment just like the
+# equivalent str.replace() on a text line would; thus, rendered records are
+# identical to the text lines previously generated by objdump and string ops
+class AsmRecord():
+
+	__slots__ = ("offset", "data", "command", "arguments", "comment", "hex_width", "spacing", "comment_pad")
 
 	# Regex: (.*?) non-greedy, (;.*)? optional capturing group
-	#match = re.match(r"^([ ]*)([0-9a-fA-F]+):[ \t]+([0-9a-fA-F ]+)[ \t]+([^ ]+)[ ]*(.*?)\s*(;.*)?$", line) # tabs replaced with '[ \t]+'; objdump output comes with tabs, but we later replace those with spaces
-	match = re.match(r"^([ ]*)([0-9a-fA-F]+):\t([0-9a-fA-F ]+)\t([^ ]+)[ ]*(.*?)\s*(;.*)?$", line)
-	if (match):
-		return OrderedDict([("indent", match.group(1)), ("offset", int(match.group(2), 16)), ("data", bytes.fromhex(match.group(3).strip())), ("command", match.group(4)), ("arguments", match.group(5)), ("comment", match.group(6))])
-	return None
+	PARSE_REGEX = re.compile(r"^[ ]*([0-9a-fA-F]+):\t([0-9a-fA-F ]+)\t([^ ]+)([ ]*)(.*?)([ ]*)(;.*)?$")
+
+	def __init__(self, offset, data, command, arguments, comment=None, *, hex_width=20, spacing=None):
+		self.offset = offset
+		self.data = data
+		self.command = command
+		self.arguments = arguments
+		self.comment = None
+		self.hex_width = hex_width
+		self.spacing = spacing if (spacing != None) else (max(6 - len(command), 0) + 1) # equivalent of '%-6s %s'
+		self.comment_pad = 0
+		if (comment != None):
+			self.add_comment(comment)
+
+	# Parse assembly line (objdump format), return record or None if line could
+	# not be parsed
+	@classmethod
+	def parse(cls, line):
+		match = cls.PARSE_REGEX.match(line)
+		if (match == None):
+			return None
+		record = cls(int(match.group(1), 16), bytes.fromhex(match.group(2)), match.group(3), match.group(5), hex_width=len(match.group(2))-1, spacing=len(match.group(4)))
+		if (match.group(7) != None):
+			record.comment = match.group(7)
+			record.comment_pad = len(match.group(6))
+		return record
+
+	# End offset of line (offset + length of data)
+	@property
+	def end(self):
+		return self.offset + len(self.data)
+
+	# Render line without comment
+	def render_base(self):
+		return "%8x:\t%-*s \t%s%s%s" % (self.offset, self.hex_width, self.data.hex(" "), self.command, " " * self.spacing, self.arguments)
+
+	# Render line
+	def render(self):
+		if (self.comment == None):
+			return self.render_base()
+		return self.render_base() + " " * self.comment_pad + self.comment
+
+	def __str__(self):
+		return self.render()
+
+	def __repr__(self):
+		return "AsmRecord(%s)" % repr(self.render())
+
+	# Add comment (comment has to start with ';')
+	def add_comment(self, comment):
+		if (self.comment == None):
+			self.comment_pad = max(100 - len(self.render_base()), 0)
+			self.comment = comment
+		else:
+			self.comment += " " * max(100 - len(self.render_base()) - self.comment_pad - len(self.comment), 0) + comment
+
+	# Replace all occurrences of old with new (in arguments + comment)
+	def replace(self, old, new):
+		self.arguments = self.arguments.replace(old, new)
+		if (self.comment != None):
+			self.comment = self.comment.replace(old, new)
+
+	# Create copy of record
+	def copy(self):
+		record = AsmRecord.__new__(AsmRecord)
+		for key in self.__slots__:
+			setattr(record, key, getattr(self, key))
+		return record
+
+
+# Run of identical assembly lines (i.e. lines differing only in offsets, e.g.
+# zero-filled data, see generate_define_bytes())
+#
+# Runs are stored as a single record in place of the individual lines; they
+# render directly to the deduplicated form (see deduplicate_formatted_disas-
+# sembly()) and are only expanded to individual lines when rendering (see
+# render_disassembly()) or when being split (see split())
+#
+# Run fields:
+# record: record of first line of run (i.e. offset of run + template for all
+#         other lines of run)
+# count:  number of lines of run
+#
+# NOTE:
+# Runs have to be split at structure items and fixups (i.e. where labels or
+# comments have to be inserted or added, see generate_formatted_disassembly())
+class AsmRunRecord():
+
+	__slots__ = ("record", "count")
+
+	def __init__(self, record, count):
+		self.record = record
+		self.count = count
+
+	# Create run of count lines; returns record itself if count is 1
+	@classmethod
+	def create(cls, record, count):
+		return record if (count == 1) else cls(record, count)
+
+	# Offset of run (i.e. of first line)
+	@property
+	def offset(self):
+		return self.record.offset
+
+	# End offset of run (offset + length of data of all lines)
+	@property
+	def end(self):
+		return self.record.offset + self.count * len(self.record.data)
+
+	# Get record of line at index
+	def get_record(self, index):
+		record = self.record.copy()
+		record.offset += index * len(self.record.data)
+		return record
+
+	# Split run at offsets (sorted, within run and at line boundaries), returns
+	# list of runs and/or records
+	def split(self, offsets):
+		result = []
+		size = len(self.record.data)
+		index = 0
+		for offset in offsets + [ self.end ]:
+			split_index = (offset - self.record.offset) // size
+			if (split_index <= index):
+				continue
+			result.append(AsmRunRecord.create(self.get_record(index) if (index > 0) else self.record, split_index - index))
+			index = split_index
+		return result
+
+	# Render lines of run
+	def render_lines(self):
+		return [ self.get_record(index).render() for index in range(0, self.count) ]
+
+	def __repr__(self):
+		return "AsmRunRecord(%s, %d)" % (repr(self.record.render()), self.count)
+
+
+# Count lines of disassembly (list of records, runs and/or strings), i.e. runs
+# count as their number of lines
+def count_disassembly_lines(disassembly):
+	return sum([ item.count if (isinstance(item, AsmRunRecord)) else 1 for item in disassembly ])
+
+
+# Render disassembly (list of records, runs and/or strings) as list of strings
+# NOTE: runs are expanded to individual lines (see AsmRunRecord)
+def render_disassembly(disassembly):
+	result = []
+	for item in disassembly:
+		if (isinstance(item, AsmRunRecord)):
+			result += item.render_lines()
+		else:
+			result.append(str(item))
+	return result
+
+
+# Assembly operand (i.e. one operand of an assembly line, objdump Intel syntax)
+#
+# Operands are tokenized ONCE per line (see parse_all()) using precompiled
+# regexes; analysis passes then match values against operand fields instead
+# of searching the arguments string with per-value regexes
+#
+# Operand fields:
+# size:         size prefix (e.g. 'DWORD' for 'DWORD PTR ...') or None
+# segment:      segment override (e.g. 'ds' for 'ds:...') or None
+# memory:       True if operand is memory reference (i.e. has brackets, size
+#               prefix or segment override), False otherwise
+# base:         base register of indirect memory reference or None
+# index:        index register of indirect memory reference or None
+# scale:        scale of index register or None
+# displacement: displacement/address of memory reference or None
+# immediate:    immediate value or None
+# register:     register name (register operand) or None
+#
+# NOTE:
+# Operands that cannot be tokenized (e.g. strings of data define commands) have
+# all fields set to None/False, i.e. they never match anything
+class AsmOperand():
+
+	__slots__ = ("size", "segment", "memory", "base", "index", "scale", "displacement", "immediate", "register")
+
+	# Regex: optional prefix (e.g. 'movs' for 'rep movs ...'), optional size,
+	# optional segment, then either bracketed memory reference, hex value or
+	# register name
+	OPERAND_REGEX = re.compile(r"^(?:[a-z]+ )?(?:([A-Z]+) PTR )?(?:([a-z]s):)?(?:\[([^\]]*)\]|0x([0-9a-fA-F]+)|([a-z][a-z0-9]*))$")
+	TERM_REGEX = re.compile(r"([+-]?)(?:0x([0-9a-fA-F]+)|([a-z][a-z0-9]*)(?:\*([0-9]+))?)")
+
+	# Access sizes of general purpose registers
+	REGISTER_SIZES = { **{ reg: "DWORD" for reg in ("eax", "ebx", "ecx", "edx", "esp", "ebp", "esi", "edi") },
+	                   **{ reg: "WORD" for reg in ("ax", "bx", "cx", "dx", "sp", "bp", "si", "di") },
+	                   **{ reg: "BYTE" for reg in ("al", "ah", "bl", "bh", "cl", "ch", "dl", "dh") } }
+
+	def __init__(self):
+		self.size = None
+		self.segment = None
+		self.memory = False
+		self.base = None
+		self.index = None
+		self.scale = None
+		self.displacement = None
+		self.immediate = None
+		self.register = None
+
+	# Parse single operand, returns operand (fields remain unset if operand
+	# could not be parsed)
+	@classmethod
+	def parse(cls, operand):
+		result = cls()
+		match = cls.OPERAND_REGEX.match(operand)
+		if (match == None):
+			return result
+		(size, segment, memref, value, register) = match.groups()
+		result.size = size
+		result.segment = segment
+		if (memref != None):
+			result.memory = True
+			for (sign, term_value, term_register, scale) in cls.TERM_REGEX.findall(memref):
+				if (term_value != ""):
+					result.displacement = -int(term_value, 16) if (sign == "-") else int(term_value, 16)
+				elif (scale != ""):
+					result.index = term_register
+					result.scale = int(scale)
+				else:
+					result.base = term_register
+		elif (value != None):
+			if (size != None or segment != None):
+				result.memory = True
+				result.displacement = int(value, 16)
+			else:
+				result.immediate = int(value, 16)
+		elif (size == None and segment == None):
+			result.register = register
+		return result
 
+	# Parse all operands of arguments string, returns list of operands
+	@classmethod
+	def parse_all(cls, arguments):
+		if (arguments == ""):
+			return []
+		return [ cls.parse(operand) for operand in arguments.split(",") ]
 
-# Format split asm line as string
-# TODO: only a stub for now
-def format_split_asm(asm):
-	for (key, key_type) in (("offset", int), ("data", bytes), ("command", str), ("arguments", str)):
-		if (not key in asm):
-			raise ValueError("asm dict does not contain key '%s'" % key)
-		if (not isinstance(asm[key], key_type)):
-			raise TypeError("asm[\"%s\"] must be type %s, not %s" % (key, key_type.__name__, type(asm[key]).__name__))
+	# Check if operand contains value (as displacement or immediate)
+	def has_value(self, value):
+		return (self.displacement == value or self.immediate == value)
 
-	return "%x:  %s  %s %s" % (asm["offset"], asm["data"].hex(" "), asm["command"], asm["arguments"])
+	def __repr__(self):
+		return "AsmOperand(%s)" % str.join(", ", [ "%s=%s" % (key, repr(getattr(self, key))) for key in self.__slots__ if (getattr(self, key) not in (None, False)) ])
 
 
 # Check if byte value (integer of range 0-255) is within ASCII range (https://www.asciitable.com/)
@@ -128,7 +378,20 @@ def format_split_asm(asm):
 #	return False
 
 
-# Generate define byte (db) assembly line (objdump format)
+# Value strings and comments of define byte (db) lines (indexed by value)
+# NOTE: precomputed to speed up bulk generation (see generate_define_bytes())
+DEFINE_BYTE_ESCAPES = { 0: "\\0", 7: "\\a", 8: "\\b", 9: "\\t", 10: "\\n", 11: "\\v", 12: "\\f", 13: "\\r", 27: "\\e" }
+DEFINE_BYTE_DATA = [ bytes((value,)) for value in range(0, 256) ]
+DEFINE_BYTE_VALUES = [ "0x%02x" % value for value in range(0, 256) ]
+DEFINE_BYTE_COMMENTS = [ "; dec: %3d, chr: '%s'" % (value, DEFINE_BYTE_ESCAPES[value] if (value in DEFINE_BYTE_ESCAPES) else chr(value) if (value >= 32 and value <= 126) else "") for value in range(0, 256) ]
+DEFINE_BYTE_COMMENT_PAD = AsmRecord(0, DEFINE_BYTE_DATA[0], "db", DEFINE_BYTE_VALUES[0], DEFINE_BYTE_COMMENTS[0]).comment_pad
+
+# Minimum length of runs of zeros generated as single run (see AsmRunRecord)
+ZERO_RUN_MIN_LENGTH = 16
+ZERO_RUN_REGEX = re.compile(rb"\x00{%d,}" % ZERO_RUN_MIN_LENGTH)
+
+
+# Generate define byte (db) assembly line (objdump format), returns record
 def generate_define_byte(offset, value, *, comment=False):
 	if (not isinstance(offset, int)):
 		raise TypeError("offset must be type int, not %s" % type(offset).__name__)
@@ -143,46 +406,52 @@ def generate_define_byte(offset, value, *, comment=False):
 
 	#result = "%8x:\t%02x                   \t%-6s 0x%02x" % (offset, value, "db", value)
 	#result = "%8x:  %-20.02x   %-6s 0x%02x" % (offset, value, "db", value) # tabs replaced with '  '
-	result = "%8x:\t%-20.02x \t%-6s 0x%02x" % (offset, value, "db", value)
-	if (comment == True):
-		if (value == 0):
-			char = "\\0"
-		elif (value == 7):
-			char = "\\a"
-		elif (value == 8):
-			char = "\\b"
-		elif (value == 9):
-			char = "\\t"
-		elif (value == 10):
-			char = "\\n"
-		elif (value == 11):
-			char = "\\v"
-		elif (value == 12):
-			char = "\\f"
-		elif (value == 13):
-			char = "\\r"
-		elif (value == 27):
-			char = "\\e"
-		elif (value >= 32 and value <= 126):
-			char = chr(value)
-		else:
-			char = ""
-		#if (value > 0):
-		#	#result += "    ; dec: %3d, chr: '%s'" % (value, char)
-		#	result = "%-100s; dec: %3d, chr: '%s'" % (result, value, char)
-		result = "%-100s; dec: %3d, chr: '%s'" % (result, value, char)
+	#result = "%8x:\t%-20.02x \t%-6s 0x%02x" % (offset, value, "db", value)
+	#result = "%-100s; dec: %3d, chr: '%s'" % (result, value, char)
+	return AsmRecord(offset, DEFINE_BYTE_DATA[value], "db", DEFINE_BYTE_VALUES[value], DEFINE_BYTE_COMMENTS[value] if (comment == True) else None)
+
+
+# Generate define byte (db) assembly lines with comments for range of binary
+# data (bytes, bytearray or memoryview), returns list of records
+# NOTE: bulk equivalent of calling generate_define_byte(..., comment=True) for
+#       each byte from start_ofs to end_ofs (excluding end_ofs)
+# NOTE: rendered width of db lines only depends on width of offset, which is
+#       constant for offsets < 0x100000000; thus comment padding is computed
+#       once (DEFINE_BYTE_COMMENT_PAD) instead of rendering each line (see
+#       AsmRecord.add_comment())
+# NOTE: runs of at least ZERO_RUN_MIN_LENGTH zeros (e.g. virtual padding) are
+#       located via regex and generated as single run (see AsmRunRecord)
+def generate_define_bytes(data, start_ofs, end_ofs):
+	if (end_ofs > 0x100000000):
+		return [ generate_define_byte(offset, value, comment=True) for (offset, value) in zip(range(start_ofs, end_ofs), data[start_ofs:end_ofs]) ]
+	comment_pad = DEFINE_BYTE_COMMENT_PAD
+	result = []
+	offset = start_ofs
+	for match in itertools.chain(ZERO_RUN_REGEX.finditer(data, start_ofs, end_ofs), [ None ]):
+		run_start = match.start() if (match != None) else end_ofs
+		for (offset, value) in zip(range(offset, run_start), data[offset:run_start]):
+			record = AsmRecord(offset, DEFINE_BYTE_DATA[value], "db", DEFINE_BYTE_VALUES[value])
+			record.comment = DEFINE_BYTE_COMMENTS[value]
+			record.comment_pad = comment_pad
+			result.append(record)
+		if (match != None):
+			result.append(AsmRunRecord(generate_define_byte(run_start, 0, comment=True), match.end() - run_start))
+			offset = match.end()
 	return result
 
 
 # Generate disassembly of binary data (bytes, bytearray or memoryview) inter-
 # preted as code. Begins at start_ofs, stops when offset >= end_ofs or offset
-# >= len(data). Returns offset, length, disassembly (list of strings) and bad
+# >= len(data). Returns offset, length, disassembly (list of records) and bad
 # code sections (list of dicts)
 # NOTE:
 # Mode argument currently unused, added to be compatible to object hint format
 # and generate_data_disassembly(); might be useful in the future in case we need
 # different ways to disassemble code
-def generate_code_disassembly(data, start_ofs, end_ofs, mode, objdump_exec, line_num, bad_num, verbose=False):
+# NOTE:
+# If objdump_cache is specified (ObjdumpCache instance), objdump output is
+# looked up in/stored to cache, objdump is only run on cache misses
+def generate_code_disassembly(data, start_ofs, end_ofs, mode, objdump_exec, line_num, bad_num, verbose=False, objdump_cache=None):
 	if (not (isinstance(data, bytes) or isinstance(data, bytearray) or isinstance(data, memoryview))):
 		raise TypeError("data must be type bytes, bytearray or memoryview, not %s" % type(data).__name__)
 	if (not isinstance(start_ofs, int)):
@@ -210,59 +479,99 @@ def generate_code_disassembly(data, start_ofs, end_ofs, mode, objdump_exec, line
 	disassembly = []
 	bad_list = []
 
-	# Write data to temporary file (necessary as objdump will only read from files)
-	if (verbose == True): logging.debug("Writing data to temporary file...")
-	tmpfile = tempfile.NamedTemporaryFile(mode="w+b", delete=False)
-	tmpfile.write(data)
-	tmpfile.close()
+	# Temporary file for data (necessary as objdump will only read from files);
+	# created on demand, i.e. not at all if all objdump runs are cache hits
+	tmpfile = None
 
-	# Disassembly loop (loops whenever bad code is detected)
+	# Disassembly loop (single objdump run per region; only loops again if an
+	# instruction boundary has to move, i.e. if resyncing after bad code fails)
+	# NOTE:
+	# When bad code (zero padding) is detected, objdump's output for the zeros
+	# is discarded and disassembly continues at the first non-zero byte. As the
+	# linear sweep of objdump is stateless, lines of the existing output can be
+	# reused as long as one of them starts exactly at that offset. Only if no
+	# line does (i.e. the decoded zeros overlap the resync offset) objdump has
+	# to be run again starting at the resync offset
 	data_len = len(data)
 	while_again = True
 	while (while_again == True and offset < data_len and offset < end_ofs):
 		while_again = False
 
-		# Run objdump, fetch output
+		# Look up objdump output in cache
 		#logging.debug("Disassembling code from offset 0x%x to offset 0x%x (mode: %s)..." % (offset, end_ofs, mode))
-		command = [objdump_exec, "--disassemble-all", "--disassemble-zeroes", "--wide", "--architecture=i386", "--disassembler-options=intel,i386", "--target=binary", "--start-address=0x%x" % offset, "--stop-address=0x%x" % end_ofs, tmpfile.name]
-		if (verbose == True): logging.debug("Running command '%s'..." % str.join(" ", command))
-		try:
-			sub_process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
-		except Exception as exception:
-			logging.error("Error: failed to run command: %s" % str(exception))
-			break
-		if (sub_process.returncode != 0):
-			logging.error("Error: command failed with exit code %d:" % sub_process.returncode)
-			logging.error(sub_process.stdout if (sub_process.stdout != "") else "<no output>")
-			break
-		output = sub_process.stdout.splitlines()
-
-		# Reduce output to actual code listing
-		for i in range(0, len(output)):
-			if (re.match(r"^([0-9a-fA-F]+) <.data(\+0x[0-9a-fA-F]+)?>:$", output[i])):
-				output = output[i+1:]
+		arguments = ["--disassemble-all", "--disassemble-zeroes", "--wide", "--architecture=i386", "--disassembler-options=intel,i386", "--target=binary", "--start-address=0x%x" % offset, "--stop-address=0x%x" % end_ofs]
+		output = None
+		if (objdump_cache != None):
+			cache_key = objdump_cache.make_key(data, offset, end_ofs, arguments)
+			output = objdump_cache.get(cache_key)
+			if (verbose == True): logging.debug("Objdump cache %s for offset 0x%x - 0x%x (key: %s)" % ("hit" if (output != None) else "miss", offset, end_ofs, cache_key))
+
+		if (output == None):
+
+			# Write data to temporary file
+			if (tmpfile == None):
+				if (verbose == True): logging.debug("Writing data to temporary file...")
+				tmpfile = tempfile.NamedTemporaryFile(mode="w+b", delete=False)
+				tmpfile.write(data)
+				tmpfile.close()
+
+			# Run objdump, fetch output
+			command = [objdump_exec] + arguments + [tmpfile.name]
+			if (verbose == True): logging.debug("Running command '%s'..." % str.join(" ", command))
+			try:
+				sub_process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+			except Exception as exception:
+				logging.error("Error: failed to run command: %s" % str(exception))
+				break
+			if (sub_process.returncode != 0):
+				logging.error("Error: command failed with exit code %d:" % sub_process.returncode)
+				logging.error(sub_process.stdout if (sub_process.stdout != "") else "<no output>")
 				break
+			output = sub_process.stdout.splitlines()
 
-		# Process output, add to disassembly, detect bad code
+			# Reduce output to actual code listing
+			for i in range(0, len(output)):
+				if (re.match(r"^([0-9a-fA-F]+) <.data(\+0x[0-9a-fA-F]+)?>:$", output[i])):
+					output = output[i+1:]
+					break
+
+			# Store output in cache
+			if (objdump_cache != None):
+				objdump_cache.put(cache_key, output)
+
+		# Process output, add to disassembly, detect bad code, resync after bad
+		# code (resync_ofs: offset to resync at, run_start: index of first line
+		# after last resync, i.e. equivalent of line 0 of a fresh objdump run)
 		if (verbose == True): logging.debug("Processing command output (%d lines)..." % len(output))
+		resync_ofs = None
+		run_start = 0
 		for i in range(0, len(output)):
 			line = output[i]
-			# Replace tabs after offset and hex data with '  ' (as tabs mess with
-			# indentation when comments are added later on, e.g. for fixups)
-			# FIXME: this is desirable, but creates lots of problems for split_asm_line(),
-			#        thus disabled for now; we'll come back to this when migrating from
-			#        text lines to dicts, i.e. when only one initial split takes place
-			#line = line.replace(":\t", ":  ") # tab after '<offset>:'
-			#line = line.replace(" \t", "  ")  # tab after hex data
-			#line = line.replace("\t", "  ") # replace tabs after offset and hex data with '  '
-			disassembly.append(line)
+			asm = AsmRecord.parse(line)
 
-			asm = split_asm_line(line)
+			# Skip lines until resync offset is reached; stop processing if resync
+			# offset lies within an instruction (boundary has to move -> rerun)
+			if (resync_ofs != None):
+				if (asm == None or asm.offset < resync_ofs):
+					continue
+				if (asm.offset > resync_ofs):
+					break
+				if (verbose == True): logging.debug("Resynced with command output at offset 0x%x (line %d)" % (resync_ofs, i+1))
+				resync_ofs = None
+				run_start = i
+
+			# Add record to disassembly (invalid lines are added as-is)
+			# NOTE: replacing tabs after offset and hex data with '  ' (as tabs mess
+			#       with indentation when comments are added later on, e.g. for fix-
+			#       ups) would now be possible in AsmRecord.render_base(); not done
+			#       yet to keep output compatible
 			if (asm == None):
-				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, line))
+				disassembly.append(line)
+				logging.warning("Invalid assembly line: line %d: '%s'" % (i-run_start+1, line))
 				continue
-			offset = asm["offset"] + len(asm["data"])
-			length += len(asm["data"])
+			disassembly.append(asm)
+			offset = asm.end
+			length += len(asm.data)
 
 			# Detect bad code: if ret or jmp is followed by zero(s), find first non-zero
 			# byte after command and continue disassembling from that point on; add zero(s)
@@ -271,14 +580,14 @@ def generate_code_disassembly(data, start_ofs, end_ofs, mode, objdump_exec, line
 			# So far we have only seen those at the very end of modules and objects. Thus,
 			# presumably, module starts/ends and object ends/sizes have to adhere to some
 			# form of alignment
-			if ((asm["command"] == "ret" or asm["command"] == "jmp") and offset < data_len and offset < end_ofs and data[offset] == 0):
+			if ((asm.command == "ret" or asm.command == "jmp") and offset < data_len and offset < end_ofs and data[offset] == 0):
 				bad_num += 1
 				bad_start = offset
 				bad_end = offset
 				bad_length = 0
-				bad_type = "zero after ret" if (asm["command"] == "ret") else "zero after jmp" if (asm["command"] == "jmp") else "unknown"
+				bad_type = "zero after ret" if (asm.command == "ret") else "zero after jmp" if (asm.command == "jmp") else "unknown"
 				bad_line = max(line_num + len(disassembly) - 1, 0)
-				bad_context = ([output[i-1]] if (i > 0) else []) + ([output[i], output[i+1], output[i+2]] if (i < len(output)-2) else [output[i], output[i+1]] if (i < len(output)-1) else [output[i]])
+				bad_context = ([output[i-1]] if (i > run_start) else []) + ([output[i], output[i+1], output[i+2]] if (i < len(output)-2) else [output[i], output[i+1]] if (i < len(output)-1) else [output[i]])
 				while (offset < data_len and offset < end_ofs and data[offset] == 0):
 					disassembly.append(generate_define_byte(offset, data[offset], comment=False))
 					bad_length += 1
@@ -293,22 +602,50 @@ def generate_code_disassembly(data, start_ofs, end_ofs, mode, objdump_exec, line
 
 				if (offset < data_len and offset < end_ofs):
 					if (verbose == True): logging.warning("Continuing disassembly at offset 0x%x..." % offset)
-					while_again = True
+					resync_ofs = offset
 				else:
 					if (verbose == True): logging.warning("Reached end of data at offset 0x%x." % offset)
-				break # break for-loop -> next iteration of 'while (while_again == True)' loop
+					break
+
+		# Resync failed (no line of output starts at resync offset) -> run objdump
+		# again starting at resync offset
+		if (resync_ofs != None):
+			if (verbose == True): logging.debug("Failed to resync with command output at offset 0x%x, running command again..." % resync_ofs)
+			while_again = True
 
 	# Remove temporary file
-	if (verbose == True): logging.debug("Removing temporary file...")
-	os.remove(tmpfile.name)
+	if (tmpfile != None):
+		if (verbose == True): logging.debug("Removing temporary file...")
+		os.remove(tmpfile.name)
 
 	# Return results
 	return (offset, length, disassembly, bad_list)
 
 
+# Regexes for string detection/decoding of generate_data_disassembly():
+# AUTO_STRING_REGEX:       run of at least 3 chars of ASCII printable chars +
+#                          non-printable chars that would actually be used in
+#                          a string (0x07-0x0d, 0x1b); run is a string if it
+#                          is null-terminated (checked separately, matching
+#                          terminator as part of regex leads to quadratic
+#                          backtracking for long runs without terminator)
+# AUTO_STRING_PARTS_REGEX: splits auto-detected string into parts, i.e. runs
+#                          of ASCII printable chars excluding double quote
+#                          (used to denote strings and thus must not appear
+#                          inside strings) and single other chars
+# STRINGS_REGEX:           null-terminated string (last string does not have
+#                          to be null-terminated)
+# STRINGS_PARTS_REGEX:     splits string into parts, i.e. runs of ASCII
+#                          printable chars and single other chars
+AUTO_STRING_REGEX = re.compile(rb"[\x07-\x0d\x1b\x20-\x7e]{3,}")
+AUTO_STRING_PARTS_REGEX = re.compile(rb"([\x20\x21\x23-\x7e]+)|(.)", re.DOTALL)
+STRINGS_REGEX = re.compile(rb"[^\x00]*\x00|[^\x00]+")
+STRINGS_PARTS_REGEX = re.compile(rb"([\x20-\x7e]+)|(.)", re.DOTALL)
+
+
 # Generate disassembly of binary data (bytes, bytearray or memoryview) inter-
 # preted as data. Begins at start_ofs, stops when offset >= end_ofs or offset
-# >= len(data). Returns offset, length and disassembly (list of strings)
+# >= len(data). Returns offset, length and disassembly (list of records)
 def generate_data_disassembly(data, start_ofs, end_ofs, mode):
 	if (not (isinstance(data, bytes) or isinstance(data, bytearray) or isinstance(data, memoryview))):
 		raise TypeError("data must be type bytes, bytearray or memoryview, not %s" % type(data).__name__)
@@ -332,7 +669,7 @@ def generate_data_disassembly(data, start_ofs, end_ofs, mode):
 
 	data_len = len(data)
 	#asm_template = "%8x:  %-20s   %-6s %s"					# <offset>:  <hex-data>   <define-cmd> <value>; tabs replaced with '  '
-	asm_template = "%8x:\t%-20s \t%-6s %s"					# <offset>:\t<hex-data> \t<define-cmd> <value>
+	#asm_template = "%8x:\t%-20s \t%-6s %s"					# <offset>:\t<hex-data> \t<define-cmd> <value>
 
 	#logging.debug("Disassembling data from offset 0x%x to offset 0x%x (mode: %s)..." % (start_ofs, end_ofs, mode))
 
@@ -341,145 +678,42 @@ def generate_data_disassembly(data, start_ofs, end_ofs, mode):
 		mode = "auto-strings"								# works nicely as default, helps with investigating uncharted data objects
 
 	if (mode == "auto-strings"): 							# ASCII string auto-detection + bytes
-		min_len = 3											# minimum string length (excluding trailing '\0' if need_null == True)
-		need_null = True									# do strings have to be null-terminated?
-		strings = []
-		hints = []
-		#hint_template = "x) start = %08XH, end = %08XH, type = data, mode = string, comment = String"
-		hint_template = "x) offset = %08XH, length = %08XH, type = data, mode = string, comment = String"
-		while (offset < data_len and offset < end_ofs):
-			is_candidate = False
-			if (offset < data_len - min_len and offset < end_ofs - min_len): # possible candidate if min_len further bytes are available and within ASCII range
-				is_candidate = True
-				for ofs in range(offset, offset + min_len):
-					#if (not is_ascii(data[ofs], only_printable=True)):
-					#if (not data[ofs] in range(1, 127)):
-					if (not ((data[ofs] in (7, 8, 9, 10, 11, 12, 13, 27)) or (data[ofs] in range(32, 127)))):
-						is_candidate = False
-						break
-			if (is_candidate == True):
-				line_ofs = offset
-				is_string = True
-				str_parts = []
-				values = []
-				while (offset < data_len and offset < end_ofs):
-					value = data[offset]
-					values.append(value)
-
-					#if (value > 127):						# non-ASCII range
-					#	if (need_null == True):				# null-termination required -> false positive, not a string; null-termination not required -> string
-					#		is_string = False
-					#	else:								# null-termination not required -> string is complete; last value has to be removed (was added before if, but is not part of string)
-					#		values.pop()
-					#		#offset = max(offset - 1, 0)
-					#	break
-					#elif (value >= 32 and value <= 126):	# ASCII printable range
-					#	if (len(str_parts) == 0 or isinstance(str_parts[-1], int)):
-					#		str_parts.append("")			# add new string part
-					#	str_parts[-1] += chr(value)			# add to last string part
-					#else:									# ASCII non-printable range
-					#	str_parts.append(value)
-
-					#if (value in (0, 7, 8, 9, 10, 13)):	# ASCII non-printable chars (reduced to those that would actually be used in a string)
-					#if (value in (0, 7, 8, 9, 10, 11, 12, 13, 27)):     # ASCII non-printable chars (reduced to those that would actually be used in a string)
-					#if (value in (0, 7, 8, 9, 10, 11, 12, 13, 27, 39)): # ASCII non-printable chars (reduced to those that would actually be used in a string) + single quote (used to denote strings and thus must not appear inside strings)
-					if (value in (0, 7, 8, 9, 10, 11, 12, 13, 27, 34)):  # ASCII non-printable chars (reduced to those that would actually be used in a string) + double quote (used to denote strings and thus must not appear inside strings)
-						str_parts.append(value)
-					elif (value >= 32 and value <= 126):	# ASCII printable chars
-						if (len(str_parts) == 0 or isinstance(str_parts[-1], int)):
-							str_parts.append("")			# add new string part
-						str_parts[-1] += chr(value)			# add to last string part
-					else:									# everything else
-						if (need_null == True):				# null-termination required -> false positive, not a string; null-termination not required -> string
-							is_string = False
-						else:								# null-termination not required -> string is complete
-							values.pop()					# last value has to be removed (was added before if, but is not part of string)
-							#offset = max(offset - 1, 0)
-						break
-
-					offset += 1
-					if (value == 0):						# '\0' -> end of string reached
-						break
-				if (need_null == True and len(values) > 0 and values[-1] != 0): # null-terminated?
-					is_string = False
-				if (is_string == True):
-					#str_str = str.join(",", [ "0x%02x" % part if isinstance(part, int) else "'%s'" % part for part in str_parts ]) # denote string using single quotes
-					str_str = str.join(",", [ "0x%02x" % part if isinstance(part, int) else "\"%s\"" % part for part in str_parts ]) # denote string using double quotes
-					hex_str = str.join(" ", [ "%02x" % value for value in values ])
-					#hint_str = hint_template % (line_ofs, line_ofs + len(values))
-					hint_str = hint_template % (line_ofs, len(values))
-					#logging.debug("Found string: '%s', hint: '%s'" % (str_str, hint_str))
-					strings.append(str_str)
-					hints.append(hint_str)
-					disassembly.append(asm_template % (line_ofs, hex_str, "db", str_str))
-					length += len(values)
-					continue
-				for ofs in range(line_ofs, offset):			# string turned out to be false positive -> decode data as bytes
-					disassembly.append(generate_define_byte(ofs, data[ofs], comment=True))
-					length += 1
+		# NOTE:
+		# Candidates are null-terminated runs of at least min_len (= 3) chars of
+		# ASCII printable chars + non-printable chars that would actually be used
+		# in a string (see AUTO_STRING_REGEX); candidates are located in bulk via
+		# regex (maximal runs, terminator is checked here), data in between
+		# candidates is decoded as bytes
+		run_end = min(data_len, end_ofs)
+		for match in AUTO_STRING_REGEX.finditer(data, offset, run_end):
+			if (match.end() >= run_end or data[match.end()] != 0):
 				continue
-			disassembly.append(generate_define_byte(offset, data[offset], comment=True)) # decode data as bytes
-			length += 1
-			offset += 1
-		###logging.debug("Auto-detected strings:")
-		###if (len(strings) > 0):
-		###	for string in strings: logging.debug(string)
-		###else:
-		###	logging.debug("(none)")
-		###logging.debug("Hints for strings:")
-		###if (len(hints) > 0):
-		###	for hint in hints: logging.debug(hint)
-		###else:
-		###	logging.debug("(none)")
-		##if (len(strings) > 0):
-		##	logging.debug("Auto-detected strings:")
-		##	for string in strings: logging.debug(string)
-		##if (len(hints) > 0):
-		##	logging.debug("Hints for strings:")
-		##	for hint in hints: logging.debug(hint)
-		#for string in strings:
-		#	logging.debug(string)
+			disassembly += generate_define_bytes(data, offset, match.start())
+			values = bytes(data[match.start():match.end()+1])
+			str_str = str.join(",", [ "\"%s\"" % part.decode("ascii") if (part != b"") else "0x%02x" % value[0] for (part, value) in AUTO_STRING_PARTS_REGEX.findall(values) ]) # denote string using double quotes
+			disassembly.append(AsmRecord(match.start(), values, "db", str_str))
+			offset = match.end() + 1
+		if (offset < run_end):
+			disassembly += generate_define_bytes(data, offset, run_end)
+			offset = run_end
+		length = offset - start_ofs
 
 	elif (mode == "strings"):								# null-terminated strings (may or may not be ASCII)
-		while (offset < data_len and offset < end_ofs):
-			line_ofs = offset
-			str_parts = []
-			values = []
-			while (offset < data_len and offset < end_ofs):
-				value = data[offset]
-				values.append(value)
-				if (value >= 32 and value <= 126):			# ASCII printable range
-					if (len(str_parts) == 0 or isinstance(str_parts[-1], int)):
-						str_parts.append("")
-					str_parts[-1] += chr(value)
-				else:										# everything else
-					str_parts.append(value)
-				offset += 1
-				if (value == 0):							# by doing it like this, last string does not have to be null-terminated
-					break
-			str_str = str.join(",", [ "0x%x" % part if isinstance(part, int) else "\"%s\"" % part for part in str_parts ])
-			hex_str = str.join(" ", [ "%02x" % value for value in values ])
-			disassembly.append(asm_template % (line_ofs, hex_str, "db", str_str))
-			length += len(values)
+		str_cache = {}										# formatted strings (by values), speeds up runs of zeros
+		for match in STRINGS_REGEX.finditer(data, offset, min(data_len, end_ofs)): # by doing it like this, last string does not have to be null-terminated
+			values = bytes(match.group(0))
+			if (not values in str_cache):
+				str_cache[values] = str.join(",", [ "\"%s\"" % part.decode("ascii") if (part != b"") else "0x%x" % value[0] for (part, value) in STRINGS_PARTS_REGEX.findall(values) ])
+			disassembly.append(AsmRecord(match.start(), values, "db", str_cache[values]))
+			offset = match.end()
+		length = offset - start_ofs
 
 	elif (mode == "string"):								# one single string (may or may not be ASCII and/or null-terminated)
-		line_ofs = offset
-		str_parts = []
-		values = []
-		while (offset < data_len and offset < end_ofs):
-			value = data[offset]
-			values.append(value)
-			if (value >= 32 and value <= 126):				# ASCII printable range
-				if (len(str_parts) == 0 or isinstance(str_parts[-1], int)):
-					str_parts.append("")
-				str_parts[-1] += chr(value)
-			else:											# everything else
-				str_parts.append(value)
-			offset += 1
-		str_str = str.join(",", [ "0x%x" % part if isinstance(part, int) else "\"%s\"" % part for part in str_parts ])
-		hex_str = str.join(" ", [ "%02x" % value for value in values ])
-		disassembly.append(asm_template % (line_ofs, hex_str, "db", str_str))
-		length += len(values)
+		values = bytes(data[offset:min(data_len, end_ofs)]) if (offset < data_len and offset < end_ofs) else b""
+		str_str = str.join(",", [ "\"%s\"" % part.decode("ascii") if (part != b"") else "0x%x" % value[0] for (part, value) in STRINGS_PARTS_REGEX.findall(values) ])
+		disassembly.append(AsmRecord(offset, values, "db", str_str))
+		offset += len(values)
+		length = len(values)
 
 	# NOTE: integrated this into the case below -> makes sense to have all these
 	#       data types grouped and also facilitates adding support for run-length
@@ -535,25 +769,45 @@ def generate_data_disassembly(data, start_ofs, end_ofs, mode):
 	#			offset += 1
 
 	# Same as above, but eliminated if-else for remainder handling
+	#elif (mode in ("bytes", "words", "dwords", "fwords", "qwords", "tbytes")):	# bytes, words, dwords, fwords, qwords, tbytes
+	#	mode_defines = { "bytes": "db", "words": "dw", "dwords": "dd", "fwords": "df", "qwords": "dq", "tbytes": "dt" }
+	#	mode_sizes = { "bytes": 1, "words": 2, "dwords": 4, "fwords": 6, "qwords": 8, "tbytes": 10 }
+	#	mode_define = mode_defines[mode]
+	#	mode_size = mode_sizes[mode]
+	#	while (offset < data_len and offset < end_ofs):
+	#		if (offset > data_len - mode_size or offset > end_ofs - mode_size):	# decode remainder as bytes
+	#			mode = "bytes"
+	#			mode_define = mode_defines[mode]
+	#			mode_size = mode_sizes[mode]
+	#		values = bytes(data[offset:offset+mode_size])
+	#		if (mode == "bytes"):
+	#			disassembly.append(generate_define_byte(offset, data[offset], comment=True))
+	#		else:
+	#			val_str = "0x" + str.join("", [ "%02x" % value for value in reversed(values) ])
+	#			disassembly.append(AsmRecord(offset, values, mode_define, val_str))
+	#		length += mode_size
+	#		offset += mode_size
+
+	# Same as above, but processing entire run at once: run is copied once,
+	# values are generated from reversed (i.e. little endian) hex of items,
+	# remainder and bytes are generated in bulk (see generate_define_bytes())
 	elif (mode in ("bytes", "words", "dwords", "fwords", "qwords", "tbytes")):	# bytes, words, dwords, fwords, qwords, tbytes
 		mode_defines = { "bytes": "db", "words": "dw", "dwords": "dd", "fwords": "df", "qwords": "dq", "tbytes": "dt" }
 		mode_sizes = { "bytes": 1, "words": 2, "dwords": 4, "fwords": 6, "qwords": 8, "tbytes": 10 }
 		mode_define = mode_defines[mode]
 		mode_size = mode_sizes[mode]
-		while (offset < data_len and offset < end_ofs):
-			if (offset > data_len - mode_size or offset > end_ofs - mode_size):	# decode remainder as bytes
-				mode = "bytes"
-				mode_define = mode_defines[mode]
-				mode_size = mode_sizes[mode]
-			values = list(data[offset:offset+mode_size])
-			if (mode == "bytes"):
-				disassembly.append(generate_define_byte(offset, data[offset], comment=True))
-			else:
-				hex_str = str.join(" ", [ "%02x" % value for value in values ])
-				val_str = "0x" + str.join("", [ "%02x" % value for value in reversed(values) ])
-				disassembly.append(asm_template % (offset, hex_str, mode_define, val_str))
-			length += mode_size
-			offset += mode_size
+		run_end = min(data_len, end_ofs)
+		if (offset < run_end):
+			if (mode != "bytes"):
+				items_len = (run_end - offset) // mode_size * mode_size
+				run = bytes(data[offset:offset+items_len])
+				for ofs in range(0, items_len, mode_size):
+					values = run[ofs:ofs+mode_size]
+					disassembly.append(AsmRecord(offset + ofs, values, mode_define, "0x" + values[::-1].hex()))
+				offset += items_len
+			disassembly += generate_define_bytes(data, offset, run_end)	# decode remainder as bytes
+			length = run_end - start_ofs
+			offset = run_end
 
 	# Same as above, with combining of consecutive duplicates (deduplication)
 	# NOTE: works, but way more complicated than it should be; also, RLE
@@ -616,11 +870,100 @@ def generate_data_disassembly(data, start_ofs, end_ofs, mode):
 	return (offset, length, disassembly)
 
 
+# Struct layout, i.e. compiled struct mode string (e.g. 'struct:chars[3]:
+# bytes[3]:dword'); decodes entire arrays of structs in one pass
+#
+# Layouts are compiled once per mode string and cached (see get_struct_
+# layout()); member tuples: (mode, length, define command, item size), mode
+# is 'string' for chars/char (one line per member) or one of the numeric
+# modes of generate_data_disassembly() (one line per item)
+class StructLayout():
+
+	TYPE_SIZES_ARRAY = { "chars": 1, "bytes": 1, "words": 2, "dwords": 4, "fwords": 6, "qwords": 8, "tbytes": 10 }
+	TYPE_SIZES_SINGLE = { "char": 1, "byte": 1, "word": 2, "dword": 4, "fword": 6, "qword": 8, "tbyte": 10 }
+	MODE_DEFINES = { "string": "db", "bytes": "db", "words": "dw", "dwords": "dd", "fwords": "df", "qwords": "dq", "tbytes": "dt" }
+	ARRAY_REGEX = re.compile(r"^(chars|bytes|words|dwords|fwords|qwords|tbytes)\[([0-9]+)\]$")
+
+	def __init__(self, mode):
+		if (not mode.startswith("struct:")):
+			raise ValueError("invalid mode: '%s'" % mode)
+		if (mode.split(":") == ["struct", ""]):
+			raise ValueError("mode does not contain any struct member: '%s'" % mode)
+
+		# Split mode string, process struct members, generate member list
+		self.members = []
+		for item in mode.split(":")[1:]:
+
+			# Array types
+			match = self.ARRAY_REGEX.match(item)
+			if (match):
+				type_ = match.group(1)
+				count = int(match.group(2))
+				size = self.TYPE_SIZES_ARRAY[type_]
+				member_mode = "string" if (type_ == "chars") else type_
+
+			# Single types
+			elif (item in self.TYPE_SIZES_SINGLE):
+				type_ = item
+				count = 1
+				size = self.TYPE_SIZES_SINGLE[type_]
+				member_mode = "string" if (type_ == "char") else type_+"s"
+
+			# Invalid struct member
+			else:
+				raise ValueError("mode contains invalid struct member: '%s'" % item)
+
+			self.members.append((member_mode, size * count, self.MODE_DEFINES[member_mode], size))
+
+		self.size = sum([ member[1] for member in self.members ])
+		if (self.size == 0):
+			raise ValueError("mode describes struct of zero length: '%s'" % mode)
+
+	# Decode count structs starting at offset (all structs have to be within
+	# data), returns disassembly (list of records)
+	# NOTE: produces the same records as generate_data_disassembly() would for
+	#       each member (see generate_struct_disassembly())
+	def decode(self, data, offset, count):
+		disassembly = []
+		str_cache = {}											# formatted strings (by values)
+		run = bytes(data[offset:offset+count*self.size])
+		run_ofs = 0
+		for i in range(0, count):
+			for (mode, length, define, size) in self.members:
+				if (mode == "string"):
+					values = run[run_ofs:run_ofs+length]
+					if (not values in str_cache):
+						str_cache[values] = str.join(",", [ "\"%s\"" % part.decode("ascii") if (part != b"") else "0x%x" % value[0] for (part, value) in STRINGS_PARTS_REGEX.findall(values) ])
+					disassembly.append(AsmRecord(offset + run_ofs, values, define, str_cache[values]))
+				elif (mode == "bytes"):
+					disassembly += generate_define_bytes(data, offset + run_ofs, offset + run_ofs + length)
+				else:
+					for ofs in range(run_ofs, run_ofs + length, size):
+						values = run[ofs:ofs+size]
+						disassembly.append(AsmRecord(offset + ofs, values, define, "0x" + values[::-1].hex()))
+				run_ofs += length
+		return disassembly
+
+
+# Cache of compiled struct layouts (by mode string), see get_struct_layout()
+struct_layouts = {}
+
+
+# Get compiled struct layout for struct mode string (compiled on first use)
+def get_struct_layout(mode):
+	layout = struct_layouts.get(mode)
+	if (layout == None):
+		layout = struct_layouts[mode] = StructLayout(mode)
+	return layout
+
+
 # Generate disassembly of binary data (bytes, bytearray or memoryview) inter-
 # preted as structured data. Begins at start_ofs, stops when offset >= end_ofs
 # or offset >= len(data). Returns offset, length and disassembly (list of
-# strings)
-# NOTE: this is basically an elaborate wrapper for generate_data_disassembly()
+# records)
+# NOTE: this is basically an elaborate wrapper for generate_data_disassembly();
+#       structs that are fully within data are decoded in one pass using the
+#       compiled struct layout (see StructLayout)
 def generate_struct_disassembly(data, start_ofs, end_ofs, mode):
 	if (not (isinstance(data, bytes) or isinstance(data, bytearray) or isinstance(data, memoryview))):
 		raise TypeError("data must be type bytes, bytearray or memoryview, not %s" % type(data).__name__)
@@ -634,55 +977,58 @@ def generate_struct_disassembly(data, start_ofs, end_ofs, mode):
 		raise ValueError("end offset must be positive value, not %d" % end_ofs)
 	if (not isinstance(mode, str)):
 		raise TypeError("mode must be type str, not %s" % type(mode).__name__)
-	if (not mode.startswith("struct:")):
-		raise ValueError("invalid mode: '%s'" % mode)
-	if (mode.split(":") == ["struct", ""]):
-		raise ValueError("mode does not contain any struct member: '%s'" % mode)
-
-	# Split mode string, process struct members, generate struct list
-	type_sizes_array = { "chars": 1, "bytes": 1, "words": 2, "dwords": 4, "fwords": 6, "qwords": 8, "tbytes": 10 }
-	type_sizes_single = { "char": 1, "byte": 1, "word": 2, "dword": 4, "fword": 6, "qword": 8, "tbyte": 10 }
-	struct_list = []
-	struct_members = mode.split(":")[1:]
-	for item in struct_members:
-
-		# Array types
-		match = re.match(r"^(chars|bytes|words|dwords|fwords|qwords|tbytes)\[([0-9]+)\]$", item)
-		if (match):
-			type_ = match.group(1)
-			count = int(match.group(2))
-			size = type_sizes_array[type_]
-			struct_list.append(OrderedDict([("mode", "string" if (type_ == "chars") else type_), ("length", size * count)]))
-
-		# Single types
-		elif (item in ("char", "byte", "word", "dword", "fword", "qword", "tbyte")):
-			type_ = item
-			count = 1
-			size = type_sizes_single[type_]
-			struct_list.append(OrderedDict([("mode", "string" if (type_ == "char") else type_+"s"), ("length", size * count)]))
-
-		# Invalid struct member
-		else:
-			raise ValueError("mode contains invalid struct member: '%s'" % item)
 
-	# Decode structured data by repeatedly processing struct list until end of
-	# data or end offset reached (each iteration of outer while-loop decodes one
-	# full struct, each iteration of inner for-loop decodes one struct member)
-	# TODO: should we break when struct member failed to decode?
+	# Get compiled struct layout (raises ValueError for invalid mode strings)
+	layout = get_struct_layout(mode)
+
+	# Decode structs that begin before end offset and are fully within data in
+	# one pass (NOTE: last struct may exceed end offset, same as below)
 	offset = start_ofs; length = 0; disassembly = []
 	data_len = len(data)
+	if (offset < data_len and offset < end_ofs):
+		count = min((min(data_len, end_ofs) - offset + layout.size - 1) // layout.size, (data_len - offset) // layout.size)
+		disassembly = layout.decode(data, offset, count)
+		offset += count * layout.size
+		length += count * layout.size
+
+	# Decode remaining partial struct (if any) by repeatedly processing member
+	# list until end of data or end offset reached (each iteration of outer
+	# while-loop decodes one full struct, each iteration of inner for-loop de-
+	# codes one struct member)
+	# TODO: should we break when struct member failed to decode?
 	while (offset < data_len and offset < end_ofs):
-		for item in struct_list:
-			(offset, length2, disassembly2) = generate_data_disassembly(data, offset, offset + item["length"], item["mode"])
+		for (member_mode, member_length, _, _) in layout.members:
+			(offset, length2, disassembly2) = generate_data_disassembly(data, offset, offset + member_length, member_mode)
 			length += length2; disassembly += disassembly2
-			if (length2 != item["length"]):
-				logging.warning("Failed to decode struct member: offset: 0x%x, length: 0x%x (%d), mode: %s" % (offset, item["length"], item["length"], item["mode"]))
+			if (length2 != member_length):
+				logging.warning("Failed to decode struct member: offset: 0x%x, length: 0x%x (%d), mode: %s" % (offset, member_length, member_length, member_mode))
 				#break
 
 	# Return results
 	return (offset, length, disassembly)
 
 
+# Disassembly structure: list of structure items sorted by start offset; keeps
+# a list of start offsets in sync with items to allow for binary search (i.e.
+# to locate insertion points in O(log n) instead of scanning the whole list)
+# NOTE:
+# Items must only be added via insert() or append() (both used by insert_
+# structure_item()); items are stored as-is (i.e. references stay valid)
+class DisasmStructure(list):
+
+	def __init__(self, items=()):
+		super().__init__(items)
+		self.starts = [ item["start"] for item in self ]
+
+	def insert(self, index, item):
+		super().insert(index, item)
+		self.starts.insert(index, item["start"])
+
+	def append(self, item):
+		super().append(item)
+		self.starts.append(item["start"])
+
+
 # Inserts item into sorted structure; maintains sort order, returns inserted item
 #
 # Insertion modes:
@@ -692,9 +1038,13 @@ def generate_struct_disassembly(data, start_ofs, end_ofs, mode):
 #
 # NOTE:
 # Item dict must contain key-value pairs ('type': <str>), ('offset': <int>), ('name': <str>|None) and ('label': <str>|None)
+# NOTE:
+# Insertion points are located via binary search on structure.starts; only
+# items with equal offsets are scanned (mode 'start': variables to skip, mode
+# 'end': candidates for start_item)
 def insert_structure_item(structure, item, *, ins_mode="default", start_item=None):
-	if (not isinstance(structure, list)):
-		raise TypeError("structure must be type list, not %s" % type(structure).__name__)
+	if (not isinstance(structure, DisasmStructure)):
+		raise TypeError("structure must be type DisasmStructure, not %s" % type(structure).__name__)
 	if (not isinstance(item, dict)):
 		raise TypeError("item must be type dict, not %s" % type(item).__name__)
 	#for (key, key_type) in (("type", str), ("offset", int), ("name", str), ("label", str)):
@@ -718,23 +1068,25 @@ def insert_structure_item(structure, item, *, ins_mode="default", start_item=Non
 		raise ValueError("invalid insertion mode: '%s'" % ins_mode)
 
 	if (ins_mode == "default"):
-		for i in range(0, len(structure)):
-			if (structure[i]["start"] > item["start"]):
-				structure.insert(i, item)
-				return structure[i]
+		i = bisect.bisect_right(structure.starts, item["start"])
+		if (i < len(structure)):
+			structure.insert(i, item)
+			return structure[i]
 	elif (ins_mode == "start"):
-		for i in range(0, len(structure)):
-			if (structure[i]["start"] > item["start"]):
-				while (i > 1 and structure[i-1]["start"] == item["start"] and structure[i-1]["type"] == "variable"): i -= 1
-				structure.insert(i, item)
-				return structure[i]
+		i = bisect.bisect_right(structure.starts, item["start"])
+		if (i < len(structure)):
+			while (i > 1 and structure[i-1]["start"] == item["start"] and structure[i-1]["type"] == "variable"): i -= 1
+			structure.insert(i, item)
+			return structure[i]
 	elif (ins_mode == "end"):
-		for i in range(0, len(structure)):
-			if (structure[i] == start_item):
-				for j in range(i+1, len(structure)):
-					if (structure[j]["start"] >= item["start"]):
+		if (start_item != None):
+			for i in range(bisect.bisect_left(structure.starts, start_item["start"]), bisect.bisect_right(structure.starts, start_item["start"])):
+				if (structure[i] == start_item):
+					j = max(i+1, bisect.bisect_left(structure.starts, item["start"]))
+					if (j < len(structure)):
 						structure.insert(j, item)
 						return structure[j]
+					break
 	structure.append(item)
 	return structure[-1]
 
@@ -824,34 +1176,41 @@ def generate_comment_box(content, width=80, spacing_left=2, spacing_right=2, spa
 
 
 # Generates formatted disassembly, i.e. combine plain disassembly and disassembly structure to formatted disassembly
-def generate_formatted_disassembly(object, globals_, fixrel):
+def generate_formatted_disassembly(object, globals_, fixup_index):
 	logging.info("Generating formatted disassembly of object %d:" % object["num"])
 
-	# ------------------------------------------------------------------------------
-	#  globals preparation                                                         -
-	# ------------------------------------------------------------------------------
-
-	# Create map of (object, offset) to globals
-	# NOTE: we need globals for ALL objects, as references may point to other objects
-	# NOTE: there may be multiple globals for the same (object, offset), e.g. MK1.EXE, object 1, THROW_SNOT
-	#globals_map = { (item["object"], item["offset"]): item for item in globals_ }
-	globals_map = {}
-	for global_ in globals_:
-		if (not (global_["object"], global_["offset"]) in globals_map):
-			globals_map[(global_["object"], global_["offset"])] = []
-		globals_map[(global_["object"], global_["offset"])].append(global_)
-
 	# ------------------------------------------------------------------------------
 	#  fixup / relocation preparation                                              -
 	#  NOTE: currently only used to add fixup comments                             -
 	# ------------------------------------------------------------------------------
 
-	# Compile list of fixup records for current object, sort list by source
-	# offset ascending (sort is important for mapping below!)
+	# Get fixup records for current object from fixup index (sorted by source
+	# offset ascending)
 	logging.debug("Gathering fixup records for current object...")
-	fixup_records = [ record for record in fixrel["record table"].values() if record["source object"] == object["num"] ]
-	fixup_records.sort(key=lambda item: item["source offset 2"])
-	logging.debug("Fixup records: total: %d, current object: %d" % (len(fixrel["record table"]), len(fixup_records)))
+	fixup_records = fixup_index.get_for_source_object(object["num"])
+	logging.debug("Fixup records: total: %d, current object: %d" % (len(fixup_index), len(fixup_records)))
+
+	# Split runs of identical lines (see AsmRunRecord) at structure items and
+	# fixups, i.e. lines that receive labels or fixup comments are separated
+	# from runs; lines of runs are not expanded otherwise
+	logging.debug("Splitting runs at structure items and fixups...")
+	disasm_plain = []
+	runs_split = 0
+	for asm in object["disasm plain"]:
+		if (not isinstance(asm, AsmRunRecord)):
+			disasm_plain.append(asm)
+			continue
+		size = len(asm.record.data)
+		split_offsets = set(object["disasm structure"].starts[bisect.bisect_right(object["disasm structure"].starts, asm.offset):bisect.bisect_left(object["disasm structure"].starts, asm.end)])
+		for record in fixup_index.get_by_source(object["num"], asm.offset, asm.end):
+			line_offset = asm.offset + (record["source offset"] - asm.offset) // size * size
+			split_offsets.update((line_offset, line_offset + size))
+		if (len(split_offsets) > 0):
+			disasm_plain += asm.split(sorted(split_offsets))
+			runs_split += 1
+		else:
+			disasm_plain.append(asm)
+	logging.debug("Split %d runs" % runs_split)
 
 	# Create map of disassembly line offsets to fixup records (i.e. for each
 	# disassembly line, get fixup records that apply to that line). A record
@@ -859,38 +1218,34 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 	# the line (i.e. start_offset <= source offset < end_offset)
 	logging.debug("Mapping disassembly offsets to fixup records...")
 	fixup_map = {}
-	record_index = 0
-	for i in range(0, len(object["disasm plain"])):
-		line = object["disasm plain"][i]
-		if (record_index >= len(fixup_records)): # we're done early if there are no more records to process
+	records_mapped = 0
+	for i in range(0, len(disasm_plain)):
+		asm = disasm_plain[i]
+		if (records_mapped >= len(fixup_records)): # we're done early if there are no more records to process
 			break
-		asm = split_asm_line(line)
-		if (asm == None):
-			logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, line))
+		if (isinstance(asm, AsmRunRecord)): # runs do not contain fixups (see above)
 			continue
-		start_offset = asm["offset"]
-		end_offset = asm["offset"] + len(asm["data"])
-		records = []
-		while (record_index < len(fixup_records) and fixup_records[record_index]["source offset 2"] >= start_offset and fixup_records[record_index]["source offset 2"] < end_offset):
-			records.append(fixup_records[record_index])
-			record_index += 1
+		if (not isinstance(asm, AsmRecord)):
+			logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, asm))
+			continue
+		records = fixup_index.get_by_source(object["num"], asm.offset, asm.end)
 		if (len(records) > 0):
-			fixup_map[start_offset] = records
+			fixup_map[asm.offset] = records
+			records_mapped += len(records)
 
 	# Print records that couldn't be mapped (if any); this can only happen
 	# if there are records with source offsets outside of the disassembly's
 	# offset range (which should not occur in real life)
 	records_unmapped = 0
-	while (record_index < len(fixup_records)):
-		record = fixup_records[record_index]
-		logging.warning("Unmapped record: source object: %d, source offset: 0x%x, target object: %d, target offset: 0x%x" % (record["source object"], record["source offset 2"], record["target object"], record["target offset"]))
-		record_index += 1
-		records_unmapped += 1
+	if (records_mapped < len(fixup_records)):
+		mapped_ids = { id(record) for records in fixup_map.values() for record in records }
+		for record in fixup_records:
+			if (id(record) in mapped_ids):
+				continue
+			logging.warning("Unmapped record: source object: %d, source offset: 0x%x, target object: %d, target offset: 0x%x" % (record["source object"], record["source offset"], record["target object"], record["target offset"]))
+			records_unmapped += 1
 
 	# Print results
-	records_mapped = 0
-	for value in fixup_map.values():
-		records_mapped += len(value)
 	logging.debug("Mapped offsets: %d, mapped records: %d, unmapped records: %d" % (len(fixup_map), records_mapped, records_unmapped))
 
 	# ------------------------------------------------------------------------------
@@ -905,18 +1260,17 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 	# TESTING: module map
 	module_map = OrderedDict()
 	module_num = None
-	for i in range(0, len(object["disasm plain"]) + 1):
+	for i in range(0, len(disasm_plain) + 1):
 
 		# All loop iterations except last one
-		if (i < len(object["disasm plain"])):
-			line = object["disasm plain"][i]
-			asm = split_asm_line(line)
-			if (asm == None):
-				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, line))
+		if (i < len(disasm_plain)):
+			asm = disasm_plain[i]
+			if (not isinstance(asm, (AsmRecord, AsmRunRecord))):
+				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, asm))
 			#elif (asm["type"] == "normal" or asm["type"] == "hex"):
 			else:
-				current_offset = asm["offset"]
-				end_offset = asm["offset"] + len(asm["data"]) # need this for fixup record matching
+				current_offset = asm.offset
+				end_offset = asm.end # need this for fixup record matching
 
 		# Last loop iteration
 		else:
@@ -1030,8 +1384,14 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 
 			struct_index += 1
 
-		# Copy disassembly line (all but last loop iteration)
-		if (i < len(object["disasm plain"])):
+		# Copy disassembly line (all but last loop iteration); invalid lines and
+		# runs are copied as-is, records are copied on first modification (i.e.
+		# unmodified records are shared between plain and formatted disassembly)
+		if (i < len(disasm_plain)):
+			if (not isinstance(asm, AsmRecord)):
+				disassembly.append(asm)
+				continue
+			line = asm
 
 			# Check if fixups apply to current line -> replace target values with global label
 			# NOTE: probably best to do this BEFORE call/jump analysis below; fixups are re-
@@ -1044,24 +1404,20 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 			# TODO: merge this with adding comments for fixups (i.e. just move that stuff here)
 			if (current_offset in fixup_map):
 				for record in fixup_map[current_offset]:
-					if (not "target offset" in record): # FIXME: SWS.EXE, FATAL.EXE; probably fixups of different type, see 'main_fixup_relocation.py', line 276ff
-						logging.warning("[FIXME] Skipping fixup record with missing 'target offset'")
-						continue
-					if (not (record["target object"], record["target offset"]) in globals_map):
+					# NOTE: we need globals for ALL objects, as references may point to other objects
+					# NOTE: there may be multiple globals for the same (object, offset), e.g. MK1.EXE, object 1, THROW_SNOT
+					matching_globals = globals_.get_aliases(record["target object"], record["target offset"])
+					if (len(matching_globals) == 0):
 						logging.warning("No global in map for fixup (target object %d, target offset 0x%x): %s" % (record["target object"], record["target offset"], line))
 						continue
-					matching_globals = globals_map[(record["target object"], record["target offset"])]
-					if (not len(matching_globals) > 0):
-						logging.warning("Empty list in global map for fixup (target object %d, target offset 0x%x): %s" % (record["target object"], record["target offset"], line))
-						continue
-					##match = re.search(r"(?:cs:|ds:|es:|fs:|gs:|ss:)?0x%x" % record["target offset"], asm["arguments"].strip())
-					##match = re.search(r"(?:cs:|ds:|es:|fs:|gs:|ss:)?0x0*%x" % record["target offset"], asm["arguments"].strip())
-					#match = re.search(r"0x0*%x" % record["target offset"], asm["arguments"].strip())
+					##match = re.search(r"(?:cs:|ds:|es:|fs:|gs:|ss:)?0x%x" % record["target offset"], asm.arguments.strip())
+					##match = re.search(r"(?:cs:|ds:|es:|fs:|gs:|ss:)?0x0*%x" % record["target offset"], asm.arguments.strip())
+					#match = re.search(r"0x0*%x" % record["target offset"], asm.arguments.strip())
 					#if (match == None):
 					#	logging.warning("Failed to match fixup target offset 0x%x: %s" % (record["target offset"], line))
 					#	continue
 					#ofs_str = match.group(0)
-					matches = re.findall("0x0*%x" % record["target offset"], asm["arguments"].strip())
+					matches = re.findall("0x0*%x" % record["target offset"], asm.arguments.strip())
 					if (len(matches) == 0):
 						logging.warning("Failed to match fixup target offset 0x%x: %s" % (record["target offset"], line))
 						# TODO: should we check here if argument only contains one '0x...' address and
@@ -1074,10 +1430,12 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 						logging.warning("Multiple matches for fixup target offset 0x%x: %s" % (record["target offset"], line))
 						continue
 					ofs_str = matches[0]
-					line = line.replace(ofs_str, "@obj%d:%s" % (matching_globals[0]["object"], matching_globals[0]["name"])) # FIXME: format just preliminary, need to investigate proper format
+					if (line is asm):
+						line = asm.copy()
+					line.replace(ofs_str, "@obj%d:%s" % (matching_globals[0]["object"], matching_globals[0]["name"])) # FIXME: format just preliminary, need to investigate proper format
 					if (len(matching_globals) == 1):
 						continue
-					line = "%-100s; aliases: %s" % (line, str.join(", ", [ item["name"] for item in matching_globals]))
+					line.add_comment("; aliases: %s" % str.join(", ", [ item["name"] for item in matching_globals]))
 
 			# Check if asm command is call, jump or loop -> replace target with global label
 			# NOTE: this intentionally only matches single constant address, e.g. 'je 0x39bd',
@@ -1091,29 +1449,33 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 			#       branches'); not pretty, but should be fine for now as replace here simply
 			#       does nothing since offset has already been replaced with fixup target label
 			#       at this point (see 'line.replace()' in code block above)
-			if (asm["command"] == "call" or asm["command"].startswith("j") or asm["command"].startswith("loop")):
-				match = re.match(r"^0x([0-9a-fA-F]+)$", asm["arguments"].strip())
+			if (asm.command == "call" or asm.command.startswith("j") or asm.command.startswith("loop")):
+				match = re.match(r"^0x([0-9a-fA-F]+)$", asm.arguments.strip())
 				if (match != None):
 					ofs_str = match.group(0) # entire string including '0x'
 					ofs_val = int(match.group(1), 16)
-					if ((object["num"], ofs_val) in globals_map):
-						matching_globals = globals_map[((object["num"], ofs_val))]
+					if ((object["num"], ofs_val) in globals_):
+						matching_globals = globals_.get_aliases(object["num"], ofs_val)
 						if (len(matching_globals) > 0):
 							# TESTING: find long jumps and prefix branch target with 'NEAR PTR', to
 							#          fix jumps being shorter when recompiling disassembly (which
 							#          results in offset shifts and potentially messes up alignment;
 							#          also complicates comparisons between original code and re-
 							#          compiled code)
-							#if (asm["command"].startswith("j") and len(asm["data"]) >= 5):
+							#if (asm.command.startswith("j") and len(asm["data"]) >= 5):
 							#	logging.warning("Prefixing near jump with 'NEAR PTR': %s", line)
 							#	line = line.replace(ofs_str, "NEAR PTR " + matching_globals[0]["name"]) # use first global if multiple available
 							#else:
 							#	line = line.replace(ofs_str, matching_globals[0]["name"]) # use first global if multiple available
-							line = line.replace(ofs_str, matching_globals[0]["name"]) # use first global if multiple available
+							if (line is asm):
+								line = asm.copy()
+							line.replace(ofs_str, matching_globals[0]["name"]) # use first global if multiple available
 						else:
 							logging.warning("Empty list in global map for (object %d, offset 0x%x): %s" % (object["num"], ofs_val, line))
 						if (len(matching_globals) > 1):
-							line = "%-100s; aliases: %s" % (line, str.join(", ", [ item["name"] for item in matching_globals]))
+							if (line is asm):
+								line = asm.copy()
+							line.add_comment("; aliases: %s" % str.join(", ", [ item["name"] for item in matching_globals]))
 					else:
 						logging.warning("No global in map for (object %d, offset 0x%x): %s" % (object["num"], ofs_val, line))
 				# NOTE: this is fairly common and not an error (e.g. 'jmp ebx' won't match
@@ -1131,12 +1493,11 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 			if (current_offset in fixup_map):
 				fixup_comments = []
 				for record in fixup_map[current_offset]:
-					if (not "target offset" in record): # FIXME: SWS.EXE, FATAL.EXE; probably fixups of different type, see 'main_fixup_relocation.py', line 276ff
-						logging.warning("[FIXME] Skipping fixup record with missing 'target offset'")
-						continue
 					#fixup_comments.append("fixup: num: %d, source object: %d, source offset: 0x%x, target object: %d, target offset: 0x%x" % (record["num"], record["source object"], record["source offset 2"], record["target object"], record["target offset"]))
-					fixup_comments.append("fixup: num: %d, src obj: %d, src ofs: 0x%x, dst obj: %d, dst ofs: 0x%x" % (record["num"], record["source object"], record["source offset 2"], record["target object"], record["target offset"]))
-				line = "%-100s; %s" % (line, str.join("; ", fixup_comments))
+					fixup_comments.append("fixup: num: %d, src obj: %d, src ofs: 0x%x, dst obj: %d, dst ofs: 0x%x" % (record["num"], record["source object"], record["source offset"], record["target object"], record["target offset"]))
+				if (line is asm):
+					line = asm.copy()
+				line.add_comment("; %s" % str.join("; ", fixup_comments))
 
 			# Append line to disassembly
 			#line = line.replace(":\t", ":  ") # tab after '<offset>:'
@@ -1144,13 +1505,183 @@ def generate_formatted_disassembly(object, globals_, fixrel):
 			disassembly.append(line)
 
 	# Store results
-	logging.debug("Size of formatted disassembly: %d lines, %d bytes" % (len(disassembly), len(str.join(os.linesep, disassembly))))
+	logging.debug("Size of formatted disassembly: %d lines (%d records)" % (count_disassembly_lines(disassembly), len(disassembly)))
 	object["disasm formatted"] = disassembly
 
 	# TESTING: module map
 	object["module map"] = module_map
 
 
+# Deduplicate data definitions in formatted disassembly
+#
+# NOTE: We do this on formatted disassembly (and string-based rather than
+#       data-based) as it turned out to be the much easier approach:
+#
+#       First try was data-based in generate_data_disassembly(); however,
+#       data-based deduplication caused issues with labels being misplaced
+#       afterwards (due to data being label-agnostic; would have required
+#       additional object hints to fix), also would have required extending
+#       code in several additional places (e.g. 'auto-strings' case)
+#
+#       String-based deduplication has many advantages, e.g. this deals
+#       perfectly with lines where only comments differ (e.g. MK1, object
+#       1, offsets 0x3084c + 0x30850 -> comments differ due to fixups and
+#       thus lines are NOT deduplicated, which is exactly what we want in
+#       this case); non-data lines (e.g. empty lines, comments, labels)
+#       interrupt deduplication (e.g. MK1, object 2, offsets 0x4527c, 0x
+#       45280 and 0x45284 -> same data, but NOT deduplicated due to non-
+#       data lines interrupting in between, which is how it should be)
+#
+# CAUTION: Deduplication disturbs the lines ranges of formatted disassembly
+#          used to split it into separate files (i.e. reconstructed source
+#          files). Thus, the original unformatted disassembly (i.e. non-
+#          deduplicated) MUST ALWAYS BE PRESERVED!
+def generate_dup_line(line, asm, count):
+	# If we got duplicates, generate 'dx <count> dup(<value>)' line; if not,
+	# simply copy stored/tracked line as-is (below if clause)
+	if (count > 1):
+		# NOTE: correct hex data is not actually important at this stage, but
+		#       still nice to have nonetheless (same as trailing comment)
+		# NOTE: prevent very long lines by truncating hex display + appending
+		#       '..', e.g. '25bf8:  00 00 00 00 00 00 ..  db 1152 dup(0x00)'
+		#       -> way easier to read without losing any relevant information
+		#hex_str = str.join(" ", [ "%02x" % value for value in (asm["data"] * count) ])
+		hex_data = asm.data * min(count, 7) # at most 7 items needed to check for > 6 bytes
+		if (len(hex_data) > 6):
+			hex_str = str.join(" ", [ "%02x" % value for value in hex_data[:6] ]) + " .."
+		else:
+			hex_str = str.join(" ", [ "%02x" % value for value in hex_data ])
+		line = "%8x:\t%-20s \t%-6s %s" % (asm.offset, hex_str, asm.command, "%d dup(%s)" % (count, asm.arguments))
+		if (asm.comment != None and asm.comment != ""):
+			# Using this instead of usual '%-100s%s' to ensure spacing between
+			# command/arguments and comments for very long lines
+			#line = "%-95s     %s" % (line, asm["comment"])
+			line = "%-100s%s" % (line, asm.comment)
+	return line
+
+
+# Deduplication index of formatted disassembly: groups of consecutive dupli-
+# cate data definitions (i.e. run-length groups), computed once per object
+# and reused for deduplicating the entire object as well as slices of it
+# (i.e. reconstructed source files, see deduplicate_formatted_slices())
+#
+# Index fields:
+# disassembly:  formatted disassembly (list of records, runs and/or strings)
+# group_ends:   for each line of disassembly, end index of group containing
+#               line (data definitions) or -1 (all other lines)
+# line_offsets: number of lines preceding each line of disassembly (runs
+#               count as their number of lines, see AsmRunRecord)
+#
+# NOTE:
+# Everything except offset must match for a line to be considered a duplicate
+# of the previous line; non-data lines (e.g. empty lines, comments, labels)
+# interrupt groups
+class DedupIndex():
+
+	DATA_COMMANDS = ("db", "dw", "dd", "df", "dq", "dt")
+
+	def __init__(self, disassembly):
+		self.disassembly = disassembly
+		self.group_ends = [ -1 ] * len(disassembly)
+		self.line_offsets = [ 0 ] * (len(disassembly) + 1)
+		group_start = None
+		group_key = None
+		for (index, line) in enumerate(disassembly):
+			(asm, count) = (line.record, line.count) if (isinstance(line, AsmRunRecord)) else (line, 1)
+			self.line_offsets[index+1] = self.line_offsets[index] + count
+			key = self.get_key(asm)
+			if (key != None and key == group_key):
+				continue
+			if (group_start != None):
+				self.group_ends[group_start:index] = [ index ] * (index - group_start)
+			(group_start, group_key) = (index, key) if (key != None) else (None, None)
+		if (group_start != None):
+			self.group_ends[group_start:] = [ len(disassembly) ] * (len(disassembly) - group_start)
+
+	def __len__(self):
+		return len(self.disassembly)
+
+	# Get deduplication key of line (None for non-data lines)
+	@classmethod
+	def get_key(cls, line):
+		if (not isinstance(line, AsmRecord) or not line.command in cls.DATA_COMMANDS):
+			return None
+		return (line.data, line.command, line.arguments, line.comment)
+
+
+# Deduplicate data definitions of slices of formatted disassembly, returns
+# deduplicated disassembly (list of records and/or strings)
+# NOTE: slices are either (dedup index, start index, end index) or strings (i.e.
+#       lines to be inserted between slices, e.g. empty lines); groups are taken
+#       from dedup indices (see DedupIndex) and cut at slice boundaries; groups
+#       of adjacent slices are merged if not interrupted, i.e. result is the
+#       same as deduplicating the concatenated slices line by line
+def deduplicate_formatted_slices(slices):
+	disasm_deduped = []
+	dup_asm = None		# storage to track (potential) duplicates
+	dup_key = None
+	dup_count = 0
+	for slice_ in slices:
+
+		# Lines between slices: dump duplicates currently being tracked (if any),
+		# copy line as-is
+		if (isinstance(slice_, str)):
+			if (dup_count > 0):
+				disasm_deduped.append(generate_dup_line(dup_asm, dup_asm, dup_count))
+				dup_count = 0
+			disasm_deduped.append(slice_)
+			continue
+
+		(dedup_index, start, end) = slice_
+		(start, end, _) = slice(start, end).indices(len(dedup_index)) # same bounds as slicing a list
+		index = start
+		while (index < end):
+			line = dedup_index.disassembly[index]
+			group_end = dedup_index.group_ends[index]
+
+			# Non-data lines: dump duplicates currently being tracked (if any),
+			# copy line as-is
+			if (group_end < 0):
+				if (dup_count > 0):
+					disasm_deduped.append(generate_dup_line(dup_asm, dup_asm, dup_count))
+					dup_count = 0
+				disasm_deduped.append(line)
+				index += 1
+				continue
+
+			# Data lines: process group (or part of group within slice) at once;
+			# add to duplicates currently being tracked if matching, otherwise
+			# dump those and start tracking group
+			asm = line.record if (isinstance(line, AsmRunRecord)) else line
+			group_end = min(group_end, end)
+			count = dedup_index.line_offsets[group_end] - dedup_index.line_offsets[index]
+			key = DedupIndex.get_key(asm)
+			if (dup_count > 0 and key == dup_key):
+				dup_count += count
+			else:
+				if (dup_count > 0):
+					disasm_deduped.append(generate_dup_line(dup_asm, dup_asm, dup_count))
+				(dup_asm, dup_key, dup_count) = (asm, key, count)
+			index = group_end
+
+	# If duplicates were tracked until the end, dump them now
+	if (dup_count > 0):
+		disasm_deduped.append(generate_dup_line(dup_asm, dup_asm, dup_count))
+
+	# Return results (i.e. deduplicated disassembly)
+	return disasm_deduped
+
+
+# NOTE: Turned into a function that can be used for all kinds of formatted
+#       disassembly (i.e. for objects as well as for the slices that are
+#       written to reconstructed source files); for repeated deduplication of
+#       slices of the same disassembly, use DedupIndex + deduplicate_formatted_
+#       slices() directly (see disassemble_objects_gen2())
+def deduplicate_formatted_disassembly(disasm_formatted):
+	dedup_index = DedupIndex(disasm_formatted)
+	return deduplicate_formatted_slices([ (dedup_index, 0, len(dedup_index)) ])
+
+
 # ----------------- preprocessing --------------------
 
 
@@ -1180,24 +1711,18 @@ def preprocess_objects(wdump):
 	objects = []
 	ado_num = dict_path_value(wdump, "linear exe header (os/2 v2.x) - le", "data", "object # for automatic data object")
 	for object in wdump["object table"]["data"].values():
+		# NOTE: collecting segment data in list and joining once (instead of
+		#       concatenating per segment/page, which is quadratic)
 		object_size = 0
-		object_data = b''
+		object_parts = []
 		if ("pages" in object):
 			for page in object["pages"].values():
-				page_size = 0
-				page_data = b''
 				for segment in page["segments"].values():
-					segment_size = len(segment["data"])
-					page_size += segment_size
-					page_data += segment["data"]
-				if (len(page_data) != page_size):
-					logging.warning("len(page_data) != page_size")
-				object_size += page_size
-				object_data += page_data
-		if (len(object_data) != object_size):
-			logging.warning("len(object_data) != object_size")
-		if (len(object_data) < object["virtual memory size"]):
-			object_data += bytes(object["virtual memory size"] - len(object_data))
+					object_size += len(segment["data"])
+					object_parts.append(segment["data"])
+		if (object_size < object["virtual memory size"]):
+			object_parts.append(bytes(object["virtual memory size"] - object_size))
+		object_data = bytes.join(b"", object_parts)
 		#object_type = "code" if ("executable" in object["flags"].lower()) else "data"
 		object_type = "code" if ("executable" in object["flags"]) else "data"
 		object_hints = []
@@ -1258,42 +1783,114 @@ def preprocess_modules(wdump):
 	return modules
 
 
+# Symbol table: globals indexed by (object, offset), by name and per object
+# NOTE:
+# - globals are stored as dicts (same as before), insertion is O(1); all
+#   phases of the disassembler share the same table instead of building maps
+#   of their own
+# - there may be multiple globals for the same (object, offset) (aliases,
+#   e.g. MK1.EXE, object 1, THROW_SNOT); get() returns the one added last,
+#   get_aliases() returns all of them in order of insertion
+# - globals of an object are kept sorted by offset (sorted on demand after
+#   insertions, equal offsets keep order of insertion)
+# - iterating the table yields all globals sorted by (object, offset)
+# - globals must be renamed via rename() to keep name index up to date
+class SymbolTable():
+
+	def __init__(self):
+		self.count = 0
+		self.address_index = {}
+		self.name_index = {}
+		self.object_globals = {}
+		self.unsorted_objects = set()
+
+	def __len__(self):
+		return self.count
+
+	def __iter__(self):
+		for obj_num in sorted(self.object_globals):
+			yield from self.get_for_object(obj_num)
+
+	def __contains__(self, address):
+		return address in self.address_index
+
+	# Add global (dict, requires keys 'object' and 'offset')
+	def add(self, global_):
+		address = (global_["object"], global_["offset"])
+		if (not address in self.address_index):
+			self.address_index[address] = []
+		self.address_index[address].append(global_)
+		if (global_.get("name") != None):
+			self.name_index[global_["name"]] = global_
+		if (not global_["object"] in self.object_globals):
+			self.object_globals[global_["object"]] = []
+		self.object_globals[global_["object"]].append(global_)
+		self.unsorted_objects.add(global_["object"])
+		self.count += 1
+		return global_
+
+	# Rename global, update name index
+	def rename(self, global_, name):
+		if (global_["name"] != None and self.name_index.get(global_["name"]) is global_):
+			del self.name_index[global_["name"]]
+		global_["name"] = name
+		if (name != None):
+			self.name_index[name] = global_
+
+	# Get global at (object, offset) (last one added if aliases exist), returns
+	# None if there is no global at (object, offset)
+	def get(self, obj_num, offset):
+		aliases = self.address_index.get((obj_num, offset))
+		return aliases[-1] if (aliases != None) else None
+
+	# Get all globals at (object, offset) (i.e. aliases), returns empty list if
+	# there is no global at (object, offset)
+	def get_aliases(self, obj_num, offset):
+		return self.address_index.get((obj_num, offset), [])
+
+	# Get global by name, returns None if there is no global with that name
+	def get_by_name(self, name):
+		return self.name_index.get(name)
+
+	# Get globals of object (sorted by offset)
+	def get_for_object(self, obj_num):
+		if (obj_num in self.unsorted_objects):
+			self.object_globals[obj_num].sort(key=lambda item: item["offset"])
+			self.unsorted_objects.discard(obj_num)
+		return self.object_globals.get(obj_num, [])
+
+
 # Preprocess globals:
 # - accumulate globals over subsections
 # - rename duplicate globals to avoid name clashing
 # - add source (all globals at this point come from debug info)
-# - sort globals by parent object (segment), offset
+# - add globals to symbol table (see SymbolTable)
 def preprocess_globals(wdump):
 	logging.debug("Preprocessing globals...")
 
+	symbols = SymbolTable()
 	if (not "global info" in wdump):
 		logging.warning("No global info present in wdump data")
-		return []
+		return symbols
 
-	globals_ = []
-	name_map = {}
 	for subsec in wdump["global info"]["data"].values():
 		for global_ in subsec["data"]:
 			if ("name" in global_):
-				if (global_["name"] in name_map): # check for and resolve name clashing
+				if (symbols.get_by_name(global_["name"]) != None): # check for and resolve name clashing
 					# postfix module number if available (might already resolve clash)
 					base_name = new_name = "%s_mod_%d" % (global_["name"], global_["module"]) if ("module" in global_) else global_["name"]
 					# postfix increasing index number starting with 2 (only if still clashing)
 					i = 1
-					while (new_name in name_map):
+					while (symbols.get_by_name(new_name) != None):
 						i += 1
 						new_name = "%s_%d" % (base_name, i)
 					logging.warn("Renaming global to prevent name clashing: '%s' -> '%s'" % (global_["name"], new_name))
 					global_["name"] = new_name
-				name_map[global_["name"]] = global_
 			#globals_.append(OrderedDict([(key, global_[key]) for key in global_.keys()]))
-			globals_.append(OrderedDict([(key if (key != "segment") else "object", global_[key]) for key in global_.keys()] + [("source", "debug info")]))
+			symbols.add(OrderedDict([(key if (key != "segment") else "object", global_[key]) for key in global_.keys()] + [("source", "debug info")]))
 
-	#globals_.sort(key=lambda item: (item["segment"], item["offset"]))
-	globals_.sort(key=lambda item: (item["object"], item["offset"]))
-
-	logging.debug("Preprocessed %d globals" % len(globals_))
-	return globals_
+	logging.debug("Preprocessed %d globals" % len(symbols))
+	return symbols
 
 
 # Preprocess fixups:
@@ -1329,7 +1926,7 @@ def preprocess_fixups(fixrel):
 
 
 # Analyze references in fixup/relocation data and add corresponding globals
-# NOTE: adds directly to globals_, does not return anything
+# NOTE: adds directly to globals_ (symbol table), does not return anything
 def analyze_fixups_add_globals(objects, globals_, fixups):
 	# Analyze references in fixup/relocation data and add corresponding globals
 	#if ("record table" in fixup):
@@ -1373,22 +1970,18 @@ def analyze_fixups_add_globals(objects, globals_, fixups):
 	#	logging.debug("Added %d globals for fixup/relocation references" % added_globals)
 
 	# Analyze references in fixup/relocation data and add corresponding globals
-	# NOTE: same as above, but using preprocessed fixups
+	# NOTE: same as above, but using preprocessed fixups and symbol table
 	logging.debug("Analyzing fixup references...")
 	added_globals = 0
 	obj_num_to_type = { item["num"]: item["type"] for item in objects }
-	#known_globals = { (item["segment"], item["offset"]): item for item in globals_ }
-	known_globals = { (item["object"], item["offset"]): item for item in globals_ }
 	for fixup in fixups:
-		if ((fixup["target object"], fixup["target offset"]) in known_globals):
+		if ((fixup["target object"], fixup["target offset"]) in globals_):
 			continue
 		if (not "target offset" in fixup): # FIXME: SWS.EXE, FATAL.EXE; probably fixups of different type, see 'main_fixup_relocation.py', line 276ff
 			logging.warning("[FIXME] Skipping fixup record with missing 'target offset'")
 			continue
-		globals_.append(OrderedDict([("name", None), ("module", None), ("object", fixup["target object"]), ("offset", fixup["target offset"]), ("type", obj_num_to_type[fixup["target object"]]), ("source", "fixup data")]))
-		known_globals[(fixup["target object"], fixup["target offset"])] = globals_[-1]
+		globals_.add(OrderedDict([("name", None), ("module", None), ("object", fixup["target object"]), ("offset", fixup["target offset"]), ("type", obj_num_to_type[fixup["target object"]]), ("source", "fixup data")]))
 		added_globals += 1
-	globals_.sort(key=lambda item: (item["object"], item["offset"]))
 	logging.debug("Added %d globals for fixup references (%d globals total)" % (added_globals, len(globals_)))
 
 
@@ -1397,46 +1990,84 @@ def format_fixup(record):
 	return "num: %d, src obj: %d, src ofs: 0x%x, dst obj: %d, dst ofs: 0x%x" % (record["num"], record["source object"], record["source offset"], record["target object"], record["target offset"])
 
 
-# Generate fixup maps:
-# - (source object, source offset) -> list of fixups
-# - (target object, target offset) -> list of fixups
+# Fixup index: fixups indexed by (source object, source offset) and by (target
+# object, target offset)
 # NOTE:
+# - per object, offsets are stored as sorted list along with a parallel list
+#   of fixups, thus fixups for offset ranges can be looked up via binary search
+#   (bisect) instead of probing each single offset of a range
+# - fixups with equal offsets keep the order of the list of fixups passed in
 # - preprocess_fixups() eliminates 'source offset 2', thus 'source offset'
 #   here is already relative to object, i.e. 'absolute'
-# - it is possible to have collisions/duplicate entries in the source map due
-#   to duplicate records around page boundaries (e.g. MK1.EXE, object 1, offset
-#   0xcffd; see 'Fixups at page boundaries' in 'main_fixup_relocation.py')
-# - it is possible, even likely, to have collisions/duplicate entries in the
-#   target map as targets are often referred to at multiple locations within
-#   the code
-def generate_fixup_maps(fixups):
-	logging.debug("Generating fixup maps...")
-	source_map = {}
-	target_map = {}
-
-	for fixup in fixups:
-		if (not (fixup["source object"], fixup["source offset"]) in source_map):
-			source_map[(fixup["source object"], fixup["source offset"])] = []
-		source_map[(fixup["source object"], fixup["source offset"])].append(fixup)
-
-		if (not (fixup["target object"], fixup["target offset"]) in target_map):
-			target_map[(fixup["target object"], fixup["target offset"])] = []
-		target_map[(fixup["target object"], fixup["target offset"])].append(fixup)
-
-	logging.debug("Source map: %d entries, target map: %d entries" % (len(source_map), len(target_map)))
-	return (source_map, target_map)
-
-
-# Get fixups for offset range from fixup map
+# - it is possible to have duplicate entries in the source index due to dupli-
+#   cate records around page boundaries (e.g. MK1.EXE, object 1, offset 0xcffd;
+#   see 'Fixups at page boundaries' in 'main_fixup_relocation.py')
+# - it is possible, even likely, to have multiple entries for the same target
+#   as targets are often referred to at multiple locations within the code
+class FixupIndex():
+
+	def __init__(self, fixups):
+		self.fixups = fixups
+		self.source_index = self.build_index(fixups, "source object", "source offset")
+		self.target_index = self.build_index(fixups, "target object", "target offset")
+
+	def __len__(self):
+		return len(self.fixups)
+
+	# Build index: object -> (sorted list of offsets, list of fixups)
+	@staticmethod
+	def build_index(fixups, obj_key, ofs_key):
+		index = {}
+		for fixup in sorted(fixups, key=lambda item: (item[obj_key], item[ofs_key])):
+			if (not fixup[obj_key] in index):
+				index[fixup[obj_key]] = ([], [])
+			index[fixup[obj_key]][0].append(fixup[ofs_key])
+			index[fixup[obj_key]][1].append(fixup)
+		return index
+
+	# Look up fixups for offset range in index (end offset is excluded)
+	@staticmethod
+	def lookup(index, obj_num, start_ofs, end_ofs):
+		if (not obj_num in index):
+			return []
+		(offsets, fixups) = index[obj_num]
+		return fixups[bisect.bisect_left(offsets, start_ofs):bisect.bisect_left(offsets, end_ofs)]
+
+	# Get fixups with source offsets within offset range of object
+	def get_by_source(self, obj_num, start_ofs, end_ofs):
+		return self.lookup(self.source_index, obj_num, start_ofs, end_ofs)
+
+	# Get fixups with target offsets within offset range of object
+	def get_by_target(self, obj_num, start_ofs, end_ofs):
+		return self.lookup(self.target_index, obj_num, start_ofs, end_ofs)
+
+	# Get all fixups of source object (sorted by source offset)
+	def get_for_source_object(self, obj_num):
+		return self.source_index[obj_num][1] if (obj_num in self.source_index) else []
+
+	# Count distinct (object, offset) entries of index
+	@staticmethod
+	def count_entries(index):
+		return sum([ len(set(offsets)) for (offsets, _) in index.values() ])
+
+
+# Generate fixup index (see FixupIndex)
+def generate_fixup_index(fixups):
+	logging.debug("Generating fixup index...")
+	fixup_index = FixupIndex(fixups)
+	logging.debug("Source index: %d entries, target index: %d entries" % (FixupIndex.count_entries(fixup_index.source_index), FixupIndex.count_entries(fixup_index.target_index)))
+	return fixup_index
+
+
+# Get fixups for offset range from fixup index (source object/offsets)
 # NOTE:
-# - works for both source and target map
 # - end offset is excluded
 # - use 'filter_dupes=True' to filter out duplicates (i.e. entries with same
 #   src obj + src ofs + tgt obj + tgt ofs; this helps dealing with duplicate
 #   fixup records around page boundaries)
-def get_fixups_for_offset(fixup_map, obj_num, start_ofs, end_ofs, filter_dupes):
-	if (not isinstance(fixup_map, dict)):
-		raise TypeError("fixup_map must be type dict, not %s" % type(fixup_map).__name__)
+def get_fixups_for_offset(fixup_index, obj_num, start_ofs, end_ofs, filter_dupes):
+	if (not isinstance(fixup_index, FixupIndex)):
+		raise TypeError("fixup_index must be type FixupIndex, not %s" % type(fixup_index).__name__)
 	if (not isinstance(obj_num, int)):
 		raise TypeError("obj_num must be type int, not %s" % type(obj_num).__name__)
 	if (obj_num < 0):
@@ -1452,23 +2083,18 @@ def get_fixups_for_offset(fixup_map, obj_num, start_ofs, end_ofs, filter_dupes):
 	if (not isinstance(filter_dupes, bool)):
 		raise TypeError("filter_dupes must be type bool, not %s" % type(filter_dupes).__name__)
 
-	fixups = []
+	fixups = fixup_index.get_by_source(obj_num, start_ofs, end_ofs)
 
-	if (filter_dupes == True):
+	if (filter_dupes == True and len(fixups) > 1):
 		dupes_map = {}
-		for ofs in range(start_ofs, end_ofs):
-			if ((obj_num, ofs) in fixup_map):
-				for item in fixup_map[(obj_num, ofs)]:
-					if ((item["source object"], item["source offset"], item["target object"], item["target offset"]) in dupes_map):
-						#logging.debug("Filtering duplicate fixup: %s" % format_fixup(item))
-						continue
-					fixups.append(item)
-					dupes_map[(item["source object"], item["source offset"], item["target object"], item["target offset"])] = item
-
-	else:
-		for ofs in range(start_ofs, end_ofs):
-			if ((obj_num, ofs) in fixup_map):
-				fixups += fixup_map[(obj_num, ofs)]
+		filtered = []
+		for item in fixups:
+			if ((item["source object"], item["source offset"], item["target object"], item["target offset"]) in dupes_map):
+				#logging.debug("Filtering duplicate fixup: %s" % format_fixup(item))
+				continue
+			filtered.append(item)
+			dupes_map[(item["source object"], item["source offset"], item["target object"], item["target offset"])] = item
+		fixups = filtered
 
 	return fixups
 
@@ -1476,8 +2102,150 @@ def get_fixups_for_offset(fixup_map, obj_num, start_ofs, end_ofs, filter_dupes):
 # ----------------- execution flow / branch tracing --------------------
 
 
+# Block index: blocks of one object sorted by start offset; keeps a list of
+# start offsets in sync with blocks to allow for binary search (i.e. to locate
+# block boundaries and blocks containing an offset in O(log n))
+# NOTE:
+# Blocks are stored as-is (i.e. references stay valid); blocks that have not
+# been decoded yet have an end of None
+class BlockIndex():
+
+	def __init__(self):
+		self.starts = []
+		self.blocks = []
+
+	def add(self, block):
+		index = bisect.bisect_left(self.starts, block["start"])
+		self.starts.insert(index, block["start"])
+		self.blocks.insert(index, block)
+
+	# Get start offset of first block starting after offset (or None)
+	def next_start(self, offset):
+		index = bisect.bisect_right(self.starts, offset)
+		return self.starts[index] if (index < len(self.starts)) else None
+
+	# Get decoded block containing offset (or None)
+	def find(self, offset):
+		index = bisect.bisect_right(self.starts, offset) - 1
+		if (index < 0):
+			return None
+		block = self.blocks[index]
+		if (block["end"] == None or offset >= block["end"]):
+			return None
+		return block
+
+
+# Locate first record starting at or after offset in list of records sorted by
+# offset (same as bisect_left() on offsets of records, without having to build
+# list of offsets; bisect's 'key' argument requires Python >= 3.10)
+def bisect_records(records, offset):
+	lo = 0
+	hi = len(records)
+	while (lo < hi):
+		mid = (lo + hi) // 2
+		if (records[mid].offset < offset):
+			lo = mid + 1
+		else:
+			hi = mid
+	return lo
+
+
+# Shared decode of one object: records produced by objdump are kept in an
+# offset -> record map, thus code is only disassembled once, no matter how
+# many blocks (or parts of blocks) make use of it. Ranges already decoded are
+# tracked as sorted, non-overlapping lists of start/end offsets
+# NOTE:
+# objdump is run from the requested offset to the requested bound, to the
+# start of the next decoded range or for at most CHUNK_SIZE bytes, whichever
+# comes first (i.e. decoding is bounded to what blocks actually use; blocks
+# running past the end of a chunk continue with the next chunk). objdump is
+# run for up to MAX_INSN_LENGTH bytes past that end, records crossing the end
+# are dropped (objdump lists instructions crossing its stop address with the
+# bytes up to the stop address only, such records must not be stored), except
+# for the record at the requested offset itself. If the requested
+# offset lies within a decoded range but not on an instruction boundary (i.e.
+# branch target disagrees with previous decode), bytes are decoded again with
+# different alignment; records of previous decode are kept (not replaced), so
+# the new decode syncs up with the previous one as soon as possible
+class ObjectDecode():
+
+	CHUNK_SIZE = 0x1000
+	MAX_INSN_LENGTH = 15
+
+	def __init__(self, object, objdump_exec, objdump_cache):
+		self.object = object
+		self.objdump_exec = objdump_exec
+		self.objdump_cache = objdump_cache
+		self.records = {}
+		self.range_starts = []
+		self.range_ends = []
+		self.runs = 0
+		self.decoded_bytes = 0
+
+	# Get record for offset, decode up to bound if necessary (returns None if
+	# there is no valid instruction at offset)
+	def get(self, offset, bound):
+		if (not offset in self.records):
+			self.decode(offset, bound)
+		return self.records.get(offset, None)
+
+	def decode(self, offset, bound):
+		index = bisect.bisect_right(self.range_starts, offset)
+		end_ofs = bound
+		if (index < len(self.range_starts) and self.range_starts[index] < end_ofs):
+			end_ofs = self.range_starts[index]
+		if (offset + self.CHUNK_SIZE < end_ofs):
+			end_ofs = offset + self.CHUNK_SIZE
+		if (index > 0 and offset < self.range_ends[index-1]):
+			logging.warning("  Decoding misaligned offset: object: %d, offset: 0x%x, decoded range: 0x%x - 0x%x" % (self.object["num"], offset, self.range_starts[index-1], self.range_ends[index-1]))
+
+		decode_end = min(end_ofs + self.MAX_INSN_LENGTH, len(self.object["data"]))
+
+		logging.debug("  Disassembling: object: %d, start: 0x%x, end: 0x%x" % (self.object["num"], offset, end_ofs))
+		(_, _, disassembly, _) = generate_code_disassembly(self.object["data"], offset, decode_end, "default", self.objdump_exec, 0, 0, verbose=False, objdump_cache=self.objdump_cache)
+		self.runs += 1
+		self.decoded_bytes += decode_end - offset
+
+		# Drop records crossing end (i.e. last instruction of chunk or instruction
+		# running into next decoded range/bound; those are decoded again starting
+		# at their own offset when requested, thus always completely)
+		records = []
+		for asm in disassembly:
+			if (not isinstance(asm, AsmRecord)):
+				logging.warning("  Invalid assembly line: '%s'" % asm)
+				continue
+			if (asm.end > end_ofs and asm.offset != offset):
+				continue
+			records.append(asm)
+
+		range_end = offset
+		for asm in records:
+			if (not asm.offset in self.records):
+				self.records[asm.offset] = asm
+			range_end = max(range_end, asm.end)
+		if (range_end == offset):
+			return
+
+		# Add decoded range, merge with overlapping/adjacent ranges
+		lo = bisect.bisect_left(self.range_ends, offset)
+		hi = bisect.bisect_right(self.range_starts, range_end)
+		range_start = offset
+		if (lo < hi):
+			range_start = min(range_start, self.range_starts[lo])
+			range_end = max(range_end, self.range_ends[hi-1])
+		self.range_starts[lo:hi] = [ range_start ]
+		self.range_ends[lo:hi] = [ range_end ]
+
+
 # Trace execution flow to identify code/data blocks
-def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdump_exec):
+# NOTE:
+# Blocks are processed via worklist; blocks are decoded up to the start of the
+# next known block (located via BlockIndex) using a shared per-object decode
+# (see ObjectDecode), thus each byte is disassembled at most once (except for
+# branch targets with conflicting alignment). Branch targets are registered
+# once a block is complete; targets landing inside a decoded block split that
+# block (records are moved, no need to decode or analyze again)
+def trace_execution_flow(wdump, objects, start_obj, start_ofs, fixup_index, objdump_exec, objdump_cache=None):
 
 	#
 	# TODO:
@@ -1516,6 +2284,10 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 	#   only printing mid-analysis
 	# - Change from code blocks to just blocks; add key 'type' to each block; this way, we are able
 	#   to store any kind of block (see jump tables below)
+	# - Process blocks via worklist, locate next block via ordered block index instead of scanning
+	#   the block list for each block; decode each object only once (shared per-object decode, see
+	#   ObjectDecode) instead of disassembling from each block start to the next block start and
+	#   dropping everything after the first 'ret'/'jmp'; split blocks if a branch lands inside
 	#
 
 	# Initialize block list + known blocks map
@@ -1533,10 +2305,13 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 	rb_list = []
 	ub_list = []
 
-	# Add specified start point as initial item to block list + known blocks map
-	# NOTE: start point MUST point to code for execution tracing to work (!)
-	blk_list.append(OrderedDict([("object", start_obj), ("start", start_ofs), ("end", None), ("length", None), ("type", "code"), ("disassembly", [])]))
-	blk_map[(start_obj, start_ofs)] = blk_list[-1]
+	# Initialize worklist (blocks pending to be decoded), block indices (object
+	# num -> BlockIndex), shared decodes (object num -> ObjectDecode) + number
+	# of block splits
+	worklist = deque()
+	blk_indices = {}
+	obj_decodes = {}
+	split_count = 0
 
 	# Generate map object num -> object
 	obj_map = {}
@@ -1546,9 +2321,46 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 			continue
 		obj_map[object["num"]] = object
 
-	# Process block list
-	# NOTE: list will grow during loop, which seems to work fine with for-loops
-	for block in blk_list:
+	# Add block to block list + known blocks map + block index; if block start
+	# lies within a decoded block, that block is split (i.e. the new block takes
+	# over records starting at block start), otherwise new block is added to
+	# worklist
+	def add_block(obj_num, start):
+		nonlocal split_count
+		if ((obj_num, start) in blk_map):
+			return
+		block = OrderedDict([("object", obj_num), ("start", start), ("end", None), ("length", None), ("type", "code"), ("disassembly", [])])
+		if (not obj_num in blk_indices):
+			blk_indices[obj_num] = BlockIndex()
+		split_block = blk_indices[obj_num].find(start)
+		if (split_block != None):
+			records = split_block["disassembly"]
+			index = bisect_records(records, start)
+			if (index < len(records) and records[index].offset == start):
+				logging.debug("  Splitting block: object: %d, start: 0x%x, end: 0x%x, split: 0x%x" % (obj_num, split_block["start"], split_block["end"], start))
+				block["disassembly"] = records[index:]
+				block["end"] = split_block["end"]
+				block["length"] = block["end"] - block["start"]
+				del records[index:]
+				split_block["end"] = start
+				split_block["length"] = split_block["end"] - split_block["start"]
+				split_count += 1
+			else:
+				logging.warning("  Block start not aligned to instructions of containing block: object: %d, start: 0x%x, containing block: 0x%x - 0x%x" % (obj_num, start, split_block["start"], split_block["end"]))
+				split_block = None
+		blk_list.append(block)
+		blk_map[(obj_num, start)] = block
+		blk_indices[obj_num].add(block)
+		if (split_block == None):
+			worklist.append(block)
+
+	# Add specified start point as initial item
+	# NOTE: start point MUST point to code for execution tracing to work (!)
+	add_block(start_obj, start_ofs)
+
+	# Process worklist
+	while (len(worklist) > 0):
+		block = worklist.popleft()
 
 		# Print current item
 		logging.debug("Block start: object: %d, start: 0x%x, type: %s" % (block["object"], block["start"], block["type"]))
@@ -1569,33 +2381,40 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 			logging.error("Block start out of bounds: block start: 0x%x, object size: 0x%x, skipping block (object: %d, start: 0x%x, type: %s)" % (block["start"], object["size"], block["object"], block["start"], block["type"]))
 			continue
 
-		# Search block list for block starting right AFTER current block
-		# -> use start of next block as assumed end of current block
-		# -> this is just a smart guess to speed things up by limiting the amount
-		#    of data to be disassembled; the block might still end prematurely
-		#    (due to 'ret'/'jmp' etc.)
-		end_ofs = object["size"]
-		for item in blk_list:
-			if (item["object"] != block["object"]):
-				continue
-			if (item["start"] > block["start"] and item["start"] < end_ofs):
-				end_ofs = item["start"]
+		# Look up block starting right AFTER current block via block index
+		# -> use start of next block as end of current block (if block does not
+		#    end before due to 'ret'/'jmp' etc.; if it doesn't, execution falls
+		#    through to next block)
+		end_ofs = blk_indices[block["object"]].next_start(block["start"])
+		if (end_ofs == None or end_ofs > object["size"]):
+			end_ofs = object["size"]
 
-		# Disassemble code block
-		logging.debug("  Disassembling: object: %d, start: 0x%x, end: 0x%x, type: %s" % (block["object"], block["start"], end_ofs, block["type"]))
-		(_, _, disassembly, _) = generate_code_disassembly(object["data"], block["start"], end_ofs, "default", objdump_exec, 0, 0, verbose=False)
+		# Get shared decode of object
+		if (not block["object"] in obj_decodes):
+			obj_decodes[block["object"]] = ObjectDecode(object, objdump_exec, objdump_cache)
+		obj_decode = obj_decodes[block["object"]]
 
-		# Process disassembly lines
+		# Process disassembly records (decoded on demand), collect branch targets
+		# NOTE:
+		# Branch targets are added once block is complete, as targets within the
+		# current block result in splitting the block
+		branch_targets = []
+		offset = block["start"]
 		break_loop = False
-		for line in disassembly:
+		while (offset < end_ofs):
 
 			# Break loop requested?
 			if (break_loop == True):
 				break
 
-			# Split line, add split line to block disassembly
-			asm = split_asm_line(line)
+			# Get record, add to block disassembly
+			asm = obj_decode.get(offset, end_ofs)
+			if (asm == None):
+				logging.warning("  No valid instruction at offset: object: %d, offset: 0x%x" % (block["object"], offset))
+				break
 			block["disassembly"].append(asm)
+			offset = asm.end
+			line = str(asm)
 
 			# End of code block reached? -> request break loop
 			# NOTE:
@@ -1607,7 +2426,7 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 			# TODO:
 			# There might be additional relevant assembler instructions:
 			# iretw, iretq, sysexit, sysret, uiret
-			if (asm["command"] in ("ret", "iret", "iretd", "jmp")):
+			if (asm.command in ("ret", "iret", "iretd", "jmp")):
 				break_loop = True
 
 			# Does code branch?
@@ -1623,14 +2442,14 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 			# TODO:
 			# There might be additional relevant assembler instructions:
 			# syscall, sysenter
-			if (asm["command"] == "call" or asm["command"].startswith("j")):		# call + jump commands
+			if (asm.command == "call" or asm.command.startswith("j")):		# call + jump commands
 
 				# Direct branch (i.e. branch via direct/constant address/offset)
-				match = re.match(r"^0x([0-9a-fA-F]+)$", asm["arguments"].strip())
+				match = re.match(r"^0x([0-9a-fA-F]+)$", asm.arguments.strip())
 				if (match != None):
 					bt_obj = block["object"]										# assume branch within same object (fixup may override)
 					bt_ofs = int(match.group(1), 16)								# assume offset is correct (fixup may override)
-					fixups = get_fixups_for_offset(fusrc_map, block["object"], asm["offset"], asm["offset"] + len(asm["data"]), True)
+					fixups = get_fixups_for_offset(fixup_index, block["object"], asm.offset, asm.end, True)
 					if (len(fixups) > 1):											# multiple fixups for branch (should never happen)
 						logging.error("  Multiple fixups for direct branch: %s" % line)
 						for fixup in fixups:
@@ -1647,14 +2466,13 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 					db_list.append(OrderedDict([("object", block["object"]), ("line", line)]))
 					if (not (bt_obj, bt_ofs) in blk_map):
 						logging.debug("  New block (direct): object: %d, start: 0x%x, line: %s" % (bt_obj, bt_ofs, line))
-						blk_list.append(OrderedDict([("object", bt_obj), ("start", bt_ofs), ("end", None), ("length", None), ("type", "code"), ("disassembly", [])]))
-						blk_map[(bt_obj, bt_ofs)] = blk_list[-1]
+						branch_targets.append((bt_obj, bt_ofs))
 					continue														# branch was handled
 
 				# Reference branch (i.e. indirect branch via memory reference)
-				match = re.match(r"^DWORD PTR (?:cs:|ds:|es:|fs:|gs:|ss:)?0x[0-9a-fA-F]+$", asm["arguments"].strip())
+				match = re.match(r"^DWORD PTR (?:cs:|ds:|es:|fs:|gs:|ss:)?0x[0-9a-fA-F]+$", asm.arguments.strip())
 				if (match):
-					fixups = get_fixups_for_offset(fusrc_map, block["object"], asm["offset"], asm["offset"] + len(asm["data"]), True)
+					fixups = get_fixups_for_offset(fixup_index, block["object"], asm.offset, asm.end, True)
 					if (len(fixups) == 0):
 						logging.error("  No fixup for reference branch: %s" % line)
 						continue
@@ -1667,7 +2485,7 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 					ref_obj = fixup["target object"]
 					ref_ofs = fixup["target offset"]
 
-					fixups = get_fixups_for_offset(fusrc_map, ref_obj, ref_ofs, ref_ofs + 4, True)
+					fixups = get_fixups_for_offset(fixup_index, ref_obj, ref_ofs, ref_ofs + 4, True)
 					if (len(fixups) == 0):											# happens for stubs, e.g. FATAL.EXE, (obj 1, 0x71cb2) -> (obj 3, ofs: 0x103ab8) -> no fixup
 						logging.error("  No fixup for reference branch (2): %s" % line)
 						continue
@@ -1680,12 +2498,11 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 					bt_obj = fixup["target object"]
 					bt_ofs = fixup["target offset"]
 
-					rb_list.append(OrderedDict([("object", block["object"]), ("line", line), ("refs", "(obj%d, 0x%x) -> (obj%d, 0x%x) -> (obj%d, 0x%x)" % (block["object"], asm["offset"], ref_obj, ref_ofs, bt_obj, bt_ofs))]))
+					rb_list.append(OrderedDict([("object", block["object"]), ("line", line), ("refs", "(obj%d, 0x%x) -> (obj%d, 0x%x) -> (obj%d, 0x%x)" % (block["object"], asm.offset, ref_obj, ref_ofs, bt_obj, bt_ofs))]))
 
 					if (not (bt_obj, bt_ofs) in blk_map):
 						logging.debug("  New block (reference): object: %d, start: 0x%x, line: %s" % (bt_obj, bt_ofs, line))
-						blk_list.append(OrderedDict([("object", bt_obj), ("start", bt_ofs), ("end", None), ("length", None), ("type", "code"), ("disassembly", [])]))
-						blk_map[(bt_obj, bt_ofs)] = blk_list[-1]
+						branch_targets.append((bt_obj, bt_ofs))
 					continue
 
 				# Branch table branches
@@ -1710,10 +2527,10 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 				#   but only fixups associated with them; not a problem per se as fixups are what we're looking for, but
 				#   should we at least check for and report differences?
 				# - code needs to be thoroughly checked and verified
-				match = re.match(r"^DWORD PTR (?:cs:|ds:|es:|fs:|gs:|ss:)?\[.+0x[0-9a-fA-F]+\]$", asm["arguments"].strip())
+				match = re.match(r"^DWORD PTR (?:cs:|ds:|es:|fs:|gs:|ss:)?\[.+0x[0-9a-fA-F]+\]$", asm.arguments.strip())
 				if (match):
 					logging.debug("  Possible branch table reference: %s" % line)	# check if there is a fixup associated with the offset that points to the table
-					fixups = get_fixups_for_offset(fusrc_map, block["object"], asm["offset"], asm["offset"] + len(asm["data"]), True)
+					fixups = get_fixups_for_offset(fixup_index, block["object"], asm.offset, asm.end, True)
 					if (len(fixups) == 0):
 						logging.warning("  No fixup for branch table reference")	# not an error (e.g. MK1.EXE, object 1, 0x39431 -> 0x11c does not reference a branch table)
 						continue
@@ -1736,7 +2553,7 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 
 					entry_ofs = table_ofs											# iterate over table entries, check if there are fixups associated with the entries (i.e. branch targets)
 					while (True):													# TODO: works for now, but NOT a good approach; what could be used as an end condition?
-						fixups = get_fixups_for_offset(fusrc_map, table_obj, entry_ofs, entry_ofs + 4, True)
+						fixups = get_fixups_for_offset(fixup_index, table_obj, entry_ofs, entry_ofs + 4, True)
 						if (len(fixups) == 0):										# no more consecutive fixups (i.e. end of table reached), ...
 							logging.debug("  End of branch table reached: object: %d, offset: 0x%x" % (table_obj, entry_ofs))
 							break													# ... abort loop
@@ -1759,8 +2576,7 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 
 							if (not (bt_obj, bt_ofs) in blk_map):					# skip known branches (block already created)
 								logging.debug("  New block (branch table entry): object: %d, start: 0x%x" % (bt_obj, bt_ofs))
-								blk_list.append(OrderedDict([("object", bt_obj), ("start", bt_ofs), ("end", None), ("length", None), ("type", "code"), ("disassembly", [])]))
-								blk_map[(bt_obj, bt_ofs)] = blk_list[-1]
+								branch_targets.append((bt_obj, bt_ofs))
 								#bt_list[-1]["entries"].append(OrderedDict([("object", bt_obj), ("offset", bt_ofs)])) # add table entry to table (only unique/new)
 
 						# Advance entry offset to next (assumed) branch table entry
@@ -1773,13 +2589,20 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 				ub_list.append(OrderedDict([("object", block["object"]), ("line", line)]))
 
 		# Calculate end + length of code block from last disassembly line
-		asm = block["disassembly"][-1]
-		block["end"] = asm["offset"] + len(asm["data"])
+		if (len(block["disassembly"]) > 0):
+			asm = block["disassembly"][-1]
+			block["end"] = asm.end
+		else:
+			block["end"] = block["start"]
 		block["length"] = block["end"] - block["start"]
 
 		# Print current item
 		logging.debug("Block end: object: %d, start: 0x%x, end: 0x%x, length: 0x%x (%d), type: %s, lines: %d" % (block["object"], block["start"], block["end"], block["length"], block["length"], block["type"], len(block["disassembly"])))
 
+		# Add blocks for branch targets
+		for (bt_obj, bt_ofs) in branch_targets:
+			add_block(bt_obj, bt_ofs)
+
 	# Sort results
 	blk_list.sort(key=lambda item: (item["object"], item["start"]))
 
@@ -1804,7 +2627,10 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 	for item in ub_list:
 		logging.debug("object: %d, line: %s" % (item["object"], item["line"]))
 	logging.debug("")
-	logging.debug("Identified %d unique blocks." % len(blk_list)) # TODO: print number of code blocks, data blocks and total blocks
+	logging.debug("Identified %d unique blocks (%d splits)." % (len(blk_list), split_count)) # TODO: print number of code blocks, data blocks and total blocks
+	for obj_num in sorted(obj_decodes.keys()):
+		obj_decode = obj_decodes[obj_num]
+		logging.debug("Object %d: disassembled %d bytes in %d objdump runs, %d decoded ranges" % (obj_num, obj_decode.decoded_bytes, obj_decode.runs, len(obj_decode.range_starts)))
 
 	# Return results
 	return (blk_list, blk_map)
@@ -1826,6 +2652,28 @@ def trace_execution_flow(wdump, objects, start_obj, start_ofs, fusrc_map, objdum
 # Contrary to the name, a data map itself is NOT a map (i.e. dict), but in-
 # stead a list of dicts describing the layout of an object's binary data.
 # The list items are processed sequentially when disassembling (see below)
+# NOTE:
+# Data maps are DataMap instances (list of dicts + lists of start and end
+# offsets kept in sync with items), which allows locating the items affected
+# by an insert via binary search (bisect) instead of scanning the whole list
+
+
+# Data map: list of items covering an object's data without gaps, sorted by
+# offset; keeps lists of start and end offsets in sync with items
+# NOTE:
+# Items must only be modified via splice() (used by insert_data_map_item())
+class DataMap(list):
+
+	def __init__(self, items=()):
+		super().__init__(items)
+		self.starts = [ item["start"] for item in self ]
+		self.ends = [ item["end"] for item in self ]
+
+	# Replace items from start index to end index (inclusive) with new items
+	def splice(self, start_index, end_index, items):
+		self[start_index:end_index+1] = items
+		self.starts[start_index:end_index+1] = [ item["start"] for item in items ]
+		self.ends[start_index:end_index+1] = [ item["end"] for item in items ]
 
 
 # Custom exception raised by insert_data_map_item()
@@ -1944,11 +2792,14 @@ class DataMapInsertError(Exception):
 # Rewrite supporting merging and extending ranges (by splicing into / replacing
 # multiple existing items instead of just one). Created this to replace former
 # method of using 'immutable' items
+# NOTE:
+# Splice start/end items are located via binary search on the start and end
+# offsets of the data map (see DataMap)
 def insert_data_map_item(data_map, ins_item):
 
 	# Sanity checks
-	if (not isinstance(data_map, list)):
-		raise TypeError("data map must be type list, not %s" % type(data_map).__name__)
+	if (not isinstance(data_map, DataMap)):
+		raise TypeError("data map must be type DataMap, not %s" % type(data_map).__name__)
 	if (not isinstance(ins_item, dict)):
 		raise TypeError("insert item must be type dict, not %s" % type(ins_item).__name__)
 	for (key, key_type) in (("start", int), ("end", int), ("type", str), ("mode", str), ("source", str)):
@@ -1965,29 +2816,20 @@ def insert_data_map_item(data_map, ins_item):
 	if (ins_item["start"] == ins_item["end"]):
 		return
 
-	# Locate splice start index/item within data map
-	# NOTE: iterating list indices in reversed order is important here
-	start_index = None
-	start_item = None
-	for i in reversed(range(0, len(data_map))):
-		if (ins_item["start"] >= data_map[i]["start"]):
-			start_index = i
-			start_item = data_map[i]
-			break
-	if (start_index == None or start_item == None):
+	# Locate splice start index/item within data map (i.e. last item starting
+	# at or before start offset of insert item)
+	start_index = bisect.bisect_right(data_map.starts, ins_item["start"]) - 1
+	if (start_index < 0):
 		raise DataMapInsertError("failed to locate splice start index/item")
+	start_item = data_map[start_index]
 
-	# Locate splice end index/item within data map
+	# Locate splice end index/item within data map (i.e. first item from start
+	# index on ending at or after end offset of insert item)
 	# NOTE: end index/item may ultimately be the same as start index/item
-	end_index = None
-	end_item = None
-	for i in range(start_index, len(data_map)):
-		if (ins_item["end"] <= data_map[i]["end"]):
-			end_index = i
-			end_item = data_map[i]
-			break
-	if (end_index == None or end_item == None):
+	end_index = max(bisect.bisect_left(data_map.ends, ins_item["end"]), start_index)
+	if (end_index >= len(data_map)):
 		raise DataMapInsertError("failed to locate splice end index/item")
+	end_item = data_map[end_index]
 
 	# If splice start index/item == splice end index/item and that item has the
 	# exact same properties as the insert item, the insert item can be ignored
@@ -1996,18 +2838,15 @@ def insert_data_map_item(data_map, ins_item):
 	if ((start_index == end_index) and (start_item == end_item == ins_item)):
 		return
 
-	# Remove items from start to end from data map
-	# NOTE: +1 is required as slicing excludes end index in Python
-	del data_map[start_index:end_index+1]
-
-	# Splice insert item into data map by replacing the removed items with 3 new
-	# items: start item head + insert item + end item tail
-	# NOTE: insertion order reversed to allow start_index to remain constant
-	if (end_item["end"] > ins_item["end"]): # end item tail
-		data_map.insert(start_index, OrderedDict([("start", ins_item["end"]), ("end", end_item["end"]), ("type", end_item["type"]), ("mode", end_item["mode"]), ("source", end_item["source"])]))
-	data_map.insert(start_index, OrderedDict([("start", ins_item["start"]), ("end", ins_item["end"]), ("type", ins_item["type"]), ("mode", ins_item["mode"]), ("source", ins_item["source"])]))
+	# Splice insert item into data map by replacing items from start to end with
+	# 3 new items: start item head + insert item + end item tail
+	items = []
 	if (start_item["start"] < ins_item["start"]): # start item head
-		data_map.insert(start_index, OrderedDict([("start", start_item["start"]), ("end", ins_item["start"]), ("type", start_item["type"]), ("mode", start_item["mode"]), ("source", start_item["source"])]))
+		items.append(OrderedDict([("start", start_item["start"]), ("end", ins_item["start"]), ("type", start_item["type"]), ("mode", start_item["mode"]), ("source", start_item["source"])]))
+	items.append(OrderedDict([("start", ins_item["start"]), ("end", ins_item["end"]), ("type", ins_item["type"]), ("mode", ins_item["mode"]), ("source", ins_item["source"])]))
+	if (end_item["end"] > ins_item["end"]): # end item tail
+		items.append(OrderedDict([("start", ins_item["end"]), ("end", end_item["end"]), ("type", end_item["type"]), ("mode", end_item["mode"]), ("source", end_item["source"])]))
+	data_map.splice(start_index, end_index, items)
 
 
 # Check data map consistency
@@ -2039,11 +2878,47 @@ def check_data_map_consistency(object_num, data_map):
 
 
 
+# ------------------- worker tasks -------------------
+
+
+# Generate disassembly for data map entry of type 'data' (worker task; shared
+# data: list of objects); returns offset, length and disassembly
+def generate_data_entry_disassembly(objects, object_index, entry_index):
+	object = objects[object_index]
+	entry = object["data map"][entry_index]
+	if (entry["mode"].startswith("struct")):
+		return generate_struct_disassembly(object["data"], entry["start"], entry["end"], entry["mode"])
+	return generate_data_disassembly(object["data"], entry["start"], entry["end"], entry["mode"])
+
+
+# Generate formatted disassembly for object and deduplicate it (worker task;
+# shared data: list of objects, symbol table, fixup index); returns formatted
+# disassembly, module map, deduplicated disassembly and deduplication index
+# (reused when splitting formatted disassembly into separate files)
+def generate_formatted_deduped_disassembly(shared, object_index):
+	(objects, globals_, fixup_index) = shared
+	object = objects[object_index]
+	generate_formatted_disassembly(object, globals_, fixup_index)
+	dedup_index = DedupIndex(object["disasm formatted"])
+	return (object["disasm formatted"], object["module map"], deduplicate_formatted_slices([ (dedup_index, 0, len(dedup_index)) ]), dedup_index)
+
+
 # --------------------- main -------------------------
 
 
 # Disassemble objects
-def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
+# NOTE:
+# If objdump_cache is specified (ObjdumpCache instance), it is used for all
+# runs of objdump (see generate_code_disassembly()); jobs specifies the max-
+# imum number of objdump runs/worker processes to use concurrently
+def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template, objdump_cache=None, jobs=1, trace_flow=False):
+	if (not isinstance(jobs, int)):
+		raise TypeError("jobs must be type int, not %s" % type(jobs).__name__)
+	if (jobs < 1):
+		raise ValueError("jobs must be positive non-zero value, not %d" % jobs)
+	if (not isinstance(trace_flow, bool)):
+		raise TypeError("trace_flow must be type bool, not %s" % type(trace_flow).__name__)
+
 	logging.info("")
 	logging.info("Disassembling objects:")
 
@@ -2067,8 +2942,8 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# - for now, storing maps as local variables; maybe add to disasm[] later?
 	logging.info("")
 	logging.info("Processing fixups further:")
-	# Generate fixups maps
-	(fusrc_map, futgt_map) = generate_fixup_maps(disasm["fixups"])
+	# Generate fixup index
+	fixup_index = generate_fixup_index(disasm["fixups"])
 	# Analyze references in fixup/relocation data and add corresponding globals
 	# TODO:
 	# - analyze_fixups_add_globals() sets globals to type of parent object; this is
@@ -2079,21 +2954,23 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	analyze_fixups_add_globals(disasm["objects"], disasm["globals"], disasm["fixups"])
 
 
-	# TESTING:
 	# Execution flow tracing to identify code blocks (aka 'branch tracing'/'tracing
-	# disassembler'); This is completely separate for now (not yet integrated with
-	# anything that follows)
-	#logging.info("")
-	#logging.info("Tracing execution flow to identify code blocks:")
-	#ep_obj = dict_path_value(wdump, "linear exe header (os/2 v2.x) - le", "data", "object # for initial eip")
-	#ep_ofs = dict_path_value(wdump, "linear exe header (os/2 v2.x) - le", "data", "initial eip")
-	#if (ep_obj != None and ep_ofs != None):
-	#	(blk_list, blk_map) = trace_execution_flow(wdump, disasm["objects"], ep_obj, ep_ofs, fusrc_map, objdump_exec)
-	#	write_file(outfile_template % "disasm_block_list.txt", format_pprint(blk_list))
-	#	write_file(outfile_template % "disasm_block_map.txt", format_pprint(blk_map))
-	#else:
-	#	logging.warning("LE header does not contain entries for entry object/offset, skipping trace")
-	#return # leave disassemble_objects()
+	# disassembler'); enabled via 'trace_flow'. This is completely separate for
+	# now (not yet integrated with anything that follows), results are only
+	# written to file
+	if (trace_flow == True):
+		logging.info("")
+		logging.info("Tracing execution flow to identify code blocks:")
+		ep_obj = dict_path_value(wdump, "linear exe header (os/2 v2.x) - le", "data", "object # for initial eip")
+		ep_ofs = dict_path_value(wdump, "linear exe header (os/2 v2.x) - le", "data", "initial eip")
+		if (ep_obj != None and ep_ofs != None):
+			(blk_list, blk_map) = trace_execution_flow(wdump, disasm["objects"], ep_obj, ep_ofs, fixup_index, objdump_exec, objdump_cache)
+			blk_list_rendered = [ OrderedDict([ (key, render_disassembly(value) if (key == "disassembly") else value) for (key, value) in block.items() ]) for block in blk_list ]
+			write_file(outfile_template % "disasm_block_list.txt", format_pprint(blk_list_rendered))
+			#write_file(outfile_template % "disasm_block_map.txt", format_pprint(blk_map))
+		else:
+			logging.warning("LE header does not contain entries for entry object/offset, skipping trace")
+		#return # leave disassemble_objects()
 
 
 	# Build data maps for code objects
@@ -2104,7 +2981,7 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 		logging.debug("Building data map for object %d..." % object["num"])
 
 		# Initialize data map with object item spanning accross all data
-		object["data map"] = [ OrderedDict([("start", 0), ("end", object["size"]), ("type", object["type"]), ("mode", "default"), ("source", "object")]) ]
+		object["data map"] = DataMap([ OrderedDict([("start", 0), ("end", object["size"]), ("type", object["type"]), ("mode", "default"), ("source", "object")]) ])
 
 		# Modules
 		for module in disasm["modules"]:
@@ -2136,8 +3013,7 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 			if (module["num"] in module_bounds):
 				module_bounds[module["num"]].sort(key=lambda item: (item["start"], item["end"]), reverse=True) # reverse sort order is important, won't work otherwise!
 
-		object_globals = [ item for item in disasm["globals"] if (item["object"] == object["num"] and item["source"] == "debug info") ]
-		object_globals.sort(key=lambda item: item["offset"])
+		object_globals = [ item for item in disasm["globals"].get_for_object(object["num"]) if (item["source"] == "debug info") ]
 		for i in range(0, len(object_globals)):
 			current_global = object_globals[i]
 
@@ -2321,43 +3197,69 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# TODO:
 	# Improve error output; currently, it's hard to figure out what exactly went wrong
 	# in case of an error
-	def generate_plain_disassembly(object):
-		logging.debug("Generating plain disassembly for object %d..." % object["num"])
-		object["disasm plain"] = []
-		offset = 0
-		#length = 0
-		#disassembly = []
-		#bad_num = 0
-		#bad_list = []
-		for entry in object["data map"]:
-			if (offset != entry["start"]):
-				logging.warning("Offset != entry[\"start\"]: offset: 0x%x, entry[\"start\"]: 0x%x" % (offset, entry["start"]))
-				offset = entry["start"]
-			if (entry["type"] == "code"):
-				#(offset, length, disassembly, bad_num, bad_list) = generate_code_disassembly(object["data"], entry["start"], entry["end"], objdump_exec, bad_num)
-				#(offset, length, disassembly, bad_num, bad_list) = generate_code_disassembly(object["data"], entry["start"], entry["end"], entry["mode"], objdump_exec, bad_num, verbose=False)
-				(offset, length, disassembly, bads) = generate_code_disassembly(object["data"], entry["start"], entry["end"], entry["mode"], objdump_exec, len(object["disasm plain"]), len(object["bad code"]), verbose=False)
-				object["bad code"] += bads
-			elif (entry["type"] == "data"):
-				if (entry["mode"].startswith("struct")):
-					(offset, length, disassembly) = generate_struct_disassembly(object["data"], entry["start"], entry["end"], entry["mode"])
-				else:
-					(offset, length, disassembly) = generate_data_disassembly(object["data"], entry["start"], entry["end"], entry["mode"])
-			else:
-				logging.error("Entry has invalid type: '%s'" % entry["type"])
-				continue
-			if (offset != entry["end"]):
-				logging.warning("Offset != entry[\"end\"]: offset: 0x%x, entry[\"end\"]: 0x%x" % (offset, entry["end"]))
-			if (length != entry["end"] - entry["start"]):
-				logging.warning("Length != entry[\"end\"] - entry[\"start\"]: length: 0x%x (%d), entry[\"end\"] - entry[\"start\"]: 0x%x (%d)" % (length, length, entry["end"] - entry["start"], entry["end"] - entry["start"]))
-			object["disasm plain"] += disassembly
-		logging.debug("Size of plain disassembly: %d lines, %d bytes" % (len(object["disasm plain"]), len(str.join(os.linesep, object["disasm plain"]))))
+	# NOTE:
+	# objdump runs for code entries of all objects are scheduled up front and
+	# performed by a pool of worker threads (objdump runs as subprocess, thus
+	# threads suffice to keep multiple cores busy); data entries are processed
+	# by a pool of worker processes (pure Python, thus threads would not help).
+	# Results are merged in data map order, thus output does not depend on
+	# number of jobs. Bad code numbers of results start at 1 and are adjusted
+	# when merging
+	def generate_plain_disassembly(objects):
+		data_jobs_count = sum([ 1 for object in objects for entry in object["data map"] if (entry["type"] == "data") ])
+		with WorkerPool(jobs, objects, max_tasks=data_jobs_count) as worker_pool, concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+			data_jobs = {}
+			for (object_index, object) in enumerate(objects):
+				for (index, entry) in enumerate(object["data map"]):
+					if (entry["type"] == "data"):
+						data_jobs[(object["num"], index)] = worker_pool.submit(generate_data_entry_disassembly, object_index, index)
+			code_jobs = {}
+			for object in objects:
+				for (index, entry) in enumerate(object["data map"]):
+					if (entry["type"] == "code"):
+						code_jobs[(object["num"], index)] = executor.submit(generate_code_disassembly, object["data"], entry["start"], entry["end"], entry["mode"], objdump_exec, 0, 0, verbose=False, objdump_cache=objdump_cache)
+			if (len(code_jobs) > 0):
+				logging.debug("Scheduled %d objdump runs (%d concurrent)" % (len(code_jobs), jobs))
+			for object in objects:
+				logging.debug("Generating plain disassembly for object %d..." % object["num"])
+				object["disasm plain"] = []
+				offset = 0
+				#length = 0
+				#disassembly = []
+				#bad_num = 0
+				#bad_list = []
+				for (index, entry) in enumerate(object["data map"]):
+					if (offset != entry["start"]):
+						logging.warning("Offset != entry[\"start\"]: offset: 0x%x, entry[\"start\"]: 0x%x" % (offset, entry["start"]))
+						offset = entry["start"]
+					if (entry["type"] == "code"):
+						#(offset, length, disassembly, bad_num, bad_list) = generate_code_disassembly(object["data"], entry["start"], entry["end"], objdump_exec, bad_num)
+						#(offset, length, disassembly, bad_num, bad_list) = generate_code_disassembly(object["data"], entry["start"], entry["end"], entry["mode"], objdump_exec, bad_num, verbose=False)
+						#(offset, length, disassembly, bads) = generate_code_disassembly(object["data"], entry["start"], entry["end"], entry["mode"], objdump_exec, len(object["disasm plain"]), len(object["bad code"]), verbose=False, objdump_cache=objdump_cache)
+						(offset, length, disassembly, bads) = code_jobs[(object["num"], index)].result()
+						for bad in bads:
+							bad["num"] += len(object["bad code"])
+						object["bad code"] += bads
+					elif (entry["type"] == "data"):
+						#if (entry["mode"].startswith("struct")):
+						#	(offset, length, disassembly) = generate_struct_disassembly(object["data"], entry["start"], entry["end"], entry["mode"])
+						#else:
+						#	(offset, length, disassembly) = generate_data_disassembly(object["data"], entry["start"], entry["end"], entry["mode"])
+						(offset, length, disassembly) = data_jobs[(object["num"], index)].result()
+					else:
+						logging.error("Entry has invalid type: '%s'" % entry["type"])
+						continue
+					if (offset != entry["end"]):
+						logging.warning("Offset != entry[\"end\"]: offset: 0x%x, entry[\"end\"]: 0x%x" % (offset, entry["end"]))
+					if (length != entry["end"] - entry["start"]):
+						logging.warning("Length != entry[\"end\"] - entry[\"start\"]: length: 0x%x (%d), entry[\"end\"] - entry[\"start\"]: 0x%x (%d)" % (length, length, entry["end"] - entry["start"], entry["end"] - entry["start"]))
+					object["disasm plain"] += disassembly
+				logging.debug("Size of plain disassembly: %d lines (%d records)" % (count_disassembly_lines(object["disasm plain"]), len(object["disasm plain"])))
 
 	# Generate plain disassembly for code objects
 	logging.info("")
 	logging.info("Generating plain disassembly for code objects:")
-	for object in [ item for item in disasm["objects"] if (item["type"] == "code") ]:
-		generate_plain_disassembly(object)
+	generate_plain_disassembly([ item for item in disasm["objects"] if (item["type"] == "code") ])
 
 
 	logging.info("")
@@ -2394,17 +3296,17 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	#    target offset' and 'no global in map for' warnings (test with MK2.EXE)
 	logging.debug("Analyzing branches...")
 	added_globals = 0
-	known_globals = { (item["object"], item["offset"]): item for item in disasm["globals"] }
 	for object in [ item for item in disasm["objects"] if (item["type"] == "code") ]:
 		for i in range(0, len(object["disasm plain"])):
-			line = object["disasm plain"][i]
-			asm = split_asm_line(line)
-			if (asm == None):
-				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, line))
+			asm = object["disasm plain"][i]
+			if (isinstance(asm, AsmRunRecord)): # runs are data (see AsmRunRecord)
 				continue
-			if (asm["command"] != "call" and not asm["command"].startswith("j") and not asm["command"].startswith("loop")):		# only call, jump and loop commands
+			if (not isinstance(asm, AsmRecord)):
+				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, asm))
 				continue
-			match = re.match(r"^0x([0-9a-fA-F]+)$", asm["arguments"].strip())		# only those with direct/constant address/offset
+			if (asm.command != "call" and not asm.command.startswith("j") and not asm.command.startswith("loop")):		# only call, jump and loop commands
+				continue
+			match = re.match(r"^0x([0-9a-fA-F]+)$", asm.arguments.strip())		# only those with direct/constant address/offset
 			if (match == None):
 				#logging.warning("Failed to match offset: line %d: %s" % (i+1, line))
 				continue
@@ -2418,9 +3320,9 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 
 			bt_obj = object["num"]													# assume branch within same object (fixup may override)
 			bt_ofs = int(match.group(1), 16)										# assume offset is correct (fixup may override)
-			fixups = get_fixups_for_offset(fusrc_map, object["num"], asm["offset"], asm["offset"] + len(asm["data"]), True)
+			fixups = get_fixups_for_offset(fixup_index, object["num"], asm.offset, asm.end, True)
 			if (len(fixups) > 1):													# multiple fixups for branch (should never happen)
-				logging.error("Multiple fixups for branch: %s" % line)
+				logging.error("Multiple fixups for branch: %s" % asm)
 				for fixup in fixups:
 					logging.error(format_fixup(fixup))
 				continue
@@ -2428,20 +3330,17 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 				fixup = fixups[0]													# much more credible/reliable (i.e. overrides target)
 				if (fixup["target object"] != bt_obj or fixup["target offset"] != bt_ofs):
 					logging.warning("Fixup takes precedence: %s" % format_fixup(fixup))
-					logging.warning("before: %s" % line.strip())
+					logging.warning("before: %s" % str(asm).strip())
 					ofs_str = match.group(0)										# entire offset string including leading '0x'
-					line = line.replace(ofs_str, "0x%x" % fixup["target offset"])	# replace offset (likely garbage due to call/jump stub)
-					object["disasm plain"][i] = line								# with fixup target offset and update disassembly line
-					logging.warning("after:  %s" % line.strip())
+					asm.replace(ofs_str, "0x%x" % fixup["target offset"])			# replace offset (likely garbage due to call/jump stub)
+					logging.warning("after:  %s" % str(asm).strip())				# with fixup target offset (updates disassembly record)
 				bt_obj = fixup["target object"]
 				bt_ofs = fixup["target offset"]
-			if ((bt_obj, bt_ofs) in known_globals):
-				known_globals[(bt_obj, bt_ofs)]["type"] = "code"
+			if ((bt_obj, bt_ofs) in disasm["globals"]):
+				disasm["globals"].get(bt_obj, bt_ofs)["type"] = "code"
 				continue
-			disasm["globals"].append(OrderedDict([("name", None), ("module", None), ("object", bt_obj), ("offset", bt_ofs), ("type", "code"), ("source", "branch analysis")]))
-			known_globals[(bt_obj, bt_ofs)] = disasm["globals"][-1]
+			disasm["globals"].add(OrderedDict([("name", None), ("module", None), ("object", bt_obj), ("offset", bt_ofs), ("type", "code"), ("source", "branch analysis")]))
 			added_globals += 1
-	disasm["globals"].sort(key=lambda item: (item["object"], item["offset"]))
 	logging.debug("Added %d globals for branches" % added_globals)
 
 
@@ -2452,26 +3351,21 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# to disassembly line map?
 	logging.debug("Analyzing access sizes...")
 	added_as = 0
-	globals_map = { (item["object"], item["offset"]): item for item in disasm["globals"] }
 	for object in [ item for item in disasm["objects"] if (item["type"] == "code") ]:
-		fixup_index = 0
-		object_fixups = [ fixup for fixup in disasm["fixups"] if (fixup["source object"] == object["num"]) ]
-		object_fixups.sort(key=lambda item: item["source offset"])
 		for i in range(0, len(object["disasm plain"])):
-			line = object["disasm plain"][i]
-			asm = split_asm_line(line)
-			if (asm == None):
-				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, line))
+			asm = object["disasm plain"][i]
+			if (isinstance(asm, AsmRunRecord)): # runs are zero-filled data, thus never yield access sizes
 				continue
-			asm_start = asm["offset"]
-			asm_end = asm["offset"] + len(asm["data"])
-			asm_fixups = []
-			while (fixup_index < len(object_fixups) and object_fixups[fixup_index]["source offset"] >= asm_start and object_fixups[fixup_index]["source offset"] < asm_end):
-				asm_fixups.append(object_fixups[fixup_index])
-				fixup_index += 1
+			if (not isinstance(asm, AsmRecord)):
+				logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, asm))
+				continue
+			asm_fixups = fixup_index.get_by_source(object["num"], asm.offset, asm.end)
 			if (len(asm_fixups) == 0):
 				continue
 
+			# Tokenize operands once per line (see AsmOperand)
+			operands = AsmOperand.parse_all(asm.arguments)
+
 			for fixup in asm_fixups:
 				access_size = None
 
@@ -2482,27 +3376,32 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 				# Check if target offset appears multiple times within disassembly line;
 				# If it does, we have to bail out as there is no way to distinguish the
 				# target offset from some other static number with the same value
-				if (len(re.findall("0x0*%x" % fixup["target offset"], asm["arguments"])) > 1):
-					logging.warning("Multiple matches for fixup target offset 0x%x: %s" % (fixup["target offset"], line))
+				# NOTE: values are matched exactly (regexes used before also matched
+				#       target offset as prefix of longer numbers, e.g. '0x502ef' in
+				#       'DWORD PTR ds:0x502ef00', yielding bogus access sizes)
+				matching_operands = [ index for (index, operand) in enumerate(operands) if (operand.has_value(fixup["target offset"])) ]
+				if (len(matching_operands) == 0):
 					continue
+				if (len(matching_operands) > 1):
+					logging.warning("Multiple matches for fixup target offset 0x%x: %s" % (fixup["target offset"], asm))
+					continue
+				index = matching_operands[0]
+				operand = operands[index]
 
-				# This explicitely tells us the access size of the reference
-				#match = re.search(r"([A-Z]+) PTR (?:[a-z]+:)?0x%x" % fixup["target offset"], asm["arguments"])
-				match = re.search(r"([A-Z]+) PTR (?:cs:|ds:|es:|fs:|gs:|ss:)?0x%x" % fixup["target offset"], asm["arguments"])
-				if (match):
-					access_size = match.group(1)
-					#logging.debug("Explicit (direct address): 0x%x == %s: %s" % (fixup["target offset"], access_size, line))
+				# This explicitely tells us the access size of the reference (e.g.
+				# 'DWORD PTR ds:0x24d1c')
+				if (operand.size != None and operand.memory and operand.base == None and operand.index == None):
+					access_size = operand.size
+					#logging.debug("Explicit (direct address): 0x%x == %s: %s" % (fixup["target offset"], access_size, asm))
 
 				# This explicitely tells us that the reference offset by a value (register
 				# in most cases) is accessed with a certain size -> with high probability,
 				# this tells us that the reference holds a *table* of access_size items
-				if (access_size == None):
-					#match = re.search(r"([A-Z]+) PTR (?:[a-z]+:)?\[.+0x%x\]" % fixup["target offset"], asm["arguments"])
-					match = re.search(r"([A-Z]+) PTR (?:cs:|ds:|es:|fs:|gs:|ss:)?\[.+0x%x\]" % fixup["target offset"], asm["arguments"])
-					if (match):
-						#access_size = match.group(1)
-						access_size = match.group(1) + "S"
-						#logging.debug("Explicit (indirect address): 0x%x == %s: %s" % (fixup["target offset"], access_size, line))
+				# (e.g. 'DWORD PTR [eax*4+0x24d1c]')
+				elif (operand.size != None and operand.memory):
+					#access_size = operand.size
+					access_size = operand.size + "S"
+					#logging.debug("Explicit (indirect address): 0x%x == %s: %s" % (fixup["target offset"], access_size, asm))
 
 				# This implicitely tells us the access size of the reference, since mov/cmp
 				# use same access size for source and destination
@@ -2510,11 +3409,11 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 				# !! WRONG !!, e.g. 'mov DWORD PTR ds:0x24d1c,0x24e68' -> '0x24e68' is
 				# just a value, it doesn't tell us anything about the data size of data
 				# at offset '0x24e68'
-				#if (access_size == None and (asm["command"] == "mov" or asm["command"] == "cmp")):
-				#	match = re.search(r"([A-Z]+) PTR", asm["arguments"])
-				#	if (match):
-				#		access_size = match.group(1)
-				#		logging.debug("Implicit (mov/cmp src/dst PTR): 0x%x == %s: %s" % (fixup["target offset"], access_size, line))
+				#elif (asm.command == "mov" or asm.command == "cmp"):
+				#	sizes = [ item.size for item in operands if (item.size != None) ]
+				#	if (len(sizes) > 0):
+				#		access_size = sizes[0]
+				#		logging.debug("Implicit (mov/cmp src/dst PTR): 0x%x == %s: %s" % (fixup["target offset"], access_size, asm))
 
 				# PUSH instruction
 				# Access size can be derived from opcode (see https://css.csail.mit.edu/
@@ -2522,51 +3421,32 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 				# NOTE: !! WRONG !!, just tells us if a byte/word/dword is being pushed,
 				#       but that just refers to the VALUE itself; tells us nothing about
 				#       the reference as no dereferencing takes place
-				#if (access_size == None and asm["command"] == "push"):
+				#elif (asm.command == "push"):
 				#	...
 
 				# This implicitely tells us the access size of the reference, based on the
 				# source/destination register being used for mov/cmp
 				# NOTE:
-				# Prefixed '<reg>:' before offset has to be mandatory here, e.g. 'mov ax,
-				# ds:0x4ade' tells us something because 'ds:...' is being dereferenced,
-				# whereas 'mov ax,0x4ade' only tells us that the VALUE '0x4ade' is a word,
-				# but that does not say anything about the reference as no dereferencing
-				# takes place
-
-				# NOTE: prefixed '<reg>:' before offset is MANDATORY here
-				if (access_size == None and (asm["command"] == "mov" or asm["command"] == "cmp")):
-					if (re.search(r"(eax|ebx|ecx|edx|esp|ebp|esi|edi),(cs:|ds:|es:|fs:|gs:|ss:)0x%x" % fixup["target offset"], asm["arguments"])):
-						access_size = "DWORD"
-					elif (re.search(r"(cs:|ds:|es:|fs:|gs:|ss:)0x%x,(eax|ebx|ecx|edx|esp|ebp|esi|edi)" % fixup["target offset"], asm["arguments"])):
-						access_size = "DWORD"
-					elif (re.search(r"(ax|bx|cx|dx|sp|bp|si|di),(cs:|ds:|es:|fs:|gs:|ss:)0x%x" % fixup["target offset"], asm["arguments"])):
-						access_size = "WORD"
-					elif (re.search(r"(cs:|ds:|es:|fs:|gs:|ss:)0x%x,(ax|bx|cx|dx|sp|bp|si|di)" % fixup["target offset"], asm["arguments"])):
-						access_size = "WORD"
-					elif (re.search(r"(al|ah|bl|bh|cl|ch|dl|dh),(cs:|ds:|es:|fs:|gs:|ss:)0x%x" % fixup["target offset"], asm["arguments"])):
-						access_size = "BYTE"
-					elif (re.search(r"(cs:|ds:|es:|fs:|gs:|ss:)0x%x,(al|ah|bl|bh|cl|ch|dl|dh)" % fixup["target offset"], asm["arguments"])):
-						access_size = "BYTE"
+				# Segment override before offset is MANDATORY here, e.g. 'mov ax,ds:0x4ade'
+				# tells us something because 'ds:...' is being dereferenced, whereas 'mov
+				# ax,0x4ade' only tells us that the VALUE '0x4ade' is a word, but that does
+				# not say anything about the reference as no dereferencing takes place
+				elif (operand.segment != None and operand.base == None and operand.index == None and (asm.command == "mov" or asm.command == "cmp")):
+					if (index > 0 and operands[index-1].register in AsmOperand.REGISTER_SIZES):
+						access_size = AsmOperand.REGISTER_SIZES[operands[index-1].register]
+					elif (index < len(operands) - 1 and operands[index+1].register in AsmOperand.REGISTER_SIZES):
+						access_size = AsmOperand.REGISTER_SIZES[operands[index+1].register]
 					#if (access_size != None):
-					#	logging.debug("Implicit (mov/cmp src/dst reg): 0x%x == %s: %s" % (fixup["target offset"], access_size, line))
-
-				# NOTE: prefixed '<reg>:' before offset is OPTIONAL here
-				#if (access_size == None and (asm["command"] == "mov" or asm["command"] == "cmp")):
-				#	if (re.search(r"(eax|ebx|ecx|edx|esp|ebp|esi|edi),(cs:|ds:|es:|fs:|gs:|ss:)?0x%x" % fixup["target offset"], asm["arguments"])):
-				#		access_size = "DWORD"
-				#	elif (re.search(r"(cs:|ds:|es:|fs:|gs:|ss:)?0x%x,(eax|ebx|ecx|edx|esp|ebp|esi|edi)" % fixup["target offset"], asm["arguments"])):
-				#		access_size = "DWORD"
-				#	elif (re.search(r"(ax|bx|cx|dx|sp|bp|si|di),(cs:|ds:|es:|fs:|gs:|ss:)?0x%x" % fixup["target offset"], asm["arguments"])):
-				#		access_size = "WORD"
-				#	elif (re.search(r"(cs:|ds:|es:|fs:|gs:|ss:)?0x%x,(ax|bx|cx|dx|sp|bp|si|di)" % fixup["target offset"], asm["arguments"])):
-				#		access_size = "WORD"
-				#	elif (re.search(r"(al|ah|bl|bh|cl|ch|dl|dh),(cs:|ds:|es:|fs:|gs:|ss:)?0x%x" % fixup["target offset"], asm["arguments"])):
-				#		access_size = "BYTE"
-				#	elif (re.search(r"(cs:|ds:|es:|fs:|gs:|ss:)?0x%x,(al|ah|bl|bh|cl|ch|dl|dh)" % fixup["target offset"], asm["arguments"])):
-				#		access_size = "BYTE"
+					#	logging.debug("Implicit (mov/cmp src/dst reg): 0x%x == %s: %s" % (fixup["target offset"], access_size, asm))
+
+				# NOTE: segment override before offset is OPTIONAL here
+				#elif (operand.base == None and operand.index == None and (asm.command == "mov" or asm.command == "cmp")):
+				#	if (index > 0 and operands[index-1].register in AsmOperand.REGISTER_SIZES):
+				#		access_size = AsmOperand.REGISTER_SIZES[operands[index-1].register]
+				#	elif (index < len(operands) - 1 and operands[index+1].register in AsmOperand.REGISTER_SIZES):
+				#		access_size = AsmOperand.REGISTER_SIZES[operands[index+1].register]
 				#	#if (access_size != None):
-				#	#	logging.debug("Implicit (mov/cmp src/dst reg): 0x%x == %s: %s" % (fixup["target offset"], access_size, line))
+				#	#	logging.debug("Implicit (mov/cmp src/dst reg): 0x%x == %s: %s" % (fixup["target offset"], access_size, asm))
 
 				# We were unable to determine an access size
 				if (access_size == None):
@@ -2575,15 +3455,15 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 
 				# Add access size to global associated with fixup
 				# NOTE: this requires that corresponding globals have already been added for fixup references
-				key = (fixup["target object"], fixup["target offset"])
-				if (not key in globals_map):
+				global_ = disasm["globals"].get(fixup["target object"], fixup["target offset"])
+				if (global_ == None):
 					logging.error("No corresponding global found for fixup: source object: %d, source offset: 0x%x, target object: %d, target offset: 0x%x" % (fixup["source object"], fixup["source offset"], fixup["target object"], fixup["target offset"]))
 					continue
-				if (not "access sizes" in globals_map[key]):
-					globals_map[key]["access sizes"] = []
-				if (access_size in globals_map[key]["access sizes"]):
+				if (not "access sizes" in global_):
+					global_["access sizes"] = []
+				if (access_size in global_["access sizes"]):
 					continue
-				globals_map[key]["access sizes"].append(access_size)
+				global_["access sizes"].append(access_size)
 				added_as += 1
 
 	logging.debug("Added %d access sizes for globals" % added_as)
@@ -2615,7 +3495,7 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	parent_nums = {} # putting this here guarantees consecutive naming across objects, which is very important for merging code + data later
 	for object in disasm["objects"]:
 		logging.info("Generating disassembly structure for object %d:" % object["num"])
-		object["disasm structure"] = []
+		object["disasm structure"] = DisasmStructure()
 
 		logging.debug("Adding object start...")
 		insert_structure_item(object["disasm structure"], OrderedDict([("type", "object start"), ("start", 0), ("end", object["size"]), ("length", object["size"]), ("name", "Object %d" % object["num"]), ("label", "object_%d" % object["num"]), ("objnum", object["num"])]))
@@ -2682,9 +3562,7 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 		added_total = 0
 		#incomplete_map = {}
 		sitem_global_map = {}
-		for global_ in disasm["globals"]:
-			if (global_["object"] != object["num"]):
-				continue
+		for global_ in disasm["globals"].get_for_object(object["num"]):
 			if (global_["type"] == "code"):
 				if (global_["source"] == "debug info"):
 					sitem = insert_structure_item(object["disasm structure"], OrderedDict([("type", "function"), ("start", global_["offset"]), ("end", None), ("length", None), ("name", global_["name"]), ("label", global_["name"]), ("source", global_["source"])]))
@@ -2819,7 +3697,7 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 				named_sitems += 1
 				if (id(sitem) in sitem_global_map):
 					global_ = sitem_global_map[id(sitem)]
-					global_["name"] = sitem["label"]
+					disasm["globals"].rename(global_, sitem["label"])
 					global_["module"] = module
 					named_globals += 1
 
@@ -2882,7 +3760,7 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	for object in [ item for item in disasm["objects"] if (item["type"] == "data") ]:
 
 		# Initialize data map with object item spanning accross all data
-		object["data map"] = [ OrderedDict([("start", 0), ("end", object["size"]), ("type", object["type"]), ("mode", "default"), ("source", "object")]) ]
+		object["data map"] = DataMap([ OrderedDict([("start", 0), ("end", object["size"]), ("type", object["type"]), ("mode", "default"), ("source", "object")]) ])
 
 		# Modules
 		for module in disasm["modules"]:
@@ -2995,8 +3873,11 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# Generate plain disassembly for data objects
 	logging.info("")
 	logging.info("Generating plain disassembly for data objects:")
-	for object in [ item for item in disasm["objects"] if (item["type"] == "data") ]:
-		generate_plain_disassembly(object)
+	generate_plain_disassembly([ item for item in disasm["objects"] if (item["type"] == "data") ])
+
+	# Log objdump cache statistics
+	if (objdump_cache != None):
+		objdump_cache.log_stats()
 
 
 	#
@@ -3009,63 +3890,22 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# Generate formatted dissassembly
 	# TODO: just a stub for now; generate_formatted_disassembly() needs to be rewritten/revised
 	# TODO: generates module maps needed to split formatted disassembly into separate files below for now; should be extracted and done separately
-	# TODO: this currently uses fixrel instead of preprocessed fixups; should use fixups if possible
 	logging.info("")
+	# NOTE: objects are processed by a pool of worker processes; formatted dis-
+	#       assembly is deduplicated right away (see below)
 	logging.info("Generating formatted disassembly for all objects:")
-	for object in disasm["objects"]:
-		generate_formatted_disassembly(object, disasm["globals"], fixrel)
+	#for object in disasm["objects"]:
+	#	generate_formatted_disassembly(object, disasm["globals"], fixrel)
+	dedup_indices = {}
+	with WorkerPool(jobs, (disasm["objects"], disasm["globals"], fixup_index), max_tasks=len(disasm["objects"])) as worker_pool:
+		tasks = [ worker_pool.submit(generate_formatted_deduped_disassembly, index) for index in range(0, len(disasm["objects"])) ]
+		for (object, task) in zip(disasm["objects"], tasks):
+			(object["disasm formatted"], object["module map"], object["disasm formatted deduped"], dedup_indices[object["num"]]) = task.result()
 
 
 	# Deduplicate data definitions in formatted disassembly
-	#
-	# NOTE: We do this here (and string-based rather than data-based) as it
-	#       turned out to be the much easier approach:
-	#
-	#       First try was data-based in generate_data_disassembly(); however,
-	#       data-based deduplication caused issues with labels being misplaced
-	#       afterwards (due to data being label-agnostic; would have required
-	#       additional object hints to fix), also would have required extending
-	#       code in several additional places (e.g. 'auto-strings' case)
-	#
-	#       String-based deduplication has many advantages, e.g. this deals
-	#       perfectly with lines where only comments differ (e.g. MK1, object
-	#       1, offsets 0x3084c + 0x30850 -> comments differ due to fixups and
-	#       thus lines are NOT deduplicated, which is exactly what we want in
-	#       this case); non-data lines (e.g. empty lines, comments, labels)
-	#       interrupt deduplication (e.g. MK1, object 2, offsets 0x4527c, 0x
-	#       45280 and 0x45284 -> same data, but NOT deduplicated due to non-
-	#       data lines interrupting in between, which is how it should be)
-	#
-	# CAUTION: Deduplication disturbs the lines ranges of formatted disassembly
-	#          used to split it into separate files (i.e. reconstructed source
-	#          files). Thus, the original unformatted disassembly (i.e. non-
-	#          deduplicated) MUST ALWAYS BE PRESERVED!
-	#
-	#logging.info("")
-	#logging.info("Deduplicating formatted disassembly for all objects:")
-
-	def generate_dup_line(line, asm, count):
-		# If we got duplicates, generate 'dx <count> dup(<value>)' line; if not,
-		# simply copy stored/tracked line as-is (below if clause)
-		if (count > 1):
-			# NOTE: correct hex data is not actually important at this stage, but
-			#       still nice to have nonetheless (same as trailing comment)
-			# NOTE: prevent very long lines by truncating hex display + appending
-			#       '..', e.g. '25bf8:  00 00 00 00 00 00 ..  db 1152 dup(0x00)'
-			#       -> way easier to read without losing any relevant information
-			#hex_str = str.join(" ", [ "%02x" % value for value in (asm["data"] * count) ])
-			hex_data = asm["data"] * count
-			if (len(hex_data) > 6):
-				hex_str = str.join(" ", [ "%02x" % value for value in hex_data[:6] ]) + " .."
-			else:
-				hex_str = str.join(" ", [ "%02x" % value for value in hex_data ])
-			line = "%8x:\t%-20s \t%-6s %s" % (asm["offset"], hex_str, asm["command"], "%d dup(%s)" % (count, asm["arguments"]))
-			if (asm["comment"] != None and asm["comment"] != ""):
-				# Using this instead of usual '%-100s%s' to ensure spacing between
-				# command/arguments and comments for very long lines
-				#line = "%-95s     %s" % (line, asm["comment"])
-				line = "%-100s%s" % (line, asm["comment"])
-		return line
+	# NOTE: see deduplicate_formatted_disassembly(); object disassembly is de-
+	#       duplicated right after formatting (see above)
 
 	#for object in []:		# may be used to disable deduplication for testing
 	#for object in disasm["objects"]:
@@ -3132,77 +3972,6 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	#	logging.debug("Size reduction: %d lines, %d bytes -> %d lines (%.02f%%), %d bytes (%.02f%%)" % (lines_before, bytes_before, lines_after, lines_after / lines_before * 100, bytes_after, bytes_after / bytes_before * 100))
 	#	object["disasm formatted"] = disassembly
 
-	# NOTE: Same as above, but turned into a function that can ALSO be used for
-	#       other kinds of formatted disassembly (i.e. for the slices that are
-	#       written to reconstructed source files below)
-	def deduplicate_formatted_disassembly(disasm_formatted):
-		disasm_deduped = []
-		dup_line = ""		# storage to track (potential) duplicates
-		dup_asm = OrderedDict()
-		dup_count = 0
-		#lines_saved = 0	# may be used to verify deduplication: len(deduplicated_disassembly) + lines_saved == len(original_disassembly)
-		for i in range(0, len(disasm_formatted)):
-			line = disasm_formatted[i]
-
-			# Empty lines, comment lines, label lines, label + comment(s) lines
-			# NOTE: labels can actually contain weird characters (e.g. '$', '?', '@', '.'
-			#       and braces in PACMANVR.EXE), so just regex for non-space and be done
-			#       with it
-			#if (not (line == "" or line.startswith(";") or re.match(r"^[a-zA-Z0-9_]+:(?:[ ]+;.+)?$", line))):
-			if (not (line == "" or line.startswith(";") or re.match(r"^[^ ]+:(?:[ ]+;.+)?$", line))):
-				asm = split_asm_line(line)
-				if (asm != None):
-					# We only want to track and deduplicate data definitions
-					if (asm["command"] in ("db", "dw", "dd", "df", "dq", "dt")):
-						# Currently tracking duplicates? If so, see below; If not, initialize
-						# duplicates tracking to current line and continue (below if clause)
-						if (dup_count > 0):
-							# Check if current line matches stored duplicates line; if it does, increase
-							# duplicates counter and continue; if it does not, dump duplicates, reset
-							# duplicates tracking to current line and continue (below if clause)
-							if (asm["data"] == dup_asm["data"] and asm["command"] == dup_asm["command"] and asm["arguments"] == dup_asm["arguments"] and asm["comment"] == dup_asm["comment"]): # everything except indent and offset must match for a line to be considered a duplicate of the previous line
-								dup_count += 1
-								#lines_saved += 1
-								continue
-							else:
-								disasm_deduped.append(generate_dup_line(dup_line, dup_asm, dup_count))
-						dup_line = line
-						dup_asm = asm
-						dup_count = 1
-						continue
-				else:
-					# Should never happen (bug if it does)
-					logging.warning("Invalid assembly line: line %d: '%s'" % (i+1, line))
-
-			# Currently tracking duplicates? If so, dump duplicates, disable duplicates
-			# tracking (as current line is non-data line) and copy current disassembly
-			# line as-is
-			if (dup_count > 0):
-				disasm_deduped.append(generate_dup_line(dup_line, dup_asm, dup_count))
-				dup_line = ""
-				dup_asm = OrderedDict()
-				dup_count = 0
-			disasm_deduped.append(line)
-
-		# If duplicates were tracked until the end of the for loop, dump them now
-		if (dup_count > 0):
-			disasm_deduped.append(generate_dup_line(dup_line, dup_asm, dup_count))
-
-		# Deduplication complete, calculated stats
-		# NOTE: MOVED this to loop that processes objects, placed right before
-		#       writing results to files
-		##logging.debug("Size reduction: %d lines, %d bytes -> %d lines, %d bytes (%d lines saved)" % (len(disasm_formatted), len(str.join(os.linesep, disasm_formatted)), len(disasm_deduped), len(str.join(os.linesep, disasm_deduped)), lines_saved))
-		#lines_before = len(disasm_formatted)
-		#bytes_before = len(str.join(os.linesep, disasm_formatted))
-		#lines_after = len(disasm_deduped)
-		#bytes_after = len(str.join(os.linesep, disasm_deduped))
-		##logging.debug("Size reduction: %d lines (%.02f%%), %d bytes (%.02f%%) -> %d lines (%.02f%%), %d bytes (%.02f%%)" % (lines_before, 100.00, bytes_before, 100.00, lines_after, lines_after / lines_before * 100, bytes_after, bytes_after / bytes_before * 100))
-		##logging.debug("Size reduction: %d lines, %d bytes -> %d lines (%.02f%%), %d bytes (%.02f%%)" % (lines_before, bytes_before, lines_after, lines_after / lines_before * 100, bytes_after, bytes_after / bytes_before * 100))
-		##logging.debug("Size reduction: %d lines (%.02f%%), %d bytes (%.02f%%) -> %d lines (%.02f%%), %d bytes (%.02f%%)" % (lines_before, 100.00, bytes_before, 100.00, lines_after, (lines_after / lines_before * 100) if (lines_before > 0) else 0, bytes_after, (bytes_after / bytes_before * 100) if (bytes_before > 0) else 0))
-		#logging.debug("Size reduction: %d lines, %d bytes -> %d lines (%.02f%%), %d bytes (%.02f%%)" % (lines_before, bytes_before, lines_after, (lines_after / lines_before * 100) if (lines_before > 0) else 0, bytes_after, (bytes_after / bytes_before * 100) if (bytes_before > 0) else 0))
-
-		# Return results (i.e. deduplicated disassembly)
-		return disasm_deduped
 
 
 	# Generate hints for assumed data portions of code objects
@@ -3317,32 +4086,40 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# NOTE: result (i.e. deduplicated formatted disassembly) is stored SEPARATELY
 	#       to NOT disturb splitting into separate files (i.e. reconstructed source
 	#       files) below, which relies on NON-DEDUPLICATED formatted disassembly)
+	# NOTE: deduplication itself is performed when generating formatted disas-
+	#       sembly (see above), only results are logged here
 	logging.info("")
 	logging.info("Deduplicating formatted disassembly of all objects:")
 	for object in disasm["objects"]:
 		logging.debug("Processing object %d..." % object["num"])
-		object["disasm formatted deduped"] = deduplicate_formatted_disassembly(object["disasm formatted"])
-		lines_before = len(object["disasm formatted"])
-		bytes_before = len(str.join(os.linesep, object["disasm formatted"]))
+		#object["disasm formatted deduped"] = deduplicate_formatted_disassembly(object["disasm formatted"])
+		lines_rendered = render_disassembly(object["disasm formatted"])
+		lines_before = len(lines_rendered)
+		bytes_before = len(str.join(os.linesep, lines_rendered))
 		lines_after = len(object["disasm formatted deduped"])
-		bytes_after = len(str.join(os.linesep, object["disasm formatted deduped"]))
+		bytes_after = len(str.join(os.linesep, render_disassembly(object["disasm formatted deduped"])))
 		lines_perc = (lines_after / lines_before * 100) if (lines_before > 0) else 100.0
 		bytes_perc = (bytes_after / bytes_before * 100) if (bytes_before > 0) else 100.0
 		logging.debug("Result: %d lines, %d bytes -> %d lines (%.02f%%), %d bytes (%.02f%%)" % (lines_before, bytes_before, lines_after, lines_perc, bytes_after, bytes_perc))
 
 
 	# Write results to files
+	# NOTE: disassemblies are lists of records (assembly lines) and strings
+	#       (labels, comments, empty lines), thus need to be rendered to text
+	#       first (shallow copies, records themselves are left untouched)
 	logging.info("")
 	logging.info("Writing disassembly results to files:")
 	files_written = 0
-	write_file(outfile_template % "disasm_data_all.txt", format_pprint(disasm))
+	objects_rendered = [ OrderedDict([ (key, render_disassembly(value) if (key in ("disasm plain", "disasm formatted", "disasm formatted deduped")) else value) for (key, value) in object.items() ]) for object in disasm["objects"] ]
+	disasm_rendered = OrderedDict([ (key, objects_rendered if (key == "objects") else list(value) if (key == "globals") else value) for (key, value) in disasm.items() ])
+	write_file(outfile_template % "disasm_data_all.txt", format_pprint(disasm_rendered))
 	#write_file(outfile_template % "disasm_data_objects.txt", format_pprint([OrderedDict([(key, value) for key, value in object_.items() if (not key.startswith("disasm"))]) for object_ in disasm["objects"]]))
-	write_file(outfile_template % "disasm_data_objects.txt", format_pprint(disasm["objects"]))
+	write_file(outfile_template % "disasm_data_objects.txt", format_pprint(objects_rendered))
 	write_file(outfile_template % "disasm_data_modules.txt", format_pprint(disasm["modules"]))
-	write_file(outfile_template % "disasm_data_globals.txt", format_pprint(disasm["globals"]))
+	write_file(outfile_template % "disasm_data_globals.txt", format_pprint(list(disasm["globals"])))
 	write_file(outfile_template % "disasm_data_fixups.txt", format_pprint(disasm["fixups"]))
 	files_written += 5
-	for object in disasm["objects"]:
+	for object in objects_rendered:
 		write_file(outfile_template % "disasm_object_%d_data_binary.bin" % object["num"], object["data"])
 		write_file(outfile_template % "disasm_object_%d_disassembly_structure.txt" % object["num"], format_pprint(object["disasm structure"]))
 		write_file(outfile_template % "disasm_object_%d_disassembly_plain.asm" % object["num"], object["disasm plain"])
@@ -3356,6 +4133,9 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	# Split formatted disassembly into separate files (based on module
 	# information, attempts to reconstruct original source files)
 	# NOTE: relies on module maps being generated by generate_formatted_disassembly()
+	# NOTE: modules are collected as slices of formatted disassembly of objects
+	#       and deduplicated using the deduplication indices of objects (i.e.
+	#       groups are not recomputed, see deduplicate_formatted_slices())
 	# TODO: use os.path.join() to generate paths instead of using os.path.sep
 	logging.info("")
 	logging.info("Splitting formatted disassembly into separate files:")
@@ -3365,13 +4145,16 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 	modules_library = 0
 	for module in disasm["modules"]:
 		output_module = []
+		output_module_len = 0
 		for object in disasm["objects"]:
 			if (not module["num"] in object["module map"]):
 				continue
 			for entry in object["module map"][module["num"]]:
-				if (len(output_module) > 0):
+				if (output_module_len > 0):
 					output_module.append("")
-				output_module += object["disasm formatted"][entry["start"]:entry["end"]]
+					output_module_len += 1
+				output_module.append((dedup_indices[object["num"]], entry["start"], entry["end"]))
+				output_module_len += len(range(*slice(entry["start"], entry["end"]).indices(len(object["disasm formatted"]))))
 		#file_name = ntpath.basename(module["name"])
 		file_name = module["name"].replace(":", "").replace("\\", os.path.sep) # recreate original folder structure; see https://github.com/fonic/wcdatool/issues/9#issuecomment-1140869764
 		if (not "." in file_name.lower()): # library modules just have names (i.e. no extension)
@@ -3381,14 +4164,14 @@ def disassemble_objects_gen2(wdump, fixrel, objdump_exec, outfile_template):
 		if (not file_name.lower().endswith(".asm")):
 			file_name += ".asm"
 		#logging.debug("File '%s'..." % file_name)
-		output_module = deduplicate_formatted_disassembly(output_module)
+		output_module = deduplicate_formatted_slices(output_module)
 		#write_file(outfile_template % "modules/%s" % file_name, output_module)
-		write_file(outfile_template % ("modules" + os.path.sep + file_name), output_module)
+		write_file(outfile_template % ("modules" + os.path.sep + file_name), render_disassembly(output_module))
 		modules_separate += 1
 	#logging.debug("File '%s'..." % "library.asm"))
-	output_library = deduplicate_formatted_disassembly(output_library)
+	output_library = deduplicate_formatted_slices(output_library)
 	#write_file(outfile_template % "modules/library.asm", output_library)
-	write_file(outfile_template % ("modules" + os.path.sep + "library.asm"), output_library)
+	write_file(outfile_template % ("modules" + os.path.sep + "library.asm"), render_disassembly(output_library))
 	logging.debug("Wrote %d modules to separate files" % modules_separate)
 	logging.debug("Wrote %d modules to 'library.asm'" % modules_library)
 
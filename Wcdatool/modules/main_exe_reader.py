@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Main Part Executable Reader                                            -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 06/20/19 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------
+#                                     -
+#  TODO                               -
+#                                     -
+# -------------------------------------
+
+# - Only LE executables are supported atm; LX executables use a different
+#   object page table format (page data offset + size instead of page number)
+#   and are only reported
+#
+# - Iterated pages (EXEPACK) are not decoded atm
+
+
+# -------------------------------------
+#                                     -
+#  Exports                            -
+#                                     -
+# -------------------------------------
+
+__all__ = [ "exe_read_structure", "exe_get_payload_offset", "exe_has_debug_info" ]
+
+
+# -------------------------------------
+#                                     -
+#  Imports                            -
+#                                     -
+# -------------------------------------
+
+import logging
+import mmap
+import struct
+from collections import OrderedDict
+from modules.module_miscellaneous import *
+from modules.module_pretty_print import *
+
+
+# -------------------------------------
+#                                     -
+#  Code                               -
+#                                     -
+# -------------------------------------
+
+# Header layouts: list of (key, struct format) tuples
+# NOTE:
+# Keys are named exactly like the keys produced by wdump_decode_data() from
+# wdump's output (i.e. wdump's labels, whitespace reduced, lowercase), thus
+# results can be used as drop-in replacement for wdump's sections
+
+# DOS EXE header (MZ), starting right after 'MZ' signature
+DOS_EXE_HEADER = [
+	("length of load module mod 200h", "H"),
+	("number of 200h pages in load module", "H"),
+	("number of relocation items", "H"),
+	("size of header in paragraphs", "H"),
+	("minimum number of paragraphs required above load mod", "H"),
+	("maximum number of paragraphs required above load mod", "H"),
+	("offset of stack segment in load module", "H"),
+	("initial value of sp", "H"),
+	("checksum", "H"),
+	("initial value of ip", "H"),
+	("offset of code segment within load module (segment)", "H"),
+	("file offset of first relocation item", "H"),
+	("overlay number", "H"),
+]
+
+# DOS/16M EXE header (BW), starting right after 'BW' signature
+# NOTE: only decoding DOS EXE style part + offset of next spliced .exp
+DOS16M_EXE_HEADER = [
+	("length of load module mod 200h", "H"),
+	("number of 200h pages in load module", "H"),
+	("reserved1", "H"),
+	("reserved2", "H"),
+	("min # of extra paragraphs needed", "H"),
+	("max # of extra paragraphs needed", "H"),
+	("initial ss", "H"),
+	("initial sp", "H"),
+	("first relocation item selector", "H"),
+	("initial ip", "H"),
+	("initial cs", "H"),
+	("runtime gdt size", "H"),
+	("makepm version", "H"),
+	("offset of possible next spliced .exp", "I"),
+]
+
+# Linear EXE header (LE), starting right after 'LE' signature
+LE_EXE_HEADER = [
+	("byte order (0==little endian, 1==big endian)", "B"),
+	("word order \" \"", "B"),
+	("linear exe format level", "I"),
+	("cpu type", "H"),
+	("os type (1==os/2, 2==windows, 3==dos4, 4==win386)", "H"),
+	("module version", "I"),
+	("module flags", "I"),
+	("# module pages", "I"),
+	("object # for initial eip", "I"),
+	("initial eip", "I"),
+	("object # for initial esp", "I"),
+	("initial esp", "I"),
+	("page size", "I"),
+	("last page size (le)/page shift (lx)", "I"),
+	("fixup section size", "I"),
+	("fixup section checksum", "I"),
+	("loader section size", "I"),
+	("loader section checksum", "I"),
+	("offset of object table", "I"),
+	("# of objects in module", "I"),
+	("offset of object page table", "I"),
+	("offset of iterated pages", "I"),
+	("offset of resource table", "I"),
+	("# of resource table entries", "I"),
+	("offset of resident name table", "I"),
+	("offset of entry table", "I"),
+	("offset of module directives table", "I"),
+	("# of module directives", "I"),
+	("offset of fixup page table", "I"),
+	("offset of fixup record table", "I"),
+	("offset of import module name table", "I"),
+	("# of entries in import module name table", "I"),
+	("offset of import procedure name table", "I"),
+	("offset of per-page checksum table", "I"),
+	("offset of enumerated data pages", "I"),
+	("# of pre-load pages", "I"),
+	("offset of non-resident names table", "I"),
+	("length of non-resident names table", "I"),
+	("non-resident names table checksum", "I"),
+	("object # for automatic data object", "I"),
+	("offset of debugging information", "I"),
+	("length of debugging information", "I"),
+	("# of instance pages in preload section", "I"),
+	("# of instance pages in demand load section", "I"),
+	("bytes on heap (16-bit apps only)", "I"),
+]
+
+# Object table entry (LE/LX)
+OBJECT_TABLE_ENTRY = [
+	("virtual memory size", "I"),
+	("relocation base address", "I"),
+	("object flag bits", "I"),
+	("object page table index", "I"),
+	("# of object page table entries", "I"),
+	("reserved", "I"),
+]
+
+# Object flags (bit -> name, lowercase like wdump_split_keyval() produces)
+OBJECT_FLAGS = [
+	(0x0001, "readable"),
+	(0x0002, "writeable"),
+	(0x0004, "executable"),
+	(0x0008, "resource"),
+	(0x0010, "discardable"),
+	(0x0020, "shared"),
+	(0x0040, "preload"),
+	(0x0080, "invalid"),
+	(0x0100, "zero filled"),
+	(0x0200, "resident"),
+	(0x0400, "resident long lockable"),
+	(0x1000, "alias16:16"),
+	(0x2000, "big"),
+	(0x4000, "conforming"),
+	(0x8000, "iopl"),
+]
+
+# Object page table entry flags (LE)
+PAGE_FLAGS_VALID = 0x00
+PAGE_FLAGS_ITERATED = 0x01
+PAGE_FLAGS_INVALID = 0x02
+PAGE_FLAGS_ZERO_FILLED = 0x03
+
+# Watcom debug info: master debug header is located at end of file, starts
+# with signature 0x8386 (14 bytes)
+DEBUG_HEADER_SIGNATURE = 0x8386
+DEBUG_HEADER_SIZE = 14
+
+
+# Build struct from header layout
+def make_struct(layout):
+	return struct.Struct("<" + str.join("", [ format_ for (_, format_) in layout ]))
+
+DOS_EXE_HEADER_STRUCT = make_struct(DOS_EXE_HEADER)
+DOS16M_EXE_HEADER_STRUCT = make_struct(DOS16M_EXE_HEADER)
+LE_EXE_HEADER_STRUCT = make_struct(LE_EXE_HEADER)
+OBJECT_TABLE_ENTRY_STRUCT = make_struct(OBJECT_TABLE_ENTRY)
+
+
+# Decode header at offset using layout + struct, returns OrderedDict
+def decode_header(data, offset, layout, struct_):
+	values = struct_.unpack_from(data, offset)
+	return OrderedDict([ (key, value) for ((key, _), value) in zip(layout, values) ])
+
+
+# Decode LE object table, object page table and object data
+# NOTE: offsets within data are relative to base (i.e. start of executable)
+def decode_object_table(data, base, header_offset, header):
+	objects = OrderedDict()
+	pages_num = header["# module pages"]
+	page_size = header["page size"]
+	last_page_size = header["last page size (le)/page shift (lx)"]
+	data_pages_offset = header["offset of enumerated data pages"]
+	for i in range(0, header["# of objects in module"]):
+		num = i + 1
+		entry = decode_header(data, base + header_offset + header["offset of object table"] + i * OBJECT_TABLE_ENTRY_STRUCT.size, OBJECT_TABLE_ENTRY, OBJECT_TABLE_ENTRY_STRUCT)
+		object = OrderedDict([("num", num)])
+		object.update(entry)
+		object["flags"] = [ name for (bit, name) in OBJECT_FLAGS if (entry["object flag bits"] & bit) ]
+		if (entry["# of object page table entries"] > 0):
+			object["pages"] = OrderedDict()
+		for page_num in range(entry["object page table index"], entry["object page table index"] + entry["# of object page table entries"]):
+			page_entry = base + header_offset + header["offset of object page table"] + (page_num - 1) * 4
+			map_page = (data[page_entry] << 16) | (data[page_entry+1] << 8) | data[page_entry+2]
+			page_flags = data[page_entry+3]
+			file_offset = data_pages_offset + (map_page - 1) * page_size
+			size = last_page_size if (map_page == pages_num) else page_size
+			page = OrderedDict([("num", page_num), ("map page", map_page), ("file offset", file_offset), ("flags", page_flags), ("valid", page_flags == PAGE_FLAGS_VALID), ("segments", OrderedDict())])
+			if (page_flags == PAGE_FLAGS_VALID):
+				page_data = data[base+file_offset:base+file_offset+size]
+				if (len(page_data) != size):
+					logging.warning("Object %d page %d: data length does not match page size (expected %d bytes, got %d bytes)" % (num, page_num, size, len(page_data)))
+			elif (page_flags == PAGE_FLAGS_ZERO_FILLED):
+				page_data = bytes(size)
+			else:
+				logging.warning("Object %d page %d: unsupported page type (flags: 0x%02x), skipping page data" % (num, page_num, page_flags))
+				page_data = None
+			if (page_data != None):
+				page["segments"][page_num] = OrderedDict([("num", page_num), ("offset", file_offset), ("data", page_data)])
+			object["pages"][page_num] = page
+		objects[num] = object
+	return objects
+
+
+# Decode LE fixup page table (page index -> offset within fixup record table)
+def decode_fixup_page_table(data, base, header_offset, header):
+	table_offset = base + header_offset + header["offset of fixup page table"]
+	count = header["# module pages"] + 1
+	values = struct.unpack_from("<%dI" % count, data, table_offset)
+	return OrderedDict([ (i, value) for (i, value) in enumerate(values) ])
+
+
+# Decode DOS EXE header and DOS/16M EXE header of executable starting at base,
+# returns sections (see exe_read_structure()) or None if data does not start
+# with a DOS executable
+def decode_dos_headers(data, base):
+	sections = OrderedDict()
+
+	# DOS EXE header; files starting with DOS/16M EXE header (e.g. payload
+	# extracted from executable with multiple spliced .exp files) do not
+	# have a DOS EXE header
+	if (data[base:base+2] == b"MZ"):
+		header = decode_header(data, base + 2, DOS_EXE_HEADER, DOS_EXE_HEADER_STRUCT)
+		sections["dos exe header"] = OrderedDict([("name", "DOS EXE Header"), ("data", header)])
+		load_module_end = header["number of 200h pages in load module"] * 0x200
+		if (header["length of load module mod 200h"] != 0):
+			load_module_end -= 0x200 - header["length of load module mod 200h"]
+		logging.debug("DOS EXE header: load module size: 0x%x" % load_module_end)
+	elif (data[base:base+2] == b"BW"):
+		load_module_end = 0
+	else:
+		return None
+
+	# DOS/16M EXE header (located right after DOS load module)
+	if (data[base+load_module_end:base+load_module_end+2] == b"BW"):
+		sections["dos/16m exe header - bw"] = OrderedDict([("name", "DOS/16M EXE Header - BW"), ("data", OrderedDict([("file offset", load_module_end)]))])
+		header = decode_header(data, base + load_module_end + 2, DOS16M_EXE_HEADER, DOS16M_EXE_HEADER_STRUCT)
+		sections["dos/16m exe header"] = OrderedDict([("name", "DOS/16M EXE Header"), ("data", header)])
+		logging.debug("DOS/16M EXE header: file offset: 0x%x, offset of next spliced .exp: 0x%x" % (load_module_end, header["offset of possible next spliced .exp"]))
+
+	return sections
+
+
+# Follows chain of spliced .exp files starting at offset (i.e. 'offset of
+# possible next spliced .exp' of DOS/16M EXE headers, which are absolute file
+# offsets) until a DOS executable without further spliced .exp is reached;
+# returns (offset of that executable, its sections (see decode_dos_headers()))
+# NOTE:
+# Chains may consist of multiple consecutive DOS/16M EXE headers (e.g. FATAL.
+# EXE: 0xf424 -> 0x126d4 -> 0x2beb4, HARVEST.EXE: 4 hops); raises Exception
+# if chain is broken or ends without DOS EXE header (i.e. without MZ/LE image)
+def resolve_spliced_exp_chain(data, offset):
+	while (True):
+		sections = decode_dos_headers(data, offset)
+		if (sections == None):
+			raise Exception("no 'MZ'/'BW' signature at offset 0x%x" % offset)
+		next_offset = dict_path_value(sections, "dos/16m exe header", "data", "offset of possible next spliced .exp")
+		if (next_offset == None or next_offset == 0):
+			break
+		if (next_offset <= offset or next_offset >= len(data)):
+			logging.warning("Invalid offset of next spliced .exp at offset 0x%x: 0x%x, ignoring" % (offset, next_offset))
+			break
+		logging.debug("Following spliced .exp: offset 0x%x -> offset 0x%x" % (offset, next_offset))
+		offset = next_offset
+	if (not "dos exe header" in sections):
+		raise Exception("chain of spliced .exp files ends without DOS EXE header (at offset 0x%x)" % offset)
+	return (offset, sections)
+
+
+# Reads structural data of executable (DOS EXE header, DOS/16M header, LE
+# header, object table incl. object data, fixup page table) directly from
+# input file, returns sections in the same format wdump_parse_output() does
+# (i.e. OrderedDict of name -> OrderedDict([("name", ...), ("data", ...)]))
+# or None on error
+# NOTE:
+# Like wdump, only the first DOS/16M header is decoded; for DOS/4G(W) bound
+# executables, the LE executable is the spliced payload (see 'offset of pos-
+# sible next spliced .exp' and exe_get_payload_offset()), which is read in
+# place by specifying its offset as base_offset. All file offsets in returned
+# sections are relative to base_offset (i.e. same as wdump run on payload)
+# NOTE:
+# If data at base_offset starts with a DOS/16M EXE header (i.e. part of a
+# chain of spliced .exp files), the chain is followed up to the MZ/LE image
+# (see resolve_spliced_exp_chain()) and offsets are relative to that image;
+# callers should pass the offset returned by exe_get_payload_offset(), which
+# already points to that image
+# NOTE:
+# Fixup records are decoded by fixup_relocation_read_decode(), which reads
+# the fixup tables from the input file using offsets of the LE header
+def exe_read_structure(input_file, outfile_template, base_offset=0):
+	logging.info("")
+	logging.info("Reading executable structure:")
+
+	sections = OrderedDict()
+	try:
+		logging.debug("Reading file '%s' (base offset 0x%x)..." % (input_file, base_offset))
+		with open(input_file, "rb") as infile, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+
+			# DOS EXE header, DOS/16M EXE header (follow chain of spliced .exp
+			# files if data starts with DOS/16M EXE header)
+			dos_sections = decode_dos_headers(data, base_offset)
+			if (dos_sections == None):
+				logging.error("Error: input file is not a DOS executable (no 'MZ'/'BW' signature at offset 0x%x)" % base_offset)
+				return None
+			if (not "dos exe header" in dos_sections):
+				try:
+					(base_offset, dos_sections) = resolve_spliced_exp_chain(data, base_offset)
+				except Exception as exception:
+					logging.error("Error: unsupported executable layout: %s" % str(exception))
+					return None
+				logging.debug("Reading executable at offset 0x%x (end of chain of spliced .exp files)" % base_offset)
+			sections.update(dos_sections)
+
+			# Linear EXE header (located via offset at 0x3c of DOS EXE header)
+			(header_offset, ) = struct.unpack_from("<I", data, base_offset + 0x3c)
+			signature = data[base_offset+header_offset:base_offset+header_offset+2] if (base_offset + header_offset + LE_EXE_HEADER_STRUCT.size + 2 <= len(data)) else b""
+			if (signature == b"LX"):
+				logging.warning("LX executables are not supported, skipping linear EXE header")
+			elif (signature == b"LE"):
+				header = OrderedDict([("file offset", header_offset)])
+				header.update(decode_header(data, base_offset + header_offset + 2, LE_EXE_HEADER, LE_EXE_HEADER_STRUCT))
+				sections["linear exe header (os/2 v2.x) - le"] = OrderedDict([("name", "Linear EXE Header (OS/2 V2.x) - LE"), ("data", header)])
+				logging.debug("Linear EXE header: file offset: 0x%x, objects: %d, pages: %d" % (header_offset, header["# of objects in module"], header["# module pages"]))
+
+				# Object table, object page table, object data
+				sections["object table"] = OrderedDict([("name", "Object Table"), ("data", decode_object_table(data, base_offset, header_offset, header))])
+				logging.debug("Object table: %d objects, %d bytes of page data" % (len(sections["object table"]["data"]), sum([ len(segment["data"]) for object in sections["object table"]["data"].values() for page in object.get("pages", {}).values() for segment in page["segments"].values() ])))
+
+				# Fixup page table
+				sections["fixup page table"] = OrderedDict([("name", "Fixup Page Table"), ("data", decode_fixup_page_table(data, base_offset, header_offset, header))])
+
+	except (OSError, ValueError, struct.error, IndexError) as exception:
+		logging.error("Error: failed to read executable structure: %s" % str(exception))
+		return None
+
+	# Print identified sections
+	logging.info("Identified sections:")
+	for section in sections:
+		logging.debug(sections[section]["name"])
+
+	# Write parsed structure to file (without hex dumps of object data, which
+	# would make up for almost all of the output and processing time)
+	output = format_pprint(sections, hex_dumps=False)
+	logging.info("Writing parsed structure to file (%d lines)..." % len(output))
+	write_file(outfile_template % "exe_structure_parsed.txt", output)
+
+	# Return results
+	return sections
+
+
+# Determines offset of DOS/4G(W) payload of bound executable (i.e. MZ/LE image
+# at end of chain of spliced .exp files, see resolve_spliced_exp_chain())
+# without running wdump, returns offset, 0 if executable is not bound or None
+# on error
+def exe_get_payload_offset(input_file):
+	try:
+		with open(input_file, "rb") as infile, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			if (decode_dos_headers(data, 0) == None):
+				logging.error("Error: input file is not a DOS executable (no 'MZ'/'BW' signature)")
+				return None
+			(offset, _) = resolve_spliced_exp_chain(data, 0)
+	except (OSError, ValueError, struct.error, IndexError) as exception:
+		logging.error("Error: failed to read DOS headers: %s" % str(exception))
+		return None
+	except Exception as exception:
+		logging.error("Error: unsupported executable layout: %s" % str(exception))
+		return None
+	return offset
+
+
+# Checks if executable contains Watcom debug info (i.e. master debug header
+# at end of file), returns True/False
+def exe_has_debug_info(input_file):
+	try:
+		with open(input_file, "rb") as infile:
+			infile.seek(0, 2)
+			if (infile.tell() < DEBUG_HEADER_SIZE):
+				return False
+			infile.seek(-DEBUG_HEADER_SIZE, 2)
+			(signature, ) = struct.unpack_from("<H", infile.read(DEBUG_HEADER_SIZE))
+	except OSError as exception:
+		logging.warning("Failed to check for debug info: %s" % str(exception))
+		return False
+	return (signature == DEBUG_HEADER_SIGNATURE)
@@ -36,8 +36,13 @@ __all__ = [ "fixup_relocation_read_decode" ]
 #                                     -
 # -------------------------------------
 
+import sys
 import logging
+import struct
+import itertools
+from array import array
 from collections import OrderedDict
+from collections.abc import Mapping
 from modules.module_miscellaneous import *
 from modules.module_pretty_print import *
 
@@ -78,6 +83,235 @@ def fixup_get_string(buffer, offset, length, name=None, encoding="ascii"):
 	# Return results
 	return (string, offset)
 
+# Keys of fixup record (dict view) preceding source offset / target data
+FIXUP_RECORD_HEADER_KEYS = ("num", "page", "offset start", "offset end", "size", "source flags", "source flags type", "source flags alias", "source flags list", "target flags", "target flags type", "target flags additive", "target flags reserved", "target flags offset type", "target flags additive type", "target flags obj/mod type", "target flags ordinal type", "source object")
+
+# Flags fields of fixup record: key -> (flags key, shift, mask)
+FIXUP_RECORD_FLAGS_FIELDS = {
+	"source flags type":          ("source flags", 0, 0x0f),	# mask -> value 0x00..0x08
+	"source flags alias":         ("source flags", 4, 0x01),	# flag -> if set, source refers to 16:16 alias
+	"source flags list":          ("source flags", 5, 0x01),	# flag -> if set, source offset field is byte containing number of source offsets, list of source offsets follows end of record (after optional additive value)
+	"target flags type":          ("target flags", 0, 0x03),	# mask -> value 0x00..0x03
+	"target flags additive":      ("target flags", 2, 0x01),	# flag -> if set, additive value follows end of record (before optional source offset list)
+	"target flags reserved":      ("target flags", 3, 0x01),	# flag -> must be zero
+	"target flags offset type":   ("target flags", 4, 0x01),	# flag -> if set, target offset is 32 bits, otherwise 16 bits
+	"target flags additive type": ("target flags", 5, 0x01),	# flag -> if set, additive value is 32 bits, otherwise 16 bits
+	"target flags obj/mod type":  ("target flags", 6, 0x01),	# flag -> if set, object number / module ordinal is 16 bits, otherwise 8 bits
+	"target flags ordinal type":  ("target flags", 7, 0x01),	# flag -> if set, ordinal number is 8 bits, otherwise 16 bits
+}
+
+# Columns of fixup record table: key -> array type code (values of records
+# that do not use a column are stored as 0)
+FIXUP_RECORD_COLUMNS = (("page", "I"), ("offset start", "I"), ("offset end", "I"), ("source flags", "B"), ("target flags", "B"), ("source offset", "h"), ("target object", "H"), ("target offset", "I"))
+
+# Layout of fixup record for combination of source flags and target flags,
+# i.e. struct for fixed-size part of record following flags bytes + keys of
+# dict view of record
+# NOTE:
+# Records are variable in size depending on flags, but all records sharing
+# the same flags have the same layout (except for source offset list, which
+# follows fixed-size part); layouts are compiled once per combination (see
+# fixup_get_record_layout()), executables typically only use a handful
+class FixupRecordLayout():
+
+	def __init__(self, source_flags, target_flags):
+		source_type = source_flags & 0x0f
+		self.source_list = (source_flags >> 5) & 0x01 == 1
+		self.target_type = target_flags & 0x03
+		obj_mod_format = "H" if ((target_flags >> 6) & 0x01 == 1) else "B"
+		offset_format = "I" if ((target_flags >> 4) & 0x01 == 1) else "H"
+		additive_format = "I" if ((target_flags >> 5) & 0x01 == 1) else "H"
+		additive_fields = [("target additive value", additive_format)] if ((target_flags >> 2) & 0x01 == 1) else []
+
+		# Source offset field: either byte containing number of source offset
+		# list entries or word (16 bits) containing source offset (NOTE: offset
+		# is signed!)
+		fields = [("source offset list length", "B")] if (self.source_list == True) else [("source offset", "h")]
+
+		# Target data: variable contents and sizes depending on target flags
+		if (self.target_type == 0x00):											# 0x00h = Internal reference
+			fields += [("target object", obj_mod_format)]
+			if (source_type != 0x02):											# 0x02h = 16-bit selector fixup
+				fields += [("target offset", offset_format)]
+		elif (self.target_type == 0x01):										# 01h = Imported reference by ordinal (NOTE: might be swapped with 0x02, documentation unclear on this)
+			fields += [("target module ordinal", obj_mod_format), ("target procedure name offset", offset_format)] + additive_fields
+		elif (self.target_type == 0x02):										# 02h = Imported reference by name (NOTE: might be swapped with 0x01, documentation unclear on this)
+			fields += [("target module ordinal", obj_mod_format), ("target import ordinal", "B" if ((target_flags >> 7) & 0x01 == 1) else offset_format)] + additive_fields
+		else:																	# 03h = Internal reference via entry table
+			fields += [("target entry ordinal", obj_mod_format)] + additive_fields
+
+		self.struct = struct.Struct("<" + str.join("", [ format for (_, format) in fields ]))
+		self.names = tuple([ name for (name, _) in fields ])
+		self.sizes = tuple([ struct.calcsize("<" + format) for (_, format) in fields ])
+
+		# Keys of dict view of record (same order as keys of dicts produced by
+		# previous decoder, i.e. order in which values were read / initialized)
+		if (self.source_list == True):
+			self.keys = FIXUP_RECORD_HEADER_KEYS + ("source offset list", "source offset list 2") + self.names
+		else:
+			self.keys = FIXUP_RECORD_HEADER_KEYS + ("source offset", "source offset 2") + self.names[1:]
+		self.key_set = frozenset(self.keys)
+
+		# Indices of values stored in table columns (None if not part of record)
+		# and names of values stored separately (see FixupRecordTable)
+		self.column_indices = tuple([ self.names.index(name) if (name in self.names) else None for name in ("source offset", "target object", "target offset") ])
+		self.extra_names = tuple([ name for name in self.names if (not name in ("source offset", "target object", "target offset")) ])
+		self.has_extra = (self.source_list == True or len(self.extra_names) > 0)
+
+	# Determine field that is incomplete for record data of given length at
+	# offset (i.e. offset of fixed-size part), returns (name, size, bytes left)
+	def get_missing_field(self, length, offset):
+		for (name, size) in zip(self.names, self.sizes):
+			if (offset + size > length):
+				return (name, size, length - offset)
+			offset += size
+		return (self.names[-1], self.sizes[-1], 0)
+
+# Compiled fixup record layouts: (source flags, target flags) -> layout
+fixup_record_layouts = {}
+
+# Get fixup record layout for combination of source flags and target flags
+def fixup_get_record_layout(source_flags, target_flags):
+	layout = fixup_record_layouts.get((source_flags, target_flags))
+	if (layout == None):
+		layout = fixup_record_layouts[(source_flags, target_flags)] = FixupRecordLayout(source_flags, target_flags)
+	return layout
+
+# Getters for values of dict view of fixup record: key -> function(table, index)
+def fixup_make_record_getters():
+	getters = {}
+	getters["num"] = lambda table, index: index + 1
+	getters["size"] = lambda table, index: table.columns["offset end"][index] - table.columns["offset start"][index]
+	for (key, (flags_key, shift, mask)) in FIXUP_RECORD_FLAGS_FIELDS.items():
+		getters[key] = lambda table, index, flags_key=flags_key, shift=shift, mask=mask: (table.columns[flags_key][index] >> shift) & mask
+	for (key, _) in FIXUP_RECORD_COLUMNS:
+		getters[key] = lambda table, index, key=key: table.columns[key][index]
+	getters["source object"] = lambda table, index: table.page_objects.get(table.columns["page"][index])
+	getters["source offset 2"] = lambda table, index: (table.columns["source offset"][index] + table.page_offsets[table.columns["page"][index]]) if (table.columns["page"][index] in table.page_offsets) else None
+	return getters
+FIXUP_RECORD_GETTERS = fixup_make_record_getters()
+
+# Fixup record table (compact storage of decoded fixup records)
+# NOTE:
+# Values of records are stored in typed arrays, one per column (see FIXUP_
+# RECORD_COLUMNS); values that only few records have (source offset lists,
+# imported references) are stored separately per record. Source objects and
+# object-relative source offsets are derived from per-page values (see set_
+# source_objects()). Records are numbered
+# consecutively starting at 1 (i.e. record number == index + 1). For compati-
+# bility, records may be accessed as read-only dicts via views (see Fixup-
+# RecordTableView, FixupRecord), which are created on access
+class FixupRecordTable():
+
+	def __init__(self):
+		self.columns = OrderedDict([ (key, array(type_code)) for (key, type_code) in FIXUP_RECORD_COLUMNS ])
+		self.extra = {}
+		self.page_objects = {}
+		self.page_offsets = {}
+
+	def __len__(self):
+		return len(self.columns["page"])
+
+	# Add record, returns index of record
+	def append(self, page, offset_start, offset_end, source_flags, target_flags, layout, values, source_offset_list):
+		columns = self.columns
+		index = len(columns["page"])
+		(source_offset_index, target_object_index, target_offset_index) = layout.column_indices
+		columns["page"].append(page)
+		columns["offset start"].append(offset_start)
+		columns["offset end"].append(offset_end)
+		columns["source flags"].append(source_flags)
+		columns["target flags"].append(target_flags)
+		columns["source offset"].append(values[source_offset_index] if (source_offset_index != None) else 0)
+		columns["target object"].append(values[target_object_index] if (target_object_index != None) else 0)
+		columns["target offset"].append(values[target_offset_index] if (target_offset_index != None) else 0)
+		if (layout.has_extra == True):
+			fields = dict(zip(layout.names, values))
+			extra = OrderedDict()
+			if (layout.source_list == True):
+				extra["source offset list"] = OrderedDict([ (i, value) for (i, value) in enumerate(source_offset_list, start=1) ])
+				extra["source offset list 2"] = OrderedDict()
+			for name in layout.extra_names:
+				extra[name] = fields[name]
+			self.extra[index] = extra
+		return index
+
+	# Get layout of record
+	def get_layout(self, index):
+		return fixup_get_record_layout(self.columns["source flags"][index], self.columns["target flags"][index])
+
+	# Set source objects of records and object offsets of records' parent pages
+	# (page num -> object num, page num -> object offset), i.e. rebase source
+	# offsets of all records from page-relative to object-relative at once
+	# NOTE: 'source object' and 'source offset 2' are derived from these on
+	#       access; source offset lists are rebased right away
+	def set_source_objects(self, page_objects, page_offsets):
+		self.page_objects = page_objects
+		self.page_offsets = page_offsets
+		pages = self.columns["page"]
+		for (index, extra) in self.extra.items():
+			if ("source offset list" in extra and pages[index] in page_offsets):
+				extra["source offset list 2"] = OrderedDict([ (i, value + page_offsets[pages[index]]) for (i, value) in extra["source offset list"].items() ])
+
+	# Get view of records (all records or range of indices)
+	def view(self, start=0, end=None):
+		return FixupRecordTableView(self, start, len(self) if (end == None) else end)
+
+# Dict view of range of fixup record table (record number -> record)
+class FixupRecordTableView(Mapping):
+
+	def __init__(self, table, start, end):
+		self.table = table
+		self.start = start
+		self.end = end
+
+	def __len__(self):
+		return self.end - self.start
+
+	def __iter__(self):
+		return iter(range(self.start + 1, self.end + 1))
+
+	def __contains__(self, num):
+		return isinstance(num, int) and self.start < num <= self.end
+
+	def __getitem__(self, num):
+		if (not num in self):
+			raise KeyError(num)
+		return FixupRecord(self.table, num - 1)
+
+	def values(self):
+		return [ FixupRecord(self.table, index) for index in range(self.start, self.end) ]
+
+# Dict view of single fixup record
+class FixupRecord(Mapping):
+
+	__slots__ = ("table", "index", "layout")
+
+	def __init__(self, table, index):
+		self.table = table
+		self.index = index
+		self.layout = table.get_layout(index)
+
+	def __len__(self):
+		return len(self.layout.keys)
+
+	def __iter__(self):
+		return iter(self.layout.keys)
+
+	def __contains__(self, key):
+		return key in self.layout.key_set
+
+	def __getitem__(self, key):
+		if (not key in self.layout.key_set):
+			raise KeyError(key)
+		getter = FIXUP_RECORD_GETTERS.get(key)
+		if (getter != None):
+			return getter(self.table, self.index)
+		return self.table.extra[self.index][key]
+
+	def __repr__(self):
+		return repr(OrderedDict(self.items()))
+
 # Read and decode fixup/relocation data
 # NOTE: we have to do this manually, i.e. by reading and decoding binary data directly from executable
 #       as wdump does not provide all necessary information (specifically mapping of fixup records to
@@ -136,7 +370,12 @@ def fixup_get_string(buffer, offset, length, name=None, encoding="ascii"):
 # is calculated and stored for each record (unsigned 32 bit value; relative
 # to object, i.e. basically 'absolute')
 #
-def fixup_relocation_read_decode(wdump, input_file, outfile_template):
+# NOTE:
+# File offsets of LE header are relative to the start of the executable; for
+# DOS/4G(W) bound executables read in place, base_offset specifies offset of
+# payload within input file (see exe_get_payload_offset())
+#
+def fixup_relocation_read_decode(wdump, input_file, outfile_template, base_offset=0):
 	logging.info("")
 	logging.info("Reading and decoding fixup/relocation data:")
 
@@ -179,8 +418,8 @@ def fixup_relocation_read_decode(wdump, input_file, outfile_template):
 	try:
 		logging.debug("Opening input file to read data...")
 		with open(input_file, "rb") as infile:
-			logging.debug("Seeking to offset 0x%x..." % fixup["file offset page table"])
-			infile.seek(fixup["file offset page table"])
+			logging.debug("Seeking to offset 0x%x..." % (base_offset + fixup["file offset page table"]))
+			infile.seek(base_offset + fixup["file offset page table"])
 			logging.debug("Reading fixup data...")
 			fixup["data total"] = infile.read(fixup["size total"])
 			if (len(fixup["data total"]) != fixup["size total"]):
@@ -207,22 +446,26 @@ def fixup_relocation_read_decode(wdump, input_file, outfile_template):
 	#       for page 1 in bytes 0x554..0x968, ...
 	# NOTE: by design, an additional entry (the last one) indicates end of fixup record table to facilitate offset calculation
 	#       mechanism (see for-loop below)
+	# NOTE: values are decoded in one step, then checked; decoding stops at first invalid value (same as reading values
+	#       one by one)
 	logging.debug("Decoding fixup page table...")
-	values = []
-	offset = 0
-	while (offset < len(fixup["data page table"])):
-		try:
-			(value, offset) = fixup_get_value(fixup["data page table"], offset, 4, "value")
-			if (len(values) > 0 and value < values[-1]):
-				logging.warning("Current value %d (0x%x) is less than last value %d (0x%x), aborting decode" % (value, value, values[-1], values[-1]))
-				break
-			if (value > len(fixup["data record table"])):
-				logging.warning("Value %d (0x%x) is out of bounds, aborting decode" % (value, value))
-				break
-			values.append(value)
-		except IndexError as indexerror:
-			logging.warning("Failed to read next %s (need %d bytes, left %d bytes), aborting decode" % (indexerror.args[0], indexerror.args[1], indexerror.args[2]))
+	data = fixup["data page table"]
+	values = array("I")
+	values.frombytes(data[:len(data) - len(data) % values.itemsize])
+	if (sys.byteorder == "big"):
+		values.byteswap()
+	for i in range(0, len(values)):
+		if (i > 0 and values[i] < values[i-1]):
+			logging.warning("Current value %d (0x%x) is less than last value %d (0x%x), aborting decode" % (values[i], values[i], values[i-1], values[i-1]))
+			del values[i:]
 			break
+		if (values[i] > len(fixup["data record table"])):
+			logging.warning("Value %d (0x%x) is out of bounds, aborting decode" % (values[i], values[i]))
+			del values[i:]
+			break
+	else:
+		if (len(data) % values.itemsize != 0):
+			logging.warning("Failed to read next %s (need %d bytes, left %d bytes), aborting decode" % ("value", values.itemsize, len(data) % values.itemsize))
 
 	# Construct fixup page table
 	# NOTE: as page table data is array of 32 bit offset, we need value[i] & value[i+1] for calculation in each iteration
@@ -233,10 +476,12 @@ def fixup_relocation_read_decode(wdump, input_file, outfile_template):
 		page_num += 1
 
 	# Decode fixup record table data, construct fixup record table
-	# NOTE: record table entries have variable sizes depending on certain bits in first two bytes of each entry
+	# NOTE: record table entries have variable sizes depending on certain bits in first two bytes of each entry (one byte
+	#       source flags, one byte target flags); fixed-size part following flags bytes is decoded using precompiled layout
+	#       for combination of flags (see FixupRecordLayout), records are stored in compact table (see FixupRecordTable);
+	#       fixup["record table"] and pte["records"] are dict views of (ranges of) table
 	logging.debug("Decoding fixup record table...")
-	fixup["record table"] = OrderedDict()
-	record_num = 1
+	records = FixupRecordTable()
 	for pte in fixup["page table"].values():
 
 		# Slice record data for current page
@@ -245,117 +490,84 @@ def fixup_relocation_read_decode(wdump, input_file, outfile_template):
 			logging.warning("Page %d record data length does not match size (expected %d bytes, got %d bytes)" % (i, pte["size"], len(pte["data"])))
 
 		# Decode record data for current page
-		pte["records"] = OrderedDict()
+		data = pte["data"]
+		data_len = len(data)
+		records_start = len(records)
+		record_num = records_start + 1
 		offset = 0
-		while (offset < len(pte["data"])):
+		while (offset < data_len):
 			try:
-				# New record table entry
-				rte = OrderedDict([("num", record_num), ("page", pte["num"]), ("offset start", offset), ("offset end", offset), ("size", 0)])
-
-				# Read and decode flags bytes											# two bytes: one byte source flags, one byte target flags
-				(rte["source flags"], offset) = fixup_get_value(pte["data"], offset, 1, "source flags")
-				rte["source flags type"] = rte["source flags"] & 0x0f					# mask -> value 0x00..0x08
-				rte["source flags alias"] = (rte["source flags"] >> 4) & 0x01			# flag -> if set, source refers to 16:16 alias
-				rte["source flags list"] = (rte["source flags"] >> 5) & 0x01			# flag -> if set, source offset field is byte containing number of source offsets, list of source offsets follows end of record (after optional additive value)
-
-				(rte["target flags"], offset) = fixup_get_value(pte["data"], offset, 1, "target flags")
-				rte["target flags type"] = rte["target flags"] & 0x03					# mask -> value 0x00..0x03
-				rte["target flags additive"] = (rte["target flags"] >> 2) & 0x01		# flag -> if set, additive value follows end of record (before optional source offset list)
-				rte["target flags reserved"] = (rte["target flags"] >> 3) & 0x01		# flag -> must be zero
-				rte["target flags offset type"] = (rte["target flags"] >> 4) & 0x01		# flag -> if set, target offset is 32 bits, otherwise 16 bits
-				rte["target flags additive type"] = (rte["target flags"] >> 5) & 0x01	# flag -> if set, additive value is 32 bits, otherwise 16 bits
-				rte["target flags obj/mod type"] = (rte["target flags"] >> 6) & 0x01	# flag -> if set, object number / module ordinal is 16 bits, otherwise 8 bits
-				rte["target flags ordinal type"] = (rte["target flags"] >> 7) & 0x01	# flag -> if set, ordinal number is 8 bits, otherwise 16 bits
-
-				# Add source object number
-				rte["source object"] = None												# not part of record data, will be filled when processing objects/pages/segments below; initialized here for dict order
-
-				# Read source offset field												# either byte containing number of source offset list entries or word (16 bits) containing source offset (NOTE: offset is signed!)
-				if (rte["source flags list"] == 1):
-					rte["source offset list"] = OrderedDict()							# will be filled after 'read target data'; initialized here for dict order
-					rte["source offset list 2"] = OrderedDict()							# not part of record data, will be filled when processing objects/pages/segments below; initialized here for dict order
-					(rte["source offset list length"], offset) = fixup_get_value(pte["data"], offset, 1, "source offset list length")
-				else:
-					(rte["source offset"], offset) = fixup_get_value(pte["data"], offset, 2, "source offset", signed=True)
-					rte["source offset 2"] = None										# not part of record data, will be filled when processing objects/pages/segments below; initialized here for dict order
-
-				# Read target data														# variable contents and sizes depending on target flags
-				if (rte["target flags type"] == 0x00):									# 0x00h = Internal reference
-					(rte["target object"], offset) = fixup_get_value(pte["data"], offset, 2, "target object") if (rte["target flags obj/mod type"] == 1) else fixup_get_value(pte["data"], offset, 1, "target object")
-					if (rte["source flags type"] != 0x02):								# 0x02h = 16-bit selector fixup
-						(rte["target offset"], offset) = fixup_get_value(pte["data"], offset, 4, "target offset") if (rte["target flags offset type"] == 1) else fixup_get_value(pte["data"], offset, 2, "target offset")
-				elif (rte["target flags type"] == 0x01):								# 01h = Imported reference by ordinal (NOTE: might be swapped with 0x02, documentation unclear on this)
-					logging.warning("First time target flags type %d (0x%x) is encountered, testing/debugging required" % (rte["target flags type"], rte["target flags type"]))
-					(rte["target module ordinal"], offset) = fixup_get_value(pte["data"], offset, 2, "target module ordinal") if (rte["target flags obj/mod type"] == 1) else fixup_get_value(pte["data"], offset, 1, "target module ordinal")
-					(rte["target procedure name offset"], offset) = fixup_get_value(pte["data"], offset, 4, "target procedure name offset") if (rte["target flags offset type"] == 1) else fixup_get_value(pte["data"], offset, 2, "target procedure name offset")
-					if (rte["target flags additive"] == 1):
-						(rte["target additive value"], offset) = fixup_get_value(pte["data"], offset, 4, "target additive value") if (rte["target flags additive type"] == 1) else fixup_get_value(pte["data"], offset, 2, "target additive value")
-				elif (rte["target flags type"] == 0x02):								# 02h = Imported reference by name (NOTE: might be swapped with 0x01, documentation unclear on this)
-					logging.warning("First time target flags type %d (0x%x) is encountered, testing/debugging required" % (rte["target flags type"], rte["target flags type"]))
-					(rte["target module ordinal"], offset) = fixup_get_value(pte["data"], offset, 2, "target module ordinal") if (rte["target flags obj/mod type"] == 1) else fixup_get_value(pte["data"], offset, 1, "target module ordinal")
-					(rte["target import ordinal"], offset) = fixup_get_value(pte["data"], offset, 1, "target import ordinal") if (rte["target flags ordinal type"] == 1) else fixup_get_value(pte["data"], offset, 4, "target import ordinal") if (rte["target flags offset type"] == 1) else fixup_get_value(pte["data"], offset, 2, "target import ordinal")
-					if (rte["target flags additive"] == 1):
-						(rte["target additive value"], offset) = fixup_get_value(pte["data"], offset, 4, "target additive value") if (rte["target flags additive type"] == 1) else fixup_get_value(pte["data"], offset, 2, "target additive value")
-				elif (rte["target flags type"] == 0x03):								# 03h = Internal reference via entry table
-					logging.warning("First time target flags type %d (0x%x) is encountered, testing/debugging required" % (rte["target flags type"], rte["target flags type"]))
-					(rte["target entry ordinal"], offset) = fixup_get_value(pte["data"], offset, 2, "target entry ordinal") if (rte["target flags obj/mod type"] == 1) else fixup_get_value(pte["data"], offset, 1, "target entry ordinal")
-					if (rte["target flags additive"] == 1):
-						(rte["target additive value"], offset) = fixup_get_value(pte["data"], offset, 4, "target additive value") if (rte["target flags additive type"] == 1) else fixup_get_value(pte["data"], offset, 2, "target additive value")
-				else:
-					logging.warning("Page %d, record %d: invalid target type: %d (0x%x), aborting decode" % (pte["num"], record_num, rte["target flags type"], rte["target flags type"]))
-					break
-
-				# Read source offset list												# list of words (16 bits), only present if corresponding flag in source flags is set (NOTE: offsets are signed!)
-				if (rte["source flags list"] == 1):
-					rte["source offset list"] = OrderedDict()
-					for i in range(1, rte["source offset list length"]+1):
-						(rte["source offset list"][i], offset) = fixup_get_value(pte["data"], offset, 2, "source offset list entry %d" % i, signed=True)
-
-				# Calculate end/size
-				rte["offset end"] = offset
-				rte["size"] = rte["offset end"] - rte["offset start"]
-
-				# Store record table entry
-				fixup["record table"][record_num] = rte
-				pte["records"][record_num] = rte
+				# Read flags bytes, look up layout of record
+				if (offset + 2 > data_len):
+					raise IndexError("target flags", 1, data_len - offset - 1)
+				source_flags = data[offset]
+				target_flags = data[offset+1]
+				layout = fixup_get_record_layout(source_flags, target_flags)
+				if (layout.target_type != 0x00):
+					logging.warning("First time target flags type %d (0x%x) is encountered, testing/debugging required" % (layout.target_type, layout.target_type))
+
+				# Read fixed-size part of record
+				if (offset + 2 + layout.struct.size > data_len):
+					raise IndexError(*layout.get_missing_field(data_len, offset + 2))
+				values = layout.struct.unpack_from(data, offset + 2)
+				record_end = offset + 2 + layout.struct.size
+
+				# Read source offset list								# list of words (16 bits), only present if corresponding flag in source flags is set (NOTE: offsets are signed!)
+				source_offset_list = ()
+				if (layout.source_list == True):
+					count = values[0]
+					if (record_end + count * 2 > data_len):
+						num = (data_len - record_end) // 2 + 1
+						raise IndexError("source offset list entry %d" % num, 2, data_len - record_end - (num - 1) * 2)
+					source_offset_list = struct.unpack_from("<%dh" % count, data, record_end)
+					record_end += count * 2
+
+				# Store record
+				records.append(pte["num"], offset, record_end, source_flags, target_flags, layout, values, source_offset_list)
 				record_num += 1
+				offset = record_end
 
 			except IndexError as indexerror:
 				logging.warning("Page %d, record %d: failed to read %s (need %d bytes, left %d bytes), aborting decode" % (pte["num"], record_num, indexerror.args[0], indexerror.args[1], indexerror.args[2]))
 				break
 
+		pte["records"] = records.view(records_start, len(records))
+	fixup["record table"] = records.view()
+
 	# Process fixup records and calculate source offset(s) relative to parent object
 	# NOTE: we do this because source offsets in fixup records are by design relative to their parent page, which is of no
 	#       use to us in the further process
 	# NOTE: pages are already numbered correctly in wdump data, e.g. object 1 has pages numbered 1..60, object 2 has pages
 	#       numbered  61..130 -> page["num"] can be used
+	# NOTE: offsets of pages relative to their parent object are calculated once per object (prefix sum of page sizes), then
+	#       applied to all records in one pass over the record table
 	logging.debug("Calculating source offsets relative to parent object...")
 	if (dict_path_exists(wdump, "object table", "data")):
+		page_objects = {}
+		page_offsets = {}
 		for object in wdump["object table"]["data"].values():
 			if (not "pages" in object):
 				logging.warning("Object %d has no pages" % (object["num"]))
 				continue
-			object_offset = 0
+			page_sizes = []
 			for page in object["pages"].values():
-				if (dict_path_exists(fixup, "page table", page["num"], "records")):
-					for rte in fixup["page table"][page["num"]]["records"].values():
-						rte["source object"] = object["num"]
-						if ("source offset" in rte):
-							rte["source offset 2"] = rte["source offset"] + object_offset
-						if ("source offset list" in rte):
-							rte["source offset list 2"] = OrderedDict()
-							for i in range(1, len(rte["source offset list"])+1):
-								rte["source offset list 2"][i] = rte["source offset list"][i] + object_offset
-				else:
+				if (not dict_path_exists(fixup, "page table", page["num"], "records")):
 					logging.warning("Object %d page %d has no fixup records" % (object["num"], page["num"]))
+				page_size = 0
 				if (not "segments" in page):
 					logging.warning("Object %d page %d has no segments" % (object["num"], page["num"]))
-					continue
-				for segment in page["segments"].values():
-					if (not "data" in segment):
-						logging.warning("Object %d page %d segment %d has no data" % (object["num"], page["num"], segment["num"]))
-						continue
-					object_offset += len(segment["data"])
+				else:
+					for segment in page["segments"].values():
+						if (not "data" in segment):
+							logging.warning("Object %d page %d segment %d has no data" % (object["num"], page["num"], segment["num"]))
+							continue
+						page_size += len(segment["data"])
+				page_sizes.append(page_size)
+			for (page, object_offset) in zip(object["pages"].values(), itertools.accumulate(page_sizes, initial=0)):
+				if (page["num"] in fixup["page table"]):
+					page_objects[page["num"]] = object["num"]
+					page_offsets[page["num"]] = object_offset
+		records.set_source_objects(page_objects, page_offsets)
 	else:
 		logging.warning("Object table empty, skipping calculation")
 
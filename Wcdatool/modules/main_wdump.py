@@ -27,7 +27,7 @@
 #                                     -
 # -------------------------------------
 
-__all__ = [ "wdump_parse_output" ]
+__all__ = [ "wdump_parse_output", "wdump_verify_object_table" ]
 
 
 # -------------------------------------
@@ -39,7 +39,11 @@ __all__ = [ "wdump_parse_output" ]
 import logging
 import re
 import subprocess
-from collections import OrderedDict
+import itertools
+import hashlib
+import mmap
+import struct
+from collections import OrderedDict, deque
 from modules.module_miscellaneous import *
 from modules.module_pretty_print import *
 
@@ -66,7 +70,119 @@ def wdump_split_keyval(line):
 		return key, value
 	return None, None
 
+# Section separator of wdump output (line following name of section)
+WDUMP_SECTION_SEPARATOR = "=" * 78
+
+# Sections whose data is kept as original lines (instead of normalized lines,
+# i.e. whitespace reduced to single spaces), as decoders need original lines
+WDUMP_ORIGINAL_LINES_SECTIONS = ("Object Table", "Resident Names Table", "Nonresident Names Table")
+
+# Section of wdump output, decoded on demand
+# NOTE:
+# Section data (normalized lines, see wdump_split_sections()) is decoded by
+# wdump_decode_data() when it is accessed for the first time (i.e. section
+# ["data"], section.get("data"), section.values(), section.items()); if set,
+# post-decode function is called once right after that (e.g. to read object
+# data for object table, see wdump_parse_output())
+class WdumpSection(OrderedDict):
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.decoded = False
+		self.post_decode = None
+
+	# Append line to section data (without triggering decoding)
+	def append_line(self, line):
+		super().__getitem__("data").append(line)
+
+	# Decode section data (if not decoded yet), call post-decode function (if
+	# set); flag/function are updated first and post-decode function is held
+	# back while decoding, as both access section data themselves
+	def decode(self):
+		if (self.decoded == False):
+			self.decoded = True
+			(post_decode, self.post_decode) = (self.post_decode, None)
+			wdump_decode_data(self)
+			self.post_decode = post_decode
+		if (self.post_decode != None):
+			(function, args) = self.post_decode
+			self.post_decode = None
+			function(*args)
+		return self
+
+	def __getitem__(self, key):
+		if (key == "data"):
+			self.decode()
+		return super().__getitem__(key)
+
+	def get(self, key, default=None):
+		if (key == "data"):
+			self.decode()
+		return super().get(key, default)
+
+	def values(self):
+		self.decode()
+		return super().values()
+
+	def items(self):
+		self.decode()
+		return super().items()
+
+	# Pickle support (see SectionCache); default implementation of OrderedDict
+	# uses items(), which would decode section data
+	def __reduce__(self):
+		return (self.__class__, (), self.__dict__.copy(), None, iter(list(super().items())))
+
+# Passes through lines of wdump output read from pipe, writes lines to (plain
+# output) file, keeps last lines in tail (for error reporting)
+def wdump_tee_lines(lines, file, tail):
+	for line in lines:
+		file.write(line)
+		tail.append(line.rstrip("\n"))
+		yield line
+
+# Splits wdump output into sections, yields each section as soon as it is
+# complete (i.e. as soon as next section starts or output ends)
+# NOTE: lines may be any iterable of lines (file object, pipe, list); each
+#       line is normalized exactly once, names of sections are detected using
+#       one-line lookahead buffer (line followed by separator line)
+# NOTE: empty lines and separator lines are dropped; section data consists of
+#       normalized lines (except for WDUMP_ORIGINAL_LINES_SECTIONS); sections
+#       are not decoded yet (see WdumpSection)
+def wdump_split_sections(lines):
+	section = None
+	keep_original = False
+	pending = None
+	for line in itertools.chain(lines, (None, )):
+		if (line != None):
+			line = line.rstrip("\n")
+			line2 = str.join(" ", line.split())
+		else:
+			line2 = None
+
+		# Process pending line (new section if current line is separator line)
+		if (pending != None):
+			(pending_line, pending_line2) = pending
+			if (line2 == WDUMP_SECTION_SEPARATOR):
+				if (section != None):
+					yield section
+				section = WdumpSection([("name", pending_line2), ("data", [])])
+				keep_original = section["name"].startswith(WDUMP_ORIGINAL_LINES_SECTIONS)
+			elif (section == None):
+				logging.warning("Stray line: '%s'" % pending_line)
+			else:
+				section.append_line(pending_line if (keep_original) else pending_line2)
+			pending = None
+
+		# Buffer current line (skip empty/whitespace-only lines and separator lines)
+		if (line2 != None and line2 != "" and line2 != WDUMP_SECTION_SEPARATOR):
+			pending = (line, line2)
+
+	if (section != None):
+		yield section
+
 # Decodes wdump section data
+# NOTE: section data consists of normalized lines (see wdump_split_sections())
 def wdump_decode_data(section):
 
 	#                                 DOS EXE Header
@@ -90,8 +206,7 @@ def wdump_decode_data(section):
 	#
 	if (section["name"].startswith("DOS EXE Header")):
 		decoded_data = OrderedDict()
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 			if (line2 == "segment:offset" or line2 == "load module ="):
 				break
 			key, value = wdump_split_keyval(line2)
@@ -134,8 +249,7 @@ def wdump_decode_data(section):
 	# NOTE: everything after 'GDT selectors:' is ignored
 	elif (section["name"].startswith("DOS/16M EXE Header")):
 		decoded_data = OrderedDict()
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 			if (line2 == "GDT selectors:"):
 				break
 			if (line2.startswith("original name:")):
@@ -159,8 +273,7 @@ def wdump_decode_data(section):
 	#
 	elif (section["name"].startswith("Linear EXE Header (OS/2 V2.x) - LE")):
 		decoded_data = OrderedDict()
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 			key, value = wdump_split_keyval(line2)
 			if (key != None and value != None):
 				decoded_data[key] = value
@@ -199,6 +312,22 @@ def wdump_decode_data(section):
 		current_page = None
 		current_segment = None
 		for line in section["data"]:
+
+			# Segment data (NOTE: matching against original line here to correctly capture hex data)
+			# NOTE: hex data is only collected here; segment data is read from input
+			#       file, hex data is only decoded for verification / as fallback (see
+			#       wdump_read_object_data())
+			# NOTE: checked first as hex dump lines make up for almost all lines of
+			#       this section; only other lines are normalized
+			match = re.match(r"^([0-9a-fA-F]+):  ([0-9a-fA-F ]+)    (.{16})$", line)
+			if (match):
+				if (current_segment == None):
+					logging.warning("Stray segment data: '%s'" % line)
+					continue
+				#hexdata = str.join(" ", match.group(2).split())
+				#current_segment["data"] += bytes.fromhex(hexdata)
+				current_segment["hex data"].append(match.group(2))
+				continue
 			line2 = str.join(" ", line.split())
 
 			# Skip '='-only lines
@@ -235,20 +364,11 @@ def wdump_decode_data(section):
 				#current_page["segments"].append( { "num": int(match.group(1)), "offset": int(match.group(2), 16), "data": b'' } )
 				#current_segment = current_page["segments"][-1]
 				num = int(match.group(1))
-				current_page["segments"][num] = OrderedDict([("num", num), ("offset", int(match.group(2), 16)), ("data", b'')])
+				#current_page["segments"][num] = OrderedDict([("num", num), ("offset", int(match.group(2), 16)), ("data", b'')])
+				current_page["segments"][num] = OrderedDict([("num", num), ("offset", int(match.group(2), 16)), ("hex data", [])])
 				current_segment = current_page["segments"][num]
 				continue
 
-			# Segment data (NOTE: matching against original line here to correctly capture hex data)
-			match = re.match(r"^([0-9a-fA-F]+):  ([0-9a-fA-F ]+)    (.{16})$", line)
-			if (match):
-				if (current_segment == None):
-					logging.warning("Stray segment data: '%s'" % line2)
-					continue
-				hexdata = str.join(" ", match.group(2).split())
-				current_segment["data"] += bytes.fromhex(hexdata)
-				continue
-
 			# Object data
 			if (current_object == None):
 				logging.warning("Stray object data: '%s'" % line2)
@@ -276,8 +396,7 @@ def wdump_decode_data(section):
 	#
 	elif (section["name"].startswith("Fixup Page Table")):
 		decoded_data = OrderedDict()
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 			for data in line2.split(" "):
 				data = data.split(":")
 				if (len(data) != 2):
@@ -298,8 +417,7 @@ def wdump_decode_data(section):
 	# NOTE: not sure if source type, target flags and object # are decimal or hex; all decimal for now
 	elif (section["name"].startswith("Fixup Record Table")):
 		decoded_data = []
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 
 			match = re.match(r"^([0-9]+) ([0-9]+) src off = ([0-9a-fA-F ]+) object # = ([0-9]+) target off = ([0-9a-fA-F ]+)$", line2)
 			if (match):
@@ -343,15 +461,14 @@ def wdump_decode_data(section):
 		decoded_data = OrderedDict()
 		target = decoded_data
 		for i in range(0, len(section["data"])):
-			line = section["data"][i]
-			line2 = str.join(" ", line.split())
+			line2 = section["data"][i]
 
 			# Skip '='-only lines
 			if (re.match(r"^[=]+$", line2)):
 				continue
 
 			# Handle subsections
-			if (i < len(section["data"])-1 and re.match(r"^[=]+$", str.join(" ", section["data"][i+1].split()))):
+			if (i < len(section["data"])-1 and re.match(r"^[=]+$", section["data"][i+1])):
 				if (line2 == "Languages"):
 					decoded_data["languages"] = []
 					target = decoded_data["languages"]
@@ -432,8 +549,7 @@ def wdump_decode_data(section):
 		decoded_data = OrderedDict()
 		current_module = None
 		skip_until_next_module = False
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 
 			# Skip subsections '*** Locals ***', '*** Types ***' and '*** Line Numbers ***'
 			if (line2 == "*** Locals ***" or line2 == "*** Types ***" or line2 == "*** Line Numbers ***"):
@@ -488,8 +604,7 @@ def wdump_decode_data(section):
 	elif (section["name"].startswith("Global Info")):
 		decoded_data = []
 		current_global = None
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 
 			# New global
 			match = re.match(r"^Name: (.+)$", line2)
@@ -545,8 +660,7 @@ def wdump_decode_data(section):
 	elif (section["name"].startswith("Addr Info")):
 		decoded_data = []
 		current_block = None
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 
 			# New block
 			match = re.match(r"^Base: fileoff = ([0-9a-fA-F]+)H seg = ([0-9a-fA-F]+)H, off = ([0-9a-fA-F]+)H$", line2)
@@ -595,8 +709,7 @@ def wdump_decode_data(section):
 	elif (section["name"].startswith("Object Hints")):
 		decoded_data = OrderedDict()
 		current_block = None
-		for line in section["data"]:
-			line2 = str.join(" ", line.split())
+		for line2 in section["data"]:
 
 			# Comment
 			if (line2.startswith("#")):
@@ -690,97 +803,259 @@ def wdump_decode_data(section):
 	# Replace section data with decoded data
 	section["data"] = decoded_data
 
+# Reads object data (i.e. data of object pages) directly from input file at
+# page file offsets listed in object table; stores data of each page as data
+# of its segment (wdump lists exactly one segment per page for LE executables)
+# NOTE:
+# wdump's object table output does not contain page sizes, thus page size and
+# size of last page are read from LE header of input file. wdump's hex dump of
+# object data is only decoded to verify data read from input file (if verify
+# is True) or as fallback (if data can't be read from input file)
+# NOTE:
+# File offsets are relative to base_offset (offset of executable within input
+# file, e.g. DOS/4G(W) payload of bound executable)
+def wdump_read_object_data(sections, input_file, verify, base_offset=0):
+	if (not dict_path_exists(sections, "object table", "data")):
+		return True
+
+	# Decode hex data of segment
+	def decode_hex_data(segment):
+		return bytes.fromhex(str.join(" ", segment["hex data"]))
+
+	logging.debug("Reading object data from input file '%s'..." % input_file)
+	page_count = 0
+	data_size = 0
+	mismatch_count = 0
+	try:
+		with open(input_file, "rb") as infile, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as file_data:
+
+			# Read page size, size of last page and number of pages from LE header
+			if (not dict_path_exists(sections, "linear exe header (os/2 v2.x) - le", "data", "file offset")):
+				raise Exception("LE header not found in wdump data")
+			header_offset = base_offset + sections["linear exe header (os/2 v2.x) - le"]["data"]["file offset"]
+			if (file_data[header_offset:header_offset+2] != b"LE"):
+				raise Exception("LE header not found in input file at offset 0x%x" % header_offset)
+			(pages_num, ) = struct.unpack_from("<I", file_data, header_offset + 0x14)
+			(page_size, last_page_size) = struct.unpack_from("<II", file_data, header_offset + 0x28)
+			logging.debug("Number of pages: %d, page size: 0x%x, size of last page: 0x%x" % (pages_num, page_size, last_page_size))
+
+			# Read page data, verify against hex dump if requested
+			for object in sections["object table"]["data"].values():
+				if (not "pages" in object):
+					continue
+				for page in object["pages"].values():
+					if (len(page["segments"]) == 0):
+						continue
+					if (len(page["segments"]) != 1):
+						logging.warning("Object %d page %d has %d segments, using hex dump" % (object["num"], page["num"], len(page["segments"])))
+						for segment in page["segments"].values():
+							segment["data"] = decode_hex_data(segment)
+							del segment["hex data"]
+						continue
+					segment = next(iter(page["segments"].values()))
+					size = last_page_size if (page["map page"] == pages_num) else page_size
+					segment["data"] = file_data[base_offset+page["file offset"]:base_offset+page["file offset"]+size]
+					if (len(segment["data"]) != size):
+						logging.warning("Object %d page %d: data length does not match page size (expected %d bytes, got %d bytes)" % (object["num"], page["num"], size, len(segment["data"])))
+					if (verify == True and segment["data"] != decode_hex_data(segment)):
+						logging.warning("Object %d page %d: data read from input file does not match wdump hex dump" % (object["num"], page["num"]))
+						mismatch_count += 1
+					del segment["hex data"]
+					page_count += 1
+					data_size += len(segment["data"])
+
+	except Exception as exception:
+		logging.warning("Failed to read object data from input file, using hex dump: %s" % str(exception))
+		for object in sections["object table"]["data"].values():
+			for page in object.get("pages", {}).values():
+				for segment in page["segments"].values():
+					if ("hex data" in segment):
+						segment["data"] = decode_hex_data(segment)
+						del segment["hex data"]
+		return False
+
+	logging.debug("Read %d pages (%d bytes)" % (page_count, data_size))
+	if (verify == True):
+		logging.debug("Verified object data against wdump hex dump: %d pages mismatch" % mismatch_count)
+	return True
+
+# Verifies object data of object table (i.e. object table read natively from
+# input file, see main_exe_reader.py) against object data of wdump's object
+# table (read from input file and verified against wdump's hex dump, see
+# wdump_read_object_data()); returns number of mismatching pages or None if
+# wdump's object table is not available
+def wdump_verify_object_table(sections, object_table):
+	if (not dict_path_exists(sections, "object table", "data")):
+		return None
+	wdump_pages = {}
+	for object in sections["object table"]["data"].values():
+		for page in object.get("pages", {}).values():
+			wdump_pages[(object["num"], page["num"])] = bytes().join([ segment.get("data", b"") for segment in page["segments"].values() ])
+	page_count = 0
+	mismatch_count = 0
+	for object in object_table["data"].values():
+		for page in object.get("pages", {}).values():
+			data = bytes().join([ segment["data"] for segment in page["segments"].values() ])
+			if (wdump_pages.get((object["num"], page["num"]), None) != data):
+				logging.warning("Object %d page %d: object data does not match wdump object data" % (object["num"], page["num"]))
+				mismatch_count += 1
+			page_count += 1
+	logging.debug("Verified object data against wdump object data: %d pages, %d pages mismatch" % (page_count, mismatch_count))
+	return mismatch_count
+
+# Hash of this module's source (see wdump_get_parser_hash())
+wdump_parser_hash = None
+
+# Get hash of this module's source (used as part of cache keys)
+def wdump_get_parser_hash():
+	global wdump_parser_hash
+	if (wdump_parser_hash == None):
+		with open(__file__, "rb") as file:
+			wdump_parser_hash = hashlib.sha256(file.read()).hexdigest()
+	return wdump_parser_hash
+
+# Get version of wdump (i.e. banner/usage output of wdump run without argu-
+# ments, used as part of cache keys), returns None on error
+def wdump_get_version(wdump_exec):
+	try:
+		sub_process = subprocess.run((wdump_exec, ), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, universal_newlines=True)
+	except Exception as exception:
+		logging.warning("Failed to determine wdump version: %s" % str(exception))
+		return None
+	return sub_process.stdout
+
+# Decodes output of wdump (command) or output read from file (path), returns
+# sections (OrderedDict of section name (lowercase) -> section) or None on
+# error
+# NOTE:
+# Output is processed while it is read (i.e. wdump output is never held in
+# memory as a whole); sections are decoded on demand (see WdumpSection)
+# NOTE:
+# If section_cache and key_parts are specified, cached sections are returned
+# if available, otherwise sections are stored in cache as soon as they are
+# identified (wdump is not run for cached sections, thus plain output file is
+# not written in that case); cache key consists of hash of this module's
+# source, key parts and hashes of contents of key files
+# NOTE:
+# Cache entries contain undecoded sections (i.e. normalized lines, see wdump_
+# split_sections()), thus sections are decoded on demand no matter whether
+# they were loaded from cache or not. Trade-off: the cache saves running
+# wdump and splitting its output, but sections that are accessed are decoded
+# again on every run (decoding all sections to store them would defeat on-
+# demand decoding)
+def wdump_decode_output(description, command, path, outfile_template, section_cache, key_parts, key_files):
+	cache_key = None
+	if (section_cache != None and key_parts != None):
+		try:
+			cache_key = section_cache.make_key(wdump_get_parser_hash(), *key_parts, *[ section_cache.hash_file(file) for file in key_files ])
+		except OSError as exception:
+			logging.warning("Failed to generate section cache key: %s" % str(exception))
+		if (cache_key != None):
+			sections = section_cache.get(cache_key)
+			if (sections != None):
+				logging.debug("Using cached sections of %s (%d sections)" % (description, len(sections)))
+				return sections
+
+	files = []
+	sub_process = None
+	output_tail = deque(maxlen=20)
+	sections = OrderedDict()
+	try:
+		if (command != None):
+			logging.debug("Running command '%s'..." % str.join(" ", command))
+			sub_process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+			logging.debug("Writing plain output to file while processing...")
+			files.append(open(outfile_template % "wdump_output_plain.txt", "wt"))
+			lines = wdump_tee_lines(sub_process.stdout, files[-1], output_tail)
+		else:
+			logging.debug("Reading %s from file '%s'..." % (description, path))
+			files.append(open(path, "r"))
+			lines = files[-1]
+
+		# Identify sections (decoded on demand)
+		logging.info("Identifying sections of %s..." % description)
+		for section in wdump_split_sections(lines):
+			logging.debug("Section '%s'..." % section["name"])
+			sections[section["name"].lower()] = section
+
+		# Check exit code of wdump
+		if (sub_process != None and sub_process.wait() != 0):
+			logging.error("Error: command failed with exit code %d:" % sub_process.returncode)
+			logging.error(str.join("\n", output_tail) if (len(output_tail) > 0) else "<no output>")
+			return None
+
+	except Exception as exception:
+		logging.error("Error: %s" % str(exception))
+		return None
+
+	finally:
+		for file in files:
+			file.close()
+		if (sub_process != None and sub_process.poll() == None):
+			sub_process.kill()
+			sub_process.wait()
+
+	logging.debug("Identified %d sections" % len(sections))
+	if (cache_key != None):
+		section_cache.put(cache_key, sections)
+	return sections
+
 # Parses wdump output, returns parsed representation of output
-def wdump_parse_output(input_file, wdump_exec, wdump_output, wdump_add_output, outfile_template):
+# NOTE:
+# If wdump_exec is None, wdump is not run (i.e. only additional output is
+# parsed, if specified)
+# NOTE:
+# If verify_object_data is True, object data read from input file is verified
+# against wdump's hex dump (see wdump_read_object_data()); object data is read
+# right away in that case (not deferred, as the object table might never be
+# accessed, e.g. if it is replaced by the natively read object table, see
+# wdump_verify_object_table())
+# NOTE:
+# If section_cache is specified (SectionCache instance), (undecoded) sections
+# of wdump output and additional output are cached (see wdump_decode_output())
+# NOTE:
+# Sections are decoded on demand (see WdumpSection), object data is read when
+# object table is accessed; if eager_decoding is True, all sections are de-
+# coded right away and parsed output is written to file (debug dump)
+# NOTE:
+# base_offset is the offset of the executable within input file, used when
+# reading object data (wdump itself can only be run for base_offset 0)
+def wdump_parse_output(input_file, wdump_exec, wdump_output, wdump_add_output, outfile_template, verify_object_data=False, section_cache=None, eager_decoding=False, base_offset=0):
 	logging.info("")
 	logging.info("Parsing wdump output:")
 
-	# Obtain wdump output
-	output = []
-	if (wdump_output == None):
-		# Run wdump as subprocess, fetch output (NOTE: order of wdump arguments is important, '-a', '-Dx' won't work!)
+	# Decode wdump output and additional output; both are decoded and cached
+	# separately, thus editing object hints (i.e. additional output) does not
+	# require re-running wdump / re-splitting wdump output
+	# NOTE: cache keys include hash of this module's source, i.e. cached sec-
+	#       tions are invalidated whenever decoders change
+	sections = OrderedDict()
+	if (wdump_output == None and wdump_exec == None):
+		# Not running wdump (structural data is read natively, see main_exe_
+		# reader.py; wdump is only required for debug info)
+		logging.debug("Not running wdump for file '%s' (not required)" % input_file)
+	elif (wdump_output == None):
+		# Run wdump as subprocess (NOTE: order of wdump arguments is important, '-a', '-Dx' won't work!)
 		logging.debug("Generating output for file '%s'..." % input_file)
-		command = (wdump_exec, "-Dx", "-a", input_file)
-		logging.debug("Running command '%s'..." % str.join(" ", command))
-		try:
-			sub_process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
-		except Exception as exception:
-			logging.error("Error: %s" % str(exception))
-			return None
-		if (sub_process.returncode != 0):
-			logging.error("Error: command failed with exit code %d:" % sub_process.returncode)
-			logging.error(sub_process.stdout if (sub_process.stdout != "") else "<no output>")
+		wdump_version = wdump_get_version(wdump_exec) if (section_cache != None) else None
+		key_parts = ("wdump output", wdump_version) if (wdump_version != None) else None
+		decoded_sections = wdump_decode_output("wdump output", (wdump_exec, "-Dx", "-a", input_file), None, outfile_template, section_cache, key_parts, (input_file, ))
+		if (decoded_sections == None):
 			return None
-		output = sub_process.stdout.splitlines()
-		logging.debug("Writing plain output to file (%d lines)..." % len(output))
-		write_file(outfile_template % "wdump_output_plain.txt", output)
+		sections.update(decoded_sections)
 	else:
 		# Read wdump output from file
-		logging.debug("Reading output from file '%s'..." % wdump_output)
-		try:
-			with open(wdump_output, "r") as file:
-				output = file.read().splitlines()
-			logging.debug("Read %d lines" % len(output))
-		except Exception as exception:
-			logging.error("Error: %s" % str(exception))
+		decoded_sections = wdump_decode_output("wdump output", None, wdump_output, outfile_template, section_cache, ("wdump output file", ), (wdump_output, ))
+		if (decoded_sections == None):
 			return None
+		sections.update(decoded_sections)
 
 	# Read additional wdump output from file
 	if (wdump_add_output != None):
-		logging.debug("Reading additional output from file '%s'..." % wdump_add_output)
-		try:
-			with open(wdump_add_output, "r") as file:
-				add_output = file.read().splitlines()
-				output += add_output
-			logging.debug("Read %d lines" % len(add_output))
-		except Exception as exception:
-			logging.error("Error: %s" % str(exception))
+		decoded_sections = wdump_decode_output("additional wdump output", None, wdump_add_output, outfile_template, section_cache, ("wdump additional output file", ), (wdump_add_output, ))
+		if (decoded_sections == None):
 			return None
-
-	# Process output, identify sections, distribute output to sections
-	logging.debug("Processing output (%d lines)..." % len(output))
-	sections = OrderedDict()
-	current_section = None
-	for i in range(0, len(output)):
-
-		# Fetch line, create stripped copy (leading + inner + trailing whitespace)
-		line = output[i]
-		line2 = str.join(" ", line.split())
-
-		# Skip empty/whitespace-only lines
-		if (line2 == ""):
-			continue
-
-		# Skip '[=]{78}' lines (see below)
-		if (re.match(r"^[=]{78}$", line2)):
-			continue
-
-		# New section (lookahead one line; if next line is '[=]{78}', then current line is name of new section)
-		if (i < len(output)-1 and re.match(r"^[=]{78}$", str.join(" ", output[i+1].split()))):
-			name = line2
-			name2 = name.lower()
-			sections[name2] = OrderedDict([("name", name), ("data", [])])
-			current_section = sections[name2]
-			continue
-
-		# Report stray lines
-		if (current_section == None):
-			logging.warning("Stray line: '%s'" % line)
-			continue
-
-		# Add original line to data of current section
-		current_section["data"].append(line)
-
-	# Print identified sections
-	logging.info("Identified sections:")
-	for section in sections:
-		logging.debug(sections[section]["name"])
-
-	# Decode section data
-	logging.info("Decoding section data...")
-	for section in sections:
-		logging.debug("Section '%s'..." % sections[section]["name"])
-		wdump_decode_data(sections[section])
+		sections.update(decoded_sections)
 
 	# Merge numbered sections, e.g. 'Module Info (section 0)' + 'Module Info (section 1)' -> sections["module info"]["data"] = OrderedDict([(0, <section 0>), (1, <section 1>)])
 	# NOTE: using second variable here to avoid 'RuntimeError: OrderedDict mutated during iteration'; this is perfectly fine as we're only copying references around
@@ -805,10 +1080,31 @@ def wdump_parse_output(input_file, wdump_exec, wdump_output, wdump_add_output, o
 	for section in sections:
 		logging.debug(sections[section]["name"])
 
-	# Write parsed output to file
-	output = format_pprint(sections)
-	logging.info("Writing parsed output to file (%d lines)..." % len(output))
-	write_file(outfile_template % "wdump_output_parsed.txt", output)
+	# Decode all sections (eager decoding only)
+	if (eager_decoding == True):
+		logging.info("Decoding all sections...")
+		for section in sections.values():
+			if (isinstance(section, WdumpSection)):
+				section.decode()
+			else:
+				for subsection in section["data"].values():
+					subsection.decode()
+
+	# Read object data from input file (deferred until object table is accessed
+	# if decoding lazily and not verifying object data)
+	if (eager_decoding == True or verify_object_data == True or not "object table" in sections):
+		logging.info("Reading object data...")
+		wdump_read_object_data(sections, input_file, verify_object_data, base_offset)
+	else:
+		logging.info("Deferring reading of object data until object table is accessed...")
+		sections["object table"].post_decode = (wdump_read_object_data, (sections, input_file, verify_object_data, base_offset))
+
+	# Write parsed output to file (eager decoding only, as formatting output
+	# would decode all sections anyway)
+	if (eager_decoding == True):
+		output = format_pprint(sections)
+		logging.info("Writing parsed output to file (%d lines)..." % len(output))
+		write_file(outfile_template % "wdump_output_parsed.txt", output)
 
 	# Return results
 	return sections
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Module Disk Cache                                                      -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 06/20/19 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------
+#                                     -
+#  TODO                               -
+#                                     -
+# -------------------------------------
+
+# - Cache is safe to use from multiple threads, but not from multiple processes
+#   sharing the same cache directory (concurrent evictions might remove entries
+#   that are being written)
+
+
+# -------------------------------------
+#                                     -
+#  Exports                            -
+#                                     -
+# -------------------------------------
+
+__all__ = [ "DiskCache" ]
+
+
+# -------------------------------------
+#                                     -
+#  Imports                            -
+#                                     -
+# -------------------------------------
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+
+
+# -------------------------------------
+#                                     -
+#  Code                               -
+#                                     -
+# -------------------------------------
+
+# On-disk cache with least recently used (LRU) eviction (base class of content-
+# addressed caches, see ObjdumpCache, SectionCache)
+# NOTE:
+# Entries are stored as one file per entry (name: key + FILE_SUFFIX), values
+# are converted from/to file contents via serialize/deserialize callables
+# passed by derived classes (value -> bytes, bytes -> value; exceptions raised
+# by deserialize mark entries as unreadable). Least recently used entries are
+# evicted once total size exceeds the size limit; usage is tracked via file
+# modification times, thus persisting across runs
+class DiskCache():
+
+	DESCRIPTION = "disk cache"
+	FILE_SUFFIX = ".bin"
+
+	def __init__(self, cache_dir, max_size, serialize, deserialize):
+		if (not isinstance(cache_dir, str)):
+			raise TypeError("cache directory must be type str, not %s" % type(cache_dir).__name__)
+		if (not isinstance(max_size, int)):
+			raise TypeError("max size must be type int, not %s" % type(max_size).__name__)
+		if (max_size < 0):
+			raise ValueError("max size must be positive value, not %d" % max_size)
+		if (not callable(serialize)):
+			raise TypeError("serialize must be callable, not %s" % type(serialize).__name__)
+		if (not callable(deserialize)):
+			raise TypeError("deserialize must be callable, not %s" % type(deserialize).__name__)
+
+		self.cache_dir = cache_dir
+		self.max_size = max_size
+		self.serialize = serialize
+		self.deserialize = deserialize
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.lock = threading.Lock()
+
+		# Create cache directory, build index of existing entries (ordered by
+		# last use, i.e. least recently used entries first)
+		os.makedirs(self.cache_dir, exist_ok=True)
+		entries = []
+		for entry in os.scandir(self.cache_dir):
+			if (entry.is_file() and entry.name.endswith(self.FILE_SUFFIX)):
+				stat = entry.stat()
+				entries.append((stat.st_mtime, entry.name, stat.st_size))
+		self.index = OrderedDict([(name, size) for (_, name, size) in sorted(entries)])
+		self.total_size = sum(self.index.values())
+
+	# Look up entry; returns stored value (hit) or None (miss); entries that
+	# can't be read are removed
+	def get(self, key):
+		name = key + self.FILE_SUFFIX
+		path = os.path.join(self.cache_dir, name)
+		with self.lock:
+			if (not name in self.index):
+				self.misses += 1
+				return None
+			try:
+				with open(path, "rb") as file:
+					value = self.deserialize(file.read())
+				os.utime(path)
+			except Exception as exception:
+				logging.warning("Failed to read %s entry '%s': %s" % (self.DESCRIPTION, name, str(exception)))
+				self.total_size -= self.index.pop(name)
+				try:
+					os.remove(path)
+				except OSError:
+					pass
+				self.misses += 1
+				return None
+			self.index.move_to_end(name)
+			self.hits += 1
+		return value
+
+	# Store entry, evict least recently used entries if size limit is exceeded
+	# NOTE: value is serialized right away, i.e. value may be modified after
+	#       storing it
+	def put(self, key, value):
+		name = key + self.FILE_SUFFIX
+		path = os.path.join(self.cache_dir, name)
+		content = self.serialize(value)
+		size = len(content)
+		if (size > self.max_size):
+			return
+		with self.lock:
+			try:
+				with open(path + ".tmp", "wb") as file:
+					file.write(content)
+				os.replace(path + ".tmp", path)
+			except OSError as exception:
+				logging.warning("Failed to write %s entry '%s': %s" % (self.DESCRIPTION, name, str(exception)))
+				return
+			if (name in self.index):
+				self.total_size -= self.index.pop(name)
+			self.index[name] = size
+			self.total_size += size
+			while (self.total_size > self.max_size and len(self.index) > 0):
+				(evict_name, evict_size) = self.index.popitem(last=False)
+				try:
+					os.remove(os.path.join(self.cache_dir, evict_name))
+				except OSError:
+					pass
+				self.total_size -= evict_size
+				self.evictions += 1
+
+	# Log cache statistics
+	def log_stats(self):
+		logging.debug("%s: %d hits, %d misses, %d evictions, %d entries, %d bytes (limit: %d bytes)" % (self.DESCRIPTION.capitalize(), self.hits, self.misses, self.evictions, len(self.index), self.total_size, self.max_size))
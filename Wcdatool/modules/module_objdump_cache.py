@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Module Objdump Cache                                                   -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 06/20/19 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------
+#                                     -
+#  TODO                               -
+#                                     -
+# -------------------------------------
+
+# - Cache is safe to use from multiple threads, but not from multiple processes
+#   sharing the same cache directory (see DiskCache)
+
+
+# -------------------------------------
+#                                     -
+#  Exports                            -
+#                                     -
+# -------------------------------------
+
+__all__ = [ "ObjdumpCache", "get_default_cache_dir" ]
+
+
+# -------------------------------------
+#                                     -
+#  Imports                            -
+#                                     -
+# -------------------------------------
+
+import os
+import sys
+import hashlib
+import subprocess
+from modules.module_disk_cache import *
+
+
+# -------------------------------------
+#                                     -
+#  Code                               -
+#                                     -
+# -------------------------------------
+
+# Get default cache directory (platform-specific)
+def get_default_cache_dir():
+	if (sys.platform.startswith("win")):
+		base_dir = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+	else:
+		base_dir = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+	return os.path.join(base_dir, "wcdatool")
+
+
+# Convert list of listing lines to file contents and vice versa
+def serialize_lines(lines):
+	return str.join("", [line + "\n" for line in lines]).encode("utf-8")
+
+def deserialize_lines(content):
+	return content.decode("utf-8").splitlines()
+
+
+# Content-addressed on-disk cache for objdump disassembly results
+# NOTE:
+# Entries are keyed by a hash of objdump's version, objdump's arguments (minus
+# input file), start/stop offsets, size of data (affects address formatting)
+# and the bytes objdump may read (i.e. bytes from start offset to stop offset
+# plus the maximum length of an x86 instruction, as objdump reads beyond the
+# stop offset when decoding the last instruction). Entries store the reduced
+# code listing (i.e. objdump output without header) as text. Storage and
+# eviction are handled by DiskCache
+class ObjdumpCache(DiskCache):
+
+	DESCRIPTION = "objdump cache"
+	FILE_SUFFIX = ".txt"
+	MAX_INSN_LEN = 15
+
+	def __init__(self, cache_dir, objdump_exec, max_size):
+		if (not isinstance(objdump_exec, str)):
+			raise TypeError("objdump executable must be type str, not %s" % type(objdump_exec).__name__)
+		super().__init__(cache_dir, max_size, serialize_lines, deserialize_lines)
+
+		# Determine objdump version (part of cache key)
+		sub_process = subprocess.run([objdump_exec, "--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+		if (sub_process.returncode != 0):
+			raise Exception("failed to determine objdump version: command failed with exit code %d" % sub_process.returncode)
+		self.objdump_version = sub_process.stdout.splitlines()[0] if (sub_process.stdout != "") else ""
+
+	# Generate cache key for objdump run
+	def make_key(self, data, start_ofs, end_ofs, arguments):
+		hash_ = hashlib.sha256()
+		hash_.update(self.objdump_version.encode("utf-8") + b"\0")
+		hash_.update(str.join("\0", arguments).encode("utf-8") + b"\0")
+		hash_.update(b"%x:%x:%x\0" % (start_ofs, end_ofs, len(data)))
+		hash_.update(data[start_ofs:end_ofs+self.MAX_INSN_LEN])
+		return hash_.hexdigest()
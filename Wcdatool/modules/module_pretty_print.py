@@ -45,6 +45,7 @@ __all__ = [ "format_pprint", "print_pprint" ]
 # -------------------------------------
 
 import sys
+from collections.abc import Mapping
 
 
 # -------------------------------------
@@ -138,8 +139,9 @@ def format_pprint(obj, level_indent="  ", max_depth=None, verbose_output=True,
 		output.append(indent + "<item is excluded>")
 		return output
 
-	# Determine keys and associated values
-	if (isinstance(obj, dict)):
+	# Determine keys and associated values (mappings other than dicts, e.g.
+	# dict views of compact tables, are handled like dicts)
+	if (isinstance(obj, (dict, Mapping))):
 		keys = obj.keys()
 		values = obj
 	elif (isinstance(obj, tuple) or isinstance(obj, list)):
@@ -171,12 +173,12 @@ def format_pprint(obj, level_indent="  ", max_depth=None, verbose_output=True,
 		value = values[key]
 
 		# Generate key string
-		keystr = kstmp1 % ("'" + str(key) + "':") if (isinstance(obj, dict) and isinstance(key, str)) else kstmp2 % (str(key) + ":")
+		keystr = kstmp1 % ("'" + str(key) + "':") if (isinstance(obj, (dict, Mapping)) and isinstance(key, str)) else kstmp2 % (str(key) + ":")
 
 		# Generate value string
 		valstr = ""
 		exp_obj = False
-		if (isinstance(value, dict)):
+		if (isinstance(value, (dict, Mapping))):
 			valstr = "<dict, %d items, class '%s'>" % (len(value), type(value).__name__) if (verbose_output == True) else "<dict, %d items>" % len(value)
 		elif (isinstance(value, tuple)):
 			valstr = "<tuple, %d items, class '%s'>" % (len(value), type(value).__name__) if (verbose_output == True) else "<tuple, %d items>" % len(value)
@@ -245,7 +247,7 @@ def format_pprint(obj, level_indent="  ", max_depth=None, verbose_output=True,
 
 		# Explore value object recursively if of certain type -or- arbitrary object +
 		# exploration flag set (see 'exp_obj = True' above)
-		elif (isinstance(value, dict) or isinstance(value, tuple) or isinstance(value, list) or isinstance(value, set) or
+		elif (isinstance(value, (dict, Mapping)) or isinstance(value, tuple) or isinstance(value, list) or isinstance(value, set) or
 		      isinstance(value, frozenset) or (isinstance(value, object) and exp_obj == True)):
 			# These could be used to prevent recursion beforehand, i.e. before calling this
 			# function again, as an alternative to checks at beginning of function. Leaving
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Module Section Cache                                                   -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 06/20/19 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------
+#                                     -
+#  TODO                               -
+#                                     -
+# -------------------------------------
+
+# - Cache is not safe to use from multiple processes sharing the same cache
+#   directory (see DiskCache)
+
+
+# -------------------------------------
+#                                     -
+#  Exports                            -
+#                                     -
+# -------------------------------------
+
+__all__ = [ "SectionCache" ]
+
+
+# -------------------------------------
+#                                     -
+#  Imports                            -
+#                                     -
+# -------------------------------------
+
+import hashlib
+import pickle
+from modules.module_disk_cache import *
+
+
+# -------------------------------------
+#                                     -
+#  Code                               -
+#                                     -
+# -------------------------------------
+
+# Content-addressed on-disk cache for sections (e.g. sections of wdump output)
+# NOTE:
+# Entries are keyed by a hash of arbitrary key parts (e.g. hash of input file,
+# version of tool that produced output, hash of decoder source), values are
+# stored in binary form (pickle). Storage and eviction are handled by DiskCache
+# NOTE:
+# Entries are unpickled when loaded, thus the cache directory must not be
+# writable by untrusted users
+class SectionCache(DiskCache):
+
+	DESCRIPTION = "section cache"
+	FILE_SUFFIX = ".pickle"
+	HASH_CHUNK_SIZE = 1024 * 1024
+
+	def __init__(self, cache_dir, max_size):
+		super().__init__(cache_dir, max_size, lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads)
+
+	# Generate cache key from key parts (str or bytes)
+	def make_key(self, *parts):
+		hash_ = hashlib.sha256()
+		for part in parts:
+			if (isinstance(part, str)):
+				part = part.encode("utf-8")
+			hash_.update(b"%d:" % len(part))
+			hash_.update(part)
+		return hash_.hexdigest()
+
+	# Generate hash of file contents (used as key part)
+	def hash_file(self, path):
+		hash_ = hashlib.sha256()
+		with open(path, "rb") as file:
+			for chunk in iter(lambda: file.read(self.HASH_CHUNK_SIZE), b""):
+				hash_.update(chunk)
+		return hash_.hexdigest()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Module Worker Pool                                                     -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 06/20/19 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------
+#                                     -
+#  TODO                               -
+#                                     -
+# -------------------------------------
+
+# - Log records are only passed back once a task has finished, i.e. log output
+#   of long-running tasks appears delayed
+
+
+# -------------------------------------
+#                                     -
+#  Exports                            -
+#                                     -
+# -------------------------------------
+
+__all__ = [ "WorkerPool" ]
+
+
+# -------------------------------------
+#                                     -
+#  Imports                            -
+#                                     -
+# -------------------------------------
+
+import multiprocessing
+import logging
+
+
+# -------------------------------------
+#                                     -
+#  Code                               -
+#                                     -
+# -------------------------------------
+
+# Shared read-only data of worker process (set by init_worker())
+worker_shared = None
+
+
+# Log handler capturing log records of tasks run in worker processes (records
+# are passed back to main process along with results and are re-emitted there)
+class CaptureLogHandler(logging.Handler):
+
+	def __init__(self):
+		super().__init__()
+		self.records = []
+
+	def emit(self, record):
+		record.msg = record.getMessage()		# records need to be picklable, thus
+		record.args = None						# format message and drop arguments
+		record.exc_info = None					# and exception info
+		self.records.append(record)
+
+
+# Initialize worker process (store shared data, replace log handlers inherited
+# from main process with capturing handler installed by run_task())
+def init_worker(shared, log_level):
+	global worker_shared
+	worker_shared = shared
+	root_logger = logging.getLogger()
+	for handler in list(root_logger.handlers):
+		root_logger.removeHandler(handler)
+	root_logger.setLevel(log_level)
+
+
+# Run task in worker process; returns result and captured log records
+def run_task(function, args):
+	handler = CaptureLogHandler()
+	root_logger = logging.getLogger()
+	root_logger.addHandler(handler)
+	try:
+		result = function(worker_shared, *args)
+	finally:
+		root_logger.removeHandler(handler)
+	return (result, handler.records)
+
+
+# Task submitted to worker pool
+# NOTE:
+# result() returns result of task and re-emits log records of task (once); in
+# serial mode, the task is run when result() is called for the first time, thus
+# log output is exactly the same as when calling the function directly
+class WorkerTask():
+
+	def __init__(self, pool, function, args, async_result):
+		self.pool = pool
+		self.function = function
+		self.args = args
+		self.async_result = async_result
+		self.done = False
+		self.value = None
+
+	def result(self):
+		if (self.done == False):
+			if (self.async_result == None):
+				self.value = self.function(self.pool.shared, *self.args)
+			else:
+				(self.value, records) = self.async_result.get()
+				for record in records:
+					logging.getLogger(record.name).handle(record)
+			self.done = True
+		return self.value
+
+
+# Pool of worker processes for running functions on shared read-only data
+# NOTE:
+# Functions are called as 'function(shared, *args)' and need to be defined at
+# module level (i.e. picklable). Shared data is passed to each worker process
+# once on creation (i.e. not pickled per task; with start method 'fork', it is
+# not pickled at all). Worker processes are created on first submit; if jobs <
+# 2, tasks are run serially in the main process instead
+# NOTE:
+# If max_tasks is specified (number of tasks that will be submitted), number
+# of worker processes is limited to that (i.e. no processes are created that
+# would never receive a task; each one holds a copy of shared data once it is
+# touched)
+# NOTE:
+# Worker processes are created by forking on most platforms; create pool (i.e.
+# submit first task) BEFORE starting any threads in main process
+class WorkerPool():
+
+	def __init__(self, jobs, shared, max_tasks=None):
+		if (not isinstance(jobs, int)):
+			raise TypeError("jobs must be type int, not %s" % type(jobs).__name__)
+		if (jobs < 1):
+			raise ValueError("jobs must be positive non-zero value, not %d" % jobs)
+		if (max_tasks != None and not isinstance(max_tasks, int)):
+			raise TypeError("max tasks must be type int, not %s" % type(max_tasks).__name__)
+		if (max_tasks != None and max_tasks < 0):
+			raise ValueError("max tasks must be positive value, not %d" % max_tasks)
+		self.jobs = min(jobs, max_tasks) if (max_tasks != None) else jobs
+		self.shared = shared
+		self.pool = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	# Submit task; returns WorkerTask instance
+	def submit(self, function, *args):
+		if (self.jobs < 2):
+			return WorkerTask(self, function, args, None)
+		if (self.pool == None):
+			self.pool = multiprocessing.Pool(processes=self.jobs, initializer=init_worker, initargs=(self.shared, logging.getLogger().getEffectiveLevel()))
+		return WorkerTask(self, function, args, self.pool.apply_async(run_task, (function, args)))
+
+	# Shut down worker processes
+	def close(self):
+		if (self.pool != None):
+			self.pool.terminate()
+			self.pool.join()
+			self.pool = None
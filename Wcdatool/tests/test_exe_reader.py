@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Tests for executable reader                                            -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 10/19/26 - 10/19/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from modules.main_exe_reader import *
+from modules.main_exe_reader import DOS_EXE_HEADER, DOS_EXE_HEADER_STRUCT, DOS16M_EXE_HEADER, DOS16M_EXE_HEADER_STRUCT, LE_EXE_HEADER, LE_EXE_HEADER_STRUCT
+
+
+# Pack header (signature + layout values, unspecified values are 0)
+def pack_header(signature, layout, struct_, values):
+	return signature + struct_.pack(*[ values.get(key, 0) for (key, _) in layout ])
+
+# DOS EXE header (load module of 0x200 bytes), offset of LE header at 0x3c
+def make_mz(le_offset=0):
+	data = bytearray(pack_header(b"MZ", DOS_EXE_HEADER, DOS_EXE_HEADER_STRUCT, { "number of 200h pages in load module": 1 }))
+	data += bytes(0x40 - len(data))
+	data[0x3c:0x40] = le_offset.to_bytes(4, "little")
+	return bytes(data)
+
+# DOS/16M EXE header pointing to next spliced .exp (absolute file offset)
+def make_bw(next_offset):
+	return pack_header(b"BW", DOS16M_EXE_HEADER, DOS16M_EXE_HEADER_STRUCT, { "offset of possible next spliced .exp": next_offset })
+
+# Minimal LE executable (no objects, no pages)
+def make_le_image():
+	data = bytearray(make_mz(0x80))
+	data += bytes(0x80 - len(data))
+	data += pack_header(b"LE", LE_EXE_HEADER, LE_EXE_HEADER_STRUCT, { "offset of fixup page table": 0x100 })
+	data += bytes(0x200 - len(data))
+	return bytes(data)
+
+# Bound executable: DOS stub (MZ + BW) followed by chain of DOS/16M EXE
+# headers (one per hop, 0x100 bytes apart) and LE executable (if with_image
+# is True, otherwise chain ends with last DOS/16M EXE header)
+def make_chained_exe(hops, with_image=True):
+	offsets = [ 0x200 + i * 0x100 for i in range(0, hops + 1) ]
+	data = bytearray(make_mz())
+	data += bytes(offsets[0] - len(data))
+	for i in range(0, hops):
+		next_offset = offsets[i+1] if (with_image == True or i < hops - 1) else 0
+		data += make_bw(next_offset)
+		data += bytes(offsets[i+1] - len(data))
+	if (with_image == True):
+		data += make_le_image()
+	return (bytes(data), offsets)
+
+def write_fixture(tmp_path, data):
+	path = str(tmp_path / "fixture.exe")
+	with open(path, "wb") as file:
+		file.write(data)
+	return path
+
+
+# Payload offset: whole chain of spliced .exp files is followed (e.g. FATAL.
+# EXE, HARVEST.EXE), not only the first hop
+def test_payload_offset_chained_bw(tmp_path):
+	for hops in (1, 2, 4):
+		(data, offsets) = make_chained_exe(hops)
+		path = write_fixture(tmp_path, data)
+		assert (exe_get_payload_offset(path) == offsets[-1])
+
+def test_payload_offset_not_bound(tmp_path):
+	path = write_fixture(tmp_path, make_le_image())
+	assert (exe_get_payload_offset(path) == 0)
+
+def test_payload_offset_chain_without_image(tmp_path):
+	(data, _) = make_chained_exe(3, with_image=False)
+	path = write_fixture(tmp_path, data)
+	assert (exe_get_payload_offset(path) == None)
+
+
+# Structure: reading starting at DOS/16M EXE header follows chain up to LE
+# executable; chain without LE executable yields explicit error
+def test_read_structure_chained_bw(tmp_path):
+	(data, offsets) = make_chained_exe(3)
+	path = write_fixture(tmp_path, data)
+	outfile_template = str(tmp_path / "out_%s")
+	for base_offset in (offsets[0], offsets[1], offsets[-1]):
+		sections = exe_read_structure(path, outfile_template, base_offset=base_offset)
+		assert (sections != None)
+		assert ("dos exe header" in sections)
+		assert (sections["linear exe header (os/2 v2.x) - le"]["data"]["file offset"] == 0x80)
+		assert ("object table" in sections and "fixup page table" in sections)
+
+def test_read_structure_chain_without_image(tmp_path):
+	(data, offsets) = make_chained_exe(3, with_image=False)
+	path = write_fixture(tmp_path, data)
+	assert (exe_read_structure(path, str(tmp_path / "out_%s"), base_offset=offsets[0]) == None)
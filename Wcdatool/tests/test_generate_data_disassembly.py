@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# -------------------------------------------------------------------------
+#                                                                         -
+#  Watcom Disassembly Tool (wcdatool)                                     -
+#  Tests for generate_data_disassembly()                                  -
+#                                                                         -
+#  Created by Fonic <https://github.com/fonic>                            -
+#  Date: 10/18/26 - 10/18/26                                              -
+#                                                                         -
+# -------------------------------------------------------------------------
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from modules.main_disassembler_gen2 import generate_data_disassembly, AUTO_STRING_REGEX
+
+
+# Auto-detected strings: null-terminated, at least 3 chars, within end offset
+def test_auto_strings_detection():
+	data = b"\x01ABC\x00AB\x00ABCD\x01ABC"
+	(offset, length, disassembly) = generate_data_disassembly(data, 0, len(data), "auto-strings")
+	assert (offset == len(data) and length == len(data))
+	strings = [ (asm.offset, asm.data) for asm in disassembly if (asm.arguments.startswith("\"")) ]
+	assert (strings == [ (1, b"ABC\x00") ])
+
+	# Terminator beyond end offset -> not a string
+	(offset, length, disassembly) = generate_data_disassembly(data, 0, 4, "auto-strings")
+	assert (offset == 4 and all([ not asm.arguments.startswith("\"") for asm in disassembly ]))
+
+
+# Long runs of string chars without terminator (e.g. text mode screen buffers)
+# must be processed in linear time (regression: quadratic regex backtracking)
+# NOTE: checks behavior instead of timing: candidates are maximal runs (i.e.
+#       one match per run, terminator is checked separately), which can only
+#       be found in linear time
+def test_auto_strings_long_unterminated_run():
+	for data in (b"A" * 65536 + b"\x01", b"\x20\x07" * 32768):
+		run_len = len(data.rstrip(b"\x01"))
+		assert ([ match.span() for match in AUTO_STRING_REGEX.finditer(data) ] == [ (0, run_len) ])
+		(offset, length, disassembly) = generate_data_disassembly(data, 0, len(data), "auto-strings")
+		assert (offset == len(data) and length == len(data))
+		assert (all([ not asm.arguments.startswith("\"") for asm in disassembly ]))
@@ -41,6 +41,10 @@ try:
 	from modules.module_argument_parser import *
 	from modules.module_logging_setup import *
 	from modules.module_miscellaneous import *
+	from modules.module_objdump_cache import *
+	from modules.module_section_cache import *
+	from modules.main_exe_reader import *
+	from modules.main_debug_info import *
 	from modules.main_wdump import *
 	from modules.main_fixup_relocation import *
 	from modules.main_disassembler_gen2 import *
@@ -82,8 +86,20 @@ def main():
 	parser.add_argument("-ode", "--objdump-exec", action="store", dest="objdump_exec", metavar="PATH", type=str, default="objdump", help="Path to objdump executable")
 	parser.add_argument("-wdo", "--wdump-output", action="store", dest="wdump_output", metavar="PATH", type=str, help="Path to file containing pre-generated wdump output to read/parse instead of running wdump")
 	parser.add_argument("-wao", "--wdump-addout", action="store", dest="wdump_addout", metavar="PATH", type=str, help="Path to file containing additional wdump output to read/parse (mainly used for object hints)")
+	parser.add_argument("-ndi", "--native-debug-info", action="store_true", dest="native_debug_info", help="Read debug info directly from input file instead of parsing wdump output (wdump is not required)")
+	parser.add_argument("-cdi", "--check-debug-info", action="store_true", dest="check_debug_info", help="Check debug info read directly from input file against debug info parsed from wdump output (implies --native-debug-info)")
+	parser.add_argument("-ed", "--eager-decoding", action="store_true", dest="eager_decoding", help="Decode all sections of wdump output right away and write parsed output to file (default: decode sections on demand)")
+	parser.add_argument("-wsf", "--write-split-files", action="store_true", dest="write_split_files", help="Write DOS/4G(W) stub/payload and linear executable stub/payload to separate files (for further examination)")
+	parser.add_argument("-vod", "--verify-object-data", action="store_true", dest="verify_object_data", help="Verify object data read from input file against object data dumped by wdump")
 	#parser.add_argument("-do", "--data-object", action="store", dest="data_object", metavar="INDEX", type=int, default="auto", help="Index of object 'ds:...' references point to (default: automatic)")
 	parser.add_argument("-od", "--output-dir", action="store", dest="output_dir", metavar="PATH", type=str, default=".", help="Path to output directory for storing generated content")
+	parser.add_argument("-cd", "--cache-dir", action="store", dest="cache_dir", metavar="PATH", type=str, default=get_default_cache_dir(), help="Path to directory for storing cached data")
+	parser.add_argument("-ocs", "--objdump-cache-size", action="store", dest="objdump_cache_size", metavar="MB", type=int, default=256, help="Size limit of objdump cache in megabytes; least recently used entries are evicted when exceeded")
+	parser.add_argument("-noc", "--no-objdump-cache", action="store_true", dest="no_objdump_cache", help="Disable objdump cache (i.e. always run objdump)")
+	parser.add_argument("-scs", "--section-cache-size", action="store", dest="section_cache_size", metavar="MB", type=int, default=64, help="Size limit of section cache (sections of wdump output) in megabytes; least recently used entries are evicted when exceeded")
+	parser.add_argument("-nsc", "--no-section-cache", action="store_true", dest="no_section_cache", help="Disable section cache (i.e. always run wdump and decode its output)")
+	parser.add_argument("-j", "--jobs", action="store", dest="jobs", metavar="COUNT", type=int, default=os.cpu_count() or 1, help="Number of concurrent jobs (objdump runs, worker processes)")
+	parser.add_argument("-tf", "--trace-flow", action="store_true", dest="trace_flow", help="Trace execution flow starting at entry point to identify code blocks (results are written to separate file)")
 	parser.add_argument("-cm", "--color-mode", action="store", dest="color_mode", metavar="VALUE", type=str.lower, choices=["auto", "true", "false"], default="auto", help="Enable color mode (choices: 'auto', 'true', 'false')")
 	parser.add_argument("-id", "--interactive-debugger", action="store_true", dest="ia_debug", help="Drop to interactive debugger before exiting to allow inspecting internal data structures")
 	parser.add_argument("-is", "--interactive-shell", action="store_true", dest="ia_shell", help="Drop to interactive shell before exiting to allow inspecting internal data structures")
@@ -91,6 +107,10 @@ def main():
 	parser.add_argument("input_file", action="store", metavar="FILE", type=str, help="Path to input executable to disassemble (.exe file)")
 	cmd_args = parser.parse_args()
 
+	# Check of native debug info implies reading native debug info
+	if (cmd_args.check_debug_info == True):
+		cmd_args.native_debug_info = True
+
 	# Force-set ANSI mode if requested
 	if (cmd_args.color_mode != "auto"):
 		set_ansi_mode(True if (cmd_args.color_mode == "true") else False)
@@ -100,7 +120,7 @@ def main():
 
 	# Perform additional checks on command line arguments
 	checks_errors = []
-	if (cmd_args.wdump_output == None and shutil.which(cmd_args.wdump_exec) == None):
+	if (cmd_args.wdump_output == None and shutil.which(cmd_args.wdump_exec) == None and os.path.isfile(cmd_args.input_file) and exe_has_debug_info(cmd_args.input_file) == True and (cmd_args.native_debug_info == False or cmd_args.check_debug_info == True)): # wdump is only required for debug info
 		checks_errors.append("wdump executable not found: '%s'" % cmd_args.wdump_exec)
 	if (shutil.which(cmd_args.objdump_exec) == None):
 		checks_errors.append("objdump executable not found: '%s'" % cmd_args.objdump_exec)
@@ -108,6 +128,12 @@ def main():
 		checks_errors.append("wdump output file not found: '%s'" % cmd_args.wdump_output)
 	if (cmd_args.wdump_addout != None and not os.path.isfile(cmd_args.wdump_addout)):
 		checks_errors.append("wdump additional output file not found: '%s'" % cmd_args.wdump_addout)
+	if (cmd_args.objdump_cache_size < 0):
+		checks_errors.append("objdump cache size must be positive value: %d" % cmd_args.objdump_cache_size)
+	if (cmd_args.section_cache_size < 0):
+		checks_errors.append("section cache size must be positive value: %d" % cmd_args.section_cache_size)
+	if (cmd_args.jobs < 1):
+		checks_errors.append("jobs must be positive non-zero value: %d" % cmd_args.jobs)
 	if (not os.path.isdir(cmd_args.output_dir)):
 		checks_errors.append("output directory not found: '%s'" % cmd_args.output_dir)
 	if (not os.path.isfile(cmd_args.input_file)):
@@ -147,69 +173,126 @@ def main():
 	logging.info("Command line:")
 	logging.debug("%s %s" % (os.path.basename(sys.argv[0]), str.join(" ", sys.argv[1:])))
 
-	# Parse wdump output
-	wdump = wdump_parse_output(cmd_args.input_file, cmd_args.wdump_exec, cmd_args.wdump_output, cmd_args.wdump_addout, outfile_template)
-	if (wdump == None):
-		return 1
+	# Set up section cache
+	section_cache = None
+	if (cmd_args.no_section_cache == False):
+		try:
+			section_cache = SectionCache(os.path.join(cmd_args.cache_dir, "sections"), cmd_args.section_cache_size * 1024 * 1024)
+		except Exception as exception:
+			logging.warning("Failed to set up section cache, continuing without cache: %s" % str(exception))
 
-	# Detect and extract DOS/4G(W) stub and payload
-	# NOTE: this is necessary as wdump will only yield usable results for the payload
-	# TODO: would it make sense to put this in a module? -> 'modules/main_splitter.py'
-	if (dict_path_exists(wdump, "dos/16m exe header", "data", "offset of possible next spliced .exp")):
-		offset = wdump["dos/16m exe header"]["data"]["offset of possible next spliced .exp"]
-		logging.info("")
-		logging.info("Extracting DOS/4G(W) stub and payload:")
-		logging.debug("Offset of DOS/4G(W) payload: 0x%x" % offset)
+	# Write part of input file (offset - EOF if size is None) to separate file
+	def write_split_file(description, file_name, offset, size):
+		logging.debug("Reading %s data (offset 0x%x - %s)..." % (description, offset, ("0x%x" % (offset+size-1)) if (size != None) else "EOF"))
 		try:
-			logging.debug("Opening input file to read data...")
 			with open(cmd_args.input_file, "rb") as infile:
-				logging.debug("Reading DOS/4G(W) stub data (offset 0x0 - 0x%x)..." % (offset-1))
-				stub_data = infile.read(offset)
-				logging.debug("Reading DOS/4G(W) payload data (offset 0x%x - EOF)..." % offset)
-				payload_data = infile.read()
+				infile.seek(offset)
+				data = infile.read(size) if (size != None) else infile.read()
 		except Exception as exception:
 			logging.error("Error: %s" % str(exception))
+			return None
+		logging.debug("Writing %s data to file (%d bytes)..." % (description, len(data)))
+		write_file(outfile_template % file_name, data)
+		return outfile_template % file_name
+
+	# Detect DOS/4G(W) stub and payload
+	# NOTE:
+	# wdump will only yield usable results for the payload, thus the executable
+	# is read in place starting at the payload's offset (all file offsets in
+	# sections are relative to the payload); the payload is only written to a
+	# separate file if wdump has to be run or if split files were requested
+	payload_offset = exe_get_payload_offset(cmd_args.input_file)
+	if (payload_offset == None):
+		return 1
+	if (payload_offset > 0):
+		logging.info("")
+		logging.info("Detected DOS/4G(W) stub and payload:")
+		logging.debug("Offset of DOS/4G(W) payload: 0x%x" % payload_offset)
+		if (cmd_args.write_split_files == True):
+			if (write_split_file("DOS/4G(W) stub", "split_dos4g_stub.exe", 0, payload_offset) == None):
+				return 1
+
+	# Read executable structure natively
+	exe = exe_read_structure(cmd_args.input_file, outfile_template, base_offset=payload_offset)
+	if (exe == None):
+		return 1
+
+	# Read debug info natively if requested
+	has_debug_info = exe_has_debug_info(cmd_args.input_file)
+	debug_info = None
+	if (cmd_args.native_debug_info == True and has_debug_info == True):
+		debug_info = debug_info_read(cmd_args.input_file, outfile_template, base_offset=payload_offset)
+		if (debug_info == None):
 			return 1
-		logging.debug("Writing DOS/4G(W) stub data to file (%d bytes)..." % len(stub_data))
-		write_file(outfile_template % "split_dos4g_stub.exe", stub_data)
-		logging.debug("Writing DOS/4G(W) payload data to file (%d bytes)..." % len(payload_data))
-		write_file(outfile_template % "split_dos4g_payload.exe", payload_data)
-		cmd_args.input_file = outfile_template % "split_dos4g_payload.exe"
-		logging.debug("Re-Running wdump parser for DOS/4G(W) payload...")
-		wdump = wdump_parse_output(cmd_args.input_file, cmd_args.wdump_exec, cmd_args.wdump_output, cmd_args.wdump_addout, outfile_template)
-		if (wdump == None):
+
+	# Parse wdump output; wdump is only run if executable contains debug info
+	# that is not read natively (or if pre-generated wdump output was speci-
+	# fied), natively read sections take precedence over wdump's sections
+	wdump_exec = cmd_args.wdump_exec
+	if (cmd_args.wdump_output == None and (has_debug_info == False or (cmd_args.native_debug_info == True and cmd_args.check_debug_info == False))):
+		wdump_exec = None
+	(wdump_input, wdump_base_offset) = (cmd_args.input_file, payload_offset)
+	if (payload_offset > 0 and (cmd_args.write_split_files == True or (wdump_exec != None and cmd_args.wdump_output == None))):
+		wdump_input = write_split_file("DOS/4G(W) payload", "split_dos4g_payload.exe", payload_offset, None)
+		if (wdump_input == None):
 			return 1
+		wdump_base_offset = 0
+	wdump = wdump_parse_output(wdump_input, wdump_exec, cmd_args.wdump_output, cmd_args.wdump_addout, outfile_template, verify_object_data=cmd_args.verify_object_data, section_cache=section_cache, eager_decoding=cmd_args.eager_decoding, base_offset=wdump_base_offset)
+	if (section_cache != None):
+		section_cache.log_stats()
+	if (wdump == None):
+		return 1
+	if (debug_info != None and cmd_args.check_debug_info == True):
+		debug_info_check(debug_info, wdump)
+	# Verify natively read object data against wdump's object data (wdump's
+	# object data itself is verified against wdump's hex dump while parsing)
+	if (cmd_args.verify_object_data == True):
+		if (not "object table" in wdump):
+			logging.warning("Unable to verify object data: wdump output does not contain object table (wdump not run?)")
+		elif ("object table" in exe):
+			wdump_verify_object_table(wdump, exe["object table"])
+	wdump.update(exe)
+	if (debug_info != None):
+		debug_info_merge(wdump, debug_info)
 
-	# Detect and extract linear executable stub and payload
+	# Without wdump, natively read structure is the only source of structural
+	# data; bail out early if it is incomplete (instead of failing later on
+	# with misleading errors regarding missing fixup/relocation data)
+	if (not "linear exe header (os/2 v2.x) - le" in wdump):
+		if (wdump_exec == None and cmd_args.wdump_output == None):
+			logging.error("Error: unsupported executable layout: no LE executable found in input file%s" % (" (run without -ndi/--native-debug-info to use wdump instead)" if (cmd_args.native_debug_info == True and has_debug_info == True) else ""))
+		else:
+			logging.error("Error: unsupported executable layout: no LE executable found in input file or wdump output")
+		return 1
+
+	# Extract linear executable stub and payload
 	# NOTE: this is solely to allow further examination of the extracted files, they are not used anywhere in this script
 	# TODO: would it make sense to put this in a module? -> 'modules/main_splitter.py'
-	if (dict_path_exists(wdump, "linear exe header (os/2 v2.x) - le", "data", "file offset")):
+	if (cmd_args.write_split_files == True and dict_path_exists(wdump, "linear exe header (os/2 v2.x) - le", "data", "file offset")):
 		offset = wdump["linear exe header (os/2 v2.x) - le"]["data"]["file offset"]
 		logging.info("")
 		logging.info("Extracting linear executable stub and payload:")
 		logging.debug("Offset of linear executable payload: 0x%x" % offset)
-		try:
-			logging.debug("Opening input file to read data...")
-			with open(cmd_args.input_file, "rb") as infile:
-				logging.debug("Reading linear executable stub data (offset 0x0 - 0x%x)..." % (offset-1))
-				stub_data = infile.read(offset)
-				logging.debug("Reading linear executable payload data (offset 0x%x - EOF)..." % offset)
-				payload_data = infile.read()
-		except Exception as exception:
-			logging.error("Error: %s" % str(exception))
+		if (write_split_file("linear executable stub", "split_linear_executable_stub.exe", payload_offset, offset) == None):
+			return 1
+		if (write_split_file("linear executable payload", "split_linear_executable_payload.bin", payload_offset + offset, None) == None):
 			return 1
-		logging.debug("Writing linear executable stub data to file (%d bytes)..." % len(stub_data))
-		write_file(outfile_template % "split_linear_executable_stub.exe", stub_data)
-		logging.debug("Writing linear executable payload data to file (%d bytes)..." % len(payload_data))
-		write_file(outfile_template % "split_linear_executable_payload.bin", payload_data)
 
 	# Read and decode fixup/relocation data
-	fixrel = fixup_relocation_read_decode(wdump, cmd_args.input_file, outfile_template)
+	fixrel = fixup_relocation_read_decode(wdump, cmd_args.input_file, outfile_template, base_offset=payload_offset)
 	if (fixrel == None):
 		return 1
 
+	# Set up objdump cache
+	objdump_cache = None
+	if (cmd_args.no_objdump_cache == False):
+		try:
+			objdump_cache = ObjdumpCache(os.path.join(cmd_args.cache_dir, "objdump"), cmd_args.objdump_exec, cmd_args.objdump_cache_size * 1024 * 1024)
+		except Exception as exception:
+			logging.warning("Failed to set up objdump cache, continuing without cache: %s" % str(exception))
+
 	# Disassemble objects
-	disasm = disassemble_objects_gen2(wdump, fixrel, cmd_args.objdump_exec, outfile_template)
+	disasm = disassemble_objects_gen2(wdump, fixrel, cmd_args.objdump_exec, outfile_template, objdump_cache=objdump_cache, jobs=cmd_args.jobs, trace_flow=cmd_args.trace_flow)
 
 	# Drop to interactive debugger/shell if requested
 	if (cmd_args.ia_debug == True or cmd_args.ia_shell == True):